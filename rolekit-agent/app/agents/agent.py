@@ -6,10 +6,6 @@ from app.core.dependencies import get_llm
 from app.agents.tools.langchain_tools import cv_langchain_tools, set_bearer_token
 import json
 
-# Initialize the LLM with streaming enabled and bind tools
-llm = get_llm()
-llm_with_tools = llm.bind_tools(cv_langchain_tools)
-
 # Define the state
 class AgentState(TypedDict):
     messages: List[HumanMessage | AIMessage]
@@ -98,6 +94,11 @@ The CV ID is: {cv_id}"""
         HumanMessage(content=query)
     ]
     
+    # Resolve the client per request, so it always uses the current shared
+    # HTTP client (the registry is opened and closed with the app lifespan)
+    llm = get_llm()
+    llm_with_tools = llm.bind_tools(cv_langchain_tools)
+    
     # First LLM call with tools
     response = await llm_with_tools.ainvoke(messages)
     messages.append(response)
@@ -17,7 +17,9 @@ from app.services.cv import (
     ATSOptimizer,
     CVBuilder
 )
-from app.services.parser.document_parser import parse_cv_document
+from app.services.parser.parser_pool import ParserBusyError, ParserTimeoutError
+from app.services.parser.document_cache import get_document_cache
+from app.services.parser.uploads import UnsupportedUploadError, UploadTooLargeError, parse_upload, spool_upload
 import json
 
 
@@ -98,11 +100,23 @@ async def parse_cv_from_file(
         Structured CV data
     """
     try:
-        # Read file content
-        file_bytes = await file.read()
-        
-        # Parse document
-        cv_text = await parse_cv_document(file_bytes, file.filename)
+        # Spool the upload to disk (size-limited) and parse it from there
+        async with spool_upload(file) as upload:
+            # Same bytes and target role as an earlier upload: reuse its result
+            document_cache = get_document_cache()
+            cached = document_cache.get("cv_data", upload.sha256, target_role)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "cv_data": cached,
+                    "filename": file.filename,
+                    "message": "CV parsed successfully"
+                }
+            result = await parse_upload(upload)
+        
+        if result.get("error"):
+            raise ValueError(f"Failed to parse document: {result['error']}")
+        cv_text = result["text"]
         
         # Extract structured data
         extractor = CVSchemaExtractor()
@@ -117,6 +131,7 @@ async def parse_cv_from_file(
         
         # Validate and clean
         cv_data = CVSchemaValidator.validate_and_clean(cv_data)
+        document_cache.set("cv_data", upload.sha256, cv_data.model_dump(), target_role)
         
         return {
             "success": True,
@@ -125,6 +140,14 @@ async def parse_cv_from_file(
             "message": "CV parsed successfully"
         }
         
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ParserBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ParserTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse file: {str(e)}")
 
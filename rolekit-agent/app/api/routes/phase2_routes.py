@@ -3,26 +3,48 @@ Phase 2 API Routes - Node-based CV Processing Endpoints
 Each endpoint corresponds to a specific processing node in the CV enhancement pipeline.
 """
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from fastapi.responses import Response, FileResponse, JSONResponse
-from typing import Optional, Literal
+from fastapi.responses import Response, FileResponse, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Optional, Literal, Any, AsyncIterator, Awaitable, Callable
 from pydantic import BaseModel, Field
+from contextlib import AsyncExitStack
+import asyncio
+import json
 import tempfile
 import os
 from pathlib import Path
+import time
 import uuid
 from datetime import datetime
 
-from app.models.cv_models import CVData
+from app.models.cv_models import CVComparisonFeedback, CVData
 from app.services.cv import (
     CVSchemaExtractor,
     CVSchemaValidator,
     ProfileEnhancer,
     ImpactQuantifier,
-    CVBuilder
+    CVBuilder,
+    CVQualityScorer,
+    get_validation_jobs,
+    list_themes
+)
+from app.services.cv.render_cache import get_fragment_cache, get_render_cache
+from app.services.cv.themes import COLOR_SCHEMES
+from app.services.parser.parser_pool import ParserBusyError, ParserTimeoutError, get_parser_pool
+from app.services.parser.document_cache import get_document_cache
+from app.services.parser.uploads import (
+    BatchEntry,
+    UnsupportedUploadError,
+    UploadTooLargeError,
+    parse_upload,
+    spool_batch,
+    spool_upload,
 )
-from app.services.parser.document_parser import DocumentParser
 from app.services.pdf_generator import PDFGenerator, PDFGenerationError
+from app.agents.nodes.streaming_node import create_sse_event
 from app.core.dependencies import get_llm
+from app.core.config import get_settings
+from app.services.llm import ainvoke_structured, get_admission_controller
 
 # Create router with /api prefix
 router = APIRouter(prefix="/api", tags=["CV Processing Pipeline"])
@@ -42,6 +64,10 @@ class ExtractRequest(BaseModel):
     target_role: Optional[str] = Field(None, description="Target job role for context")
     extract_skills: bool = Field(True, description="Extract skills section")
     extract_education: bool = Field(True, description="Extract education section")
+    llm_validation: bool = Field(
+        False,
+        description="Also run an LLM quality review in the background (poll /api/extract/validation/{job_id})"
+    )
 
 
 class ExtractResponse(BaseModel):
@@ -50,9 +76,19 @@ class ExtractResponse(BaseModel):
     cv_data: dict
     confidence_score: Optional[float] = None
     warnings: Optional[list[str]] = None
+    quality: Optional[dict] = Field(None, description="Local quality score breakdown, issues and suggestions")
+    validation_job_id: Optional[str] = Field(None, description="Background LLM validation job, if requested")
     message: str
 
 
+class ValidationJobResponse(BaseModel):
+    """Response model for /api/extract/validation/{job_id}"""
+    job_id: str
+    status: Literal["pending", "completed", "failed"]
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
 class EnhanceRequest(BaseModel):
     """Request model for /api/enhance endpoint"""
     cv_data: CVData
@@ -88,7 +124,7 @@ class BuildRequest(BaseModel):
         description="Template style (modern, classic, minimal)"
     )
     include_photo: bool = Field(False, description="Include profile photo")
-    color_scheme: Optional[str] = Field("blue", description="Color scheme for HTML")
+    color_scheme: Optional[str] = Field(None, description="Accent color for HTML (blue, green, red, purple, teal, orange, gray, black or #hex; defaults to the style's own)")
 
 
 class BuildResponse(BaseModel):
@@ -105,6 +141,7 @@ class ExportRequest(BaseModel):
     cv_data: CVData
     format: Literal["pdf", "docx"] = Field(default="pdf", description="Export format")
     style: str = Field(default="modern", description="Template style")
+    color_scheme: Optional[str] = Field(None, description="Accent color (defaults to the style's own)")
 
 
 class ExportResponse(BaseModel):
@@ -179,7 +216,10 @@ async def extract_cv_data(request: ExtractRequest):
     1. Accepts raw CV text or file
     2. Uses LLM to extract structured data
     3. Validates and cleans the data
-    4. Returns JSON with confidence scores
+    4. Returns JSON with a locally computed confidence score
+    
+    Set ``llm_validation`` to also get an LLM quality review; it runs in the
+    background and its result is polled from ``/api/extract/validation/{job_id}``.
     
     **Example:**
     ```json
@@ -193,51 +233,81 @@ async def extract_cv_data(request: ExtractRequest):
         if not request.text:
             raise HTTPException(status_code=400, detail="Text is required")
         
-        # Initialize extractor
-        extractor = CVSchemaExtractor()
-        validator = CVSchemaValidator()
-        
-        # Extract with or without context
-        if request.target_role:
-            cv_data = await extractor.extract_with_context(
-                request.text,
-                target_role=request.target_role
-            )
-        else:
-            cv_data = await extractor.extract(request.text)
-        
-        # Validate and get quality score
-        cv_data = validator.validate_and_clean(cv_data)
-        quality_result = await validator.validate_with_llm(cv_data)
-        
-        # Extract quality score
-        quality_score = quality_result.get("quality_score", 0.5) / 100.0  # Convert 0-100 to 0-1
-        
-        # Collect warnings
-        warnings = []
-        if quality_score < 0.7:
-            warnings.append("Low confidence in extracted data. Please review carefully.")
-        if not cv_data.contact or not cv_data.contact.email:
-            warnings.append("Email address not found")
-        if not cv_data.experience or len(cv_data.experience) == 0:
-            warnings.append("No work experience found")
-        
-        return ExtractResponse(
-            success=True,
-            cv_data=cv_data.model_dump(),
-            confidence_score=quality_score,
-            warnings=warnings if warnings else None,
-            message=f"CV data extracted successfully with {quality_score:.0%} confidence"
-        )
+        return await _build_extract_response(request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Extraction failed: {str(e)}")
 
 
+async def _build_extract_response(request: ExtractRequest) -> ExtractResponse:
+    """
+    Extract, clean and score CV text (shared by the single and batch endpoints)
+    
+    Args:
+        request: Extraction request with non-empty text
+        
+    Returns:
+        Extraction response
+    """
+    # Initialize extractor
+    extractor = CVSchemaExtractor()
+    validator = CVSchemaValidator()
+    
+    # Extract with or without context
+    if request.target_role:
+        cv_data = await extractor.extract_with_context(
+            request.text,
+            target_role=request.target_role
+        )
+    else:
+        cv_data = await extractor.extract(request.text)
+    
+    # Validate and score locally (no second LLM call on the request path)
+    cv_data = validator.validate_and_clean(cv_data)
+    quality_result = CVQualityScorer().score(cv_data)
+    validation_job_id = get_validation_jobs().submit(cv_data) if request.llm_validation else None
+    
+    # Extract quality score
+    quality_score = quality_result["quality_score"] / 100.0  # Convert 0-100 to 0-1
+    
+    # Collect warnings
+    warnings = []
+    if quality_score < 0.7:
+        warnings.append("Low confidence in extracted data. Please review carefully.")
+    if not cv_data.contact or not cv_data.contact.email:
+        warnings.append("Email address not found")
+    if not cv_data.experience or len(cv_data.experience) == 0:
+        warnings.append("No work experience found")
+    
+    return ExtractResponse(
+        success=True,
+        cv_data=cv_data.model_dump(),
+        confidence_score=quality_score,
+        warnings=warnings if warnings else None,
+        quality=quality_result,
+        validation_job_id=validation_job_id,
+        message=f"CV data extracted successfully with {quality_score:.0%} confidence"
+    )
+
+
+@router.get("/extract/validation/{job_id}", response_model=ValidationJobResponse)
+async def get_validation_result(job_id: str):
+    """
+    Poll a background LLM validation started with ``llm_validation=true``
+    
+    Returns the job's status; ``result`` holds the LLM review once it has completed.
+    """
+    job = get_validation_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Validation job not found or expired")
+    return ValidationJobResponse(**job)
+
+
 @router.post("/extract/upload", response_model=ExtractResponse)
 async def extract_cv_from_file(
     file: UploadFile = File(...),
-    target_role: Optional[str] = Form(None)
+    target_role: Optional[str] = Form(None),
+    llm_validation: bool = Form(False)
 ):
     """
     **Node: Input Parser + Schema Extractor**
@@ -247,12 +317,16 @@ async def extract_cv_from_file(
     Accepts: PDF, DOCX, TXT files
     """
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Parse document
-        parser = DocumentParser()
-        result = await parser.parse_document(content, file.filename)
+        # Spool the upload to disk (size-limited) and parse it from there
+        async with spool_upload(file) as upload:
+            # Same bytes and target role as an earlier upload: reuse its result
+            document_cache = get_document_cache()
+            cached = document_cache.get("extract", upload.sha256, target_role)
+            if cached is not None:
+                if llm_validation:
+                    cached["validation_job_id"] = get_validation_jobs().submit(CVData(**cached["cv_data"]))
+                return ExtractResponse(**cached)
+            result = await parse_upload(upload)
         text = result.get("text", "")
         
         if not text or len(text.strip()) < 50:
@@ -262,11 +336,22 @@ async def extract_cv_from_file(
             )
         
         # Use the text extraction endpoint
-        request = ExtractRequest(text=text, target_role=target_role)
-        return await extract_cv_data(request)
+        request = ExtractRequest(text=text, target_role=target_role, llm_validation=llm_validation)
+        response = await extract_cv_data(request)
+        # Job IDs are per request, so they are not cached
+        document_cache.set("extract", upload.sha256, response.model_dump(exclude={"validation_job_id"}), target_role)
+        return response
         
     except HTTPException:
         raise
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ParserBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ParserTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -274,10 +359,309 @@ async def extract_cv_from_file(
         )
 
 
+@router.post("/extract/batch")
+async def extract_cv_batch(
+    files: list[UploadFile] = File(...),
+    target_role: Optional[str] = Form(None)
+):
+    """
+    **Node: Input Parser + Schema Extractor (batch)**
+    
+    Extract many CVs in one request. Accepts several files and/or ``.zip``
+    archives of PDF, DOCX and TXT files.
+    
+    Documents run through parse → extract → clean as a pipeline: parsing is
+    limited to BATCH_PARSE_CONCURRENCY documents and LLM extraction to
+    BATCH_EXTRACT_CONCURRENCY, so parsing the next documents overlaps with
+    extracting earlier ones.
+    
+    The response is NDJSON (``application/x-ndjson``), one line per document
+    in completion order, then a summary line:
+    ```
+    {"type": "result", "index": 0, "filename": "a.pdf", "success": true, "cv_data": {...}, ...}
+    {"type": "result", "index": 1, "filename": "b.docx", "success": false, "error": "..."}
+    {"type": "summary", "total": 2, "succeeded": 1, "failed": 1, "duration_seconds": 4.2}
+    ```
+    A document that fails only produces an error line; the batch carries on.
+    """
+    stack = AsyncExitStack()
+    try:
+        entries = await stack.enter_async_context(spool_batch(files))
+    except UploadTooLargeError as e:
+        await stack.aclose()
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        await stack.aclose()
+        raise
+    
+    return StreamingResponse(
+        _stream_batch_results(entries, target_role, stack),
+        media_type="application/x-ndjson",
+        # Also clean up if the client disconnects before the stream starts
+        background=BackgroundTask(stack.aclose)
+    )
+
+
+async def _extract_batch_entry(
+    entry: BatchEntry,
+    target_role: Optional[str],
+    parse_semaphore: asyncio.Semaphore,
+    extract_semaphore: asyncio.Semaphore
+) -> dict:
+    """Parse, extract and clean one batch document; errors become the result"""
+    if entry.error:
+        return {"success": False, "error": entry.error}
+    
+    upload = entry.upload
+    document_cache = get_document_cache()
+    try:
+        cached = document_cache.get("extract", upload.sha256, target_role)
+        if cached is not None:
+            return cached
+        
+        async with parse_semaphore:
+            result = await parse_upload(upload)
+        text = result.get("text", "")
+        if result.get("error"):
+            raise ValueError(f"Failed to parse document: {result['error']}")
+        if len(text.strip()) < 50:
+            raise ValueError("Could not extract meaningful text from file")
+        
+        async with extract_semaphore:
+            response = await _build_extract_response(ExtractRequest(text=text, target_role=target_role))
+        
+        payload = response.model_dump(exclude={"validation_job_id"})
+        document_cache.set("extract", upload.sha256, payload, target_role)
+        return payload
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+async def _stream_batch_results(
+    entries: list[BatchEntry],
+    target_role: Optional[str],
+    stack: AsyncExitStack
+) -> AsyncIterator[str]:
+    """Run the batch pipeline and yield one NDJSON line per document as it finishes"""
+    settings = get_settings()
+    parse_semaphore = asyncio.Semaphore(max(1, settings.BATCH_PARSE_CONCURRENCY))
+    extract_semaphore = asyncio.Semaphore(max(1, settings.BATCH_EXTRACT_CONCURRENCY))
+    started = time.perf_counter()
+    
+    async def run(index: int, entry: BatchEntry) -> dict:
+        result = await _extract_batch_entry(entry, target_role, parse_semaphore, extract_semaphore)
+        return {"type": "result", "index": index, "filename": entry.filename, **result}
+    
+    tasks = [asyncio.ensure_future(run(i, entry)) for i, entry in enumerate(entries)]
+    succeeded = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            succeeded += bool(result.get("success"))
+            yield json.dumps(result, default=str) + "\n"
+        
+        yield json.dumps({
+            "type": "summary",
+            "total": len(entries),
+            "succeeded": succeeded,
+            "failed": len(entries) - succeeded,
+            "duration_seconds": round(time.perf_counter() - started, 3)
+        }) + "\n"
+    finally:
+        # Client gone or stream finished: stop outstanding work and delete the spooled files
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await stack.aclose()
+
+
 # ============================================================================
 # ENDPOINT 2: /api/enhance - Enhance CV Content
 # ============================================================================
 
+EnhanceJob = tuple[str, Optional[int], Callable[[], Awaitable[Any]]]
+
+
+def _plan_enhancement_jobs(
+    request: EnhanceRequest,
+    enhancer: ProfileEnhancer,
+    enhanced_cv: CVData
+) -> list[EnhanceJob]:
+    """
+    Build the independent LLM jobs for an enhancement request
+    
+    Each job is a (section, index, run) tuple. ``run`` performs one LLM call
+    and writes its result into ``enhanced_cv`` at its own index, so jobs can
+    finish in any order. Batched jobs cover a whole section and have index None.
+    """
+    jobs: list[EnhanceJob] = []
+    batch_threshold = get_settings().ENHANCE_BATCH_THRESHOLD
+    
+    # 1. Professional summary
+    if request.enhance_summary and enhanced_cv.summary:
+        async def enhance_summary():
+            enhanced_cv.summary = await enhancer.enhance_summary(
+                enhanced_cv.summary,
+                role=request.target_role
+            )
+            return enhanced_cv.summary
+        
+        jobs.append(("summary", None, enhance_summary))
+    
+    # 2. Work experience
+    if request.enhance_experience and enhanced_cv.experience:
+        for i, exp in enumerate(enhanced_cv.experience):
+            async def enhance_experience(i=i, exp=exp):
+                enhanced_cv.experience[i] = await enhancer.enhance_experience_description(
+                    exp,
+                    focus_on=request.enhancement_focus
+                )
+                return enhanced_cv.experience[i]
+            
+            jobs.append(("experience", i, enhance_experience))
+    
+    # 2b. Education degrees (batched into one completion for longer lists)
+    if enhanced_cv.education:
+        def education_dict(edu):
+            return {
+                "institution": edu.institution or "",
+                "degree": edu.degree or "",
+                "field_of_study": edu.field_of_study or "",
+                "school": edu.institution or ""
+            }
+        
+        def apply_education(i, enhanced_edu_dict):
+            if enhanced_edu_dict.get("degree"):
+                enhanced_cv.education[i].degree = enhanced_edu_dict["degree"]
+        
+        if len(enhanced_cv.education) >= batch_threshold:
+            async def enhance_education_batch():
+                enhanced = await enhancer.enhance_education_degrees(
+                    [education_dict(edu) for edu in enhanced_cv.education]
+                )
+                for i, enhanced_edu_dict in enumerate(enhanced):
+                    apply_education(i, enhanced_edu_dict)
+                return enhanced_cv.education
+            
+            jobs.append(("education", None, enhance_education_batch))
+        else:
+            for i, edu in enumerate(enhanced_cv.education):
+                async def enhance_education(i=i, edu=edu):
+                    apply_education(i, await enhancer.enhance_education_degree(education_dict(edu)))
+                    return enhanced_cv.education[i]
+                
+                jobs.append(("education", i, enhance_education))
+    
+    # 2c. Projects (description and technologies, batched for longer lists)
+    if request.enhance_project and enhanced_cv.projects:
+        def project_dict(proj):
+            return {
+                "name": proj.name or "",
+                "description": proj.description or "",
+                "technologies": proj.technologies or [],
+                "url": proj.url or "",
+                "repository": proj.repository or ""
+            }
+        
+        def apply_project(i, enhanced_proj_dict):
+            if enhanced_proj_dict.get("description"):
+                enhanced_cv.projects[i].description = enhanced_proj_dict["description"]
+            if enhanced_proj_dict.get("technologies"):
+                enhanced_cv.projects[i].technologies = enhanced_proj_dict["technologies"]
+        
+        if len(enhanced_cv.projects) >= batch_threshold:
+            async def enhance_project_batch():
+                enhanced = await enhancer.enhance_projects(
+                    [project_dict(proj) for proj in enhanced_cv.projects]
+                )
+                for i, enhanced_proj_dict in enumerate(enhanced):
+                    apply_project(i, enhanced_proj_dict)
+                return enhanced_cv.projects
+            
+            jobs.append(("project", None, enhance_project_batch))
+        else:
+            for i, proj in enumerate(enhanced_cv.projects):
+                async def enhance_project(i=i, proj=proj):
+                    apply_project(i, await enhancer.enhance_project(project_dict(proj)))
+                    return enhanced_cv.projects[i]
+                
+                jobs.append(("project", i, enhance_project))
+    
+    return jobs
+
+
+async def _iter_completed(
+    jobs: list[EnhanceJob],
+    max_concurrency: int
+) -> AsyncIterator[tuple[EnhanceJob, Any]]:
+    """
+    Run jobs concurrently with at most ``max_concurrency`` in flight
+    
+    Yields (job, result) pairs as each job finishes. If a job fails, or the
+    consumer stops iterating, the remaining jobs are cancelled and awaited.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def run(job):
+        async with semaphore:
+            return job, await job[2]()
+    
+    tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait for cancelled jobs to unwind (closing their LLM calls) and
+        # retrieve the exceptions of jobs that failed after the consumer stopped
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _count_improvements(
+    request: EnhanceRequest,
+    original_cv: CVData,
+    enhanced_cv: CVData,
+    jobs: list[EnhanceJob]
+) -> dict:
+    """Summarize what an enhancement run changed"""
+    return {
+        "summary_enhanced": any(section == "summary" for section, _, _ in jobs)
+            and enhanced_cv.summary != original_cv.summary,
+        "experiences_enhanced": sum(1 for section, _, _ in jobs if section == "experience"),
+        "metrics_added": 0,
+        "keywords_optimized": "keywords" in request.enhancement_focus and bool(request.target_role)
+    }
+
+
+def _build_enhance_response(
+    request: EnhanceRequest,
+    original_cv: CVData,
+    enhanced_cv: CVData,
+    jobs: list[EnhanceJob]
+) -> EnhanceResponse:
+    """Assemble the EnhanceResponse once every job has finished"""
+    improvements = _count_improvements(request, original_cv, enhanced_cv, jobs)
+    
+    # Create before/after comparison
+    before_after = {
+        "summary": {
+            "before": original_cv.summary,
+            "after": enhanced_cv.summary
+        },
+        "experience_count": len(enhanced_cv.experience or []),
+        "improvements_made": improvements["experiences_enhanced"]
+    }
+    
+    return EnhanceResponse(
+        success=True,
+        enhanced_cv=enhanced_cv.model_dump(),
+        improvements=improvements,
+        before_after_comparison=before_after,
+        message=f"CV enhanced successfully. Improved {improvements['experiences_enhanced']} experiences, added {improvements['metrics_added']} metrics"
+    )
+
+
 @router.post("/enhance", response_model=EnhanceResponse)
 async def enhance_cv_content(request: EnhanceRequest):
     """
@@ -303,99 +687,91 @@ async def enhance_cv_content(request: EnhanceRequest):
     """
     try:
         enhancer = ProfileEnhancer()
-        quantifier = ImpactQuantifier()
         
         # Store original for comparison
         original_cv = request.cv_data.model_copy(deep=True)
         enhanced_cv = request.cv_data.model_copy(deep=True)
         
-        improvements = {
-            "summary_enhanced": False,
-            "experiences_enhanced": 0,
-            "metrics_added": 0,
-            "keywords_optimized": False
-        }
+        # Run every independent section enhancement concurrently (results are
+        # written back by index, so the original order is preserved)
+        jobs = _plan_enhancement_jobs(request, enhancer, enhanced_cv)
+        async for _ in _iter_completed(jobs, get_settings().ENHANCE_MAX_CONCURRENCY):
+            pass
         
-        # 1. Enhance Professional Summary
-        if request.enhance_summary and enhanced_cv.summary:
-            original_summary = enhanced_cv.summary
-            enhanced_cv.summary = await enhancer.enhance_summary(
-                enhanced_cv.summary,
-                role=request.target_role
-            )
-            if enhanced_cv.summary != original_summary:
-                improvements["summary_enhanced"] = True
-        
-        # 2. Enhance Work Experience
-        if request.enhance_experience and enhanced_cv.experience:
-            for i, exp in enumerate(enhanced_cv.experience):
-                # Enhance description
-                enhanced_exp = await enhancer.enhance_experience_description(
-                    exp,
-                    focus_on=request.enhancement_focus
-                )
-                enhanced_cv.experience[i] = enhanced_exp
-                improvements["experiences_enhanced"] += 1
+        return _build_enhance_response(request, original_cv, enhanced_cv, jobs)
         
-        # 2b. Enhance Education Degrees
-        if enhanced_cv.education:
-            for i, edu in enumerate(enhanced_cv.education):
-                # Convert to dict for enhancement
-                edu_dict = {
-                    "institution": edu.institution or "",
-                    "degree": edu.degree or "",
-                    "field_of_study": edu.field_of_study or "",
-                    "school": edu.institution or ""
-                }
-                # Enhance the degree
-                enhanced_edu_dict = await enhancer.enhance_education_degree(edu_dict)
-                # Update the degree field
-                if enhanced_edu_dict.get("degree"):
-                    enhanced_cv.education[i].degree = enhanced_edu_dict["degree"]
-        
-        # 2c. Enhance Projects (description and technologies)
-        if request.enhance_project and enhanced_cv.projects:
-            for i, proj in enumerate(enhanced_cv.projects):
-                # Convert to dict for enhancement
-                proj_dict = {
-                    "name": proj.name or "",
-                    "description": proj.description or "",
-                    "technologies": proj.technologies or [],
-                    "url": proj.url or "",
-                    "repository": proj.repository or ""
-                }
-                # Enhance the project
-                enhanced_proj_dict = await enhancer.enhance_project(proj_dict)
-                # Update the project fields
-                if enhanced_proj_dict.get("description"):
-                    enhanced_cv.projects[i].description = enhanced_proj_dict["description"]
-                if enhanced_proj_dict.get("technologies"):
-                    enhanced_cv.projects[i].technologies = enhanced_proj_dict["technologies"]
-        
-        # 3. Optimize keywords if requested
-        if "keywords" in request.enhancement_focus and request.target_role:
-            improvements["keywords_optimized"] = True
-        
-        # 4. Create before/after comparison
-        before_after = {
-            "summary": {
-                "before": original_cv.summary,
-                "after": enhanced_cv.summary
-            },
-            "experience_count": len(enhanced_cv.experience or []),
-            "improvements_made": improvements["experiences_enhanced"]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Enhancement failed: {str(e)}")
+
+
+@router.post("/enhance/stream")
+async def enhance_cv_content_stream(request: EnhanceRequest):
+    """
+    **Node: Profile Enhancer (streaming)**
+    
+    Server-sent-event version of /api/enhance
+    
+    Emits one `section` event per finished LLM job, as soon as it finishes:
+    ```
+    event: section
+    data: {"section": "experience", "index": 2, "data": {...}}
+    ```
+    `index` is null for the summary. Education and project lists enhanced in
+    one batched completion emit one event per entry once the batch finishes.
+    The stream ends with a `complete` event carrying the full
+    `EnhanceResponse`, or an `error` event.
+    """
+    return StreamingResponse(
+        _enhance_event_stream(request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
         }
+    )
+
+
+async def _enhance_event_stream(request: EnhanceRequest) -> AsyncIterator[str]:
+    """Run the enhancement jobs and yield an SSE event as each one finishes"""
+    try:
+        enhancer = ProfileEnhancer()
         
-        return EnhanceResponse(
-            success=True,
-            enhanced_cv=enhanced_cv.model_dump(),
-            improvements=improvements,
-            before_after_comparison=before_after,
-            message=f"CV enhanced successfully. Improved {improvements['experiences_enhanced']} experiences, added {improvements['metrics_added']} metrics"
-        )
+        original_cv = request.cv_data.model_copy(deep=True)
+        enhanced_cv = request.cv_data.model_copy(deep=True)
+        
+        jobs = _plan_enhancement_jobs(request, enhancer, enhanced_cv)
+        async for (section, index, _), result in _iter_completed(jobs, get_settings().ENHANCE_MAX_CONCURRENCY):
+            if index is None and isinstance(result, list):
+                # Batched section: same per-entry events as the unbatched path
+                for i, entry in enumerate(result):
+                    yield create_sse_event("section", {
+                        "section": section,
+                        "index": i,
+                        "data": _to_jsonable(entry)
+                    })
+                continue
+            
+            yield create_sse_event("section", {
+                "section": section,
+                "index": index,
+                "data": _to_jsonable(result)
+            })
+        
+        response = _build_enhance_response(request, original_cv, enhanced_cv, jobs)
+        yield create_sse_event("complete", response.model_dump())
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Enhancement failed: {str(e)}")
+        yield create_sse_event("error", {"error": f"Enhancement failed: {str(e)}"})
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert section results (models, lists of models, strings) to JSON-ready data"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_to_jsonable(item) for item in value]
+    return value
 
 
 # ============================================================================
@@ -432,7 +808,8 @@ async def build_styled_cv(request: BuildRequest):
         if request.format == "html":
             content = builder.to_html(
                 request.cv_data,
-                style=request.style
+                style=request.style,
+                color_scheme=request.color_scheme
             )
             
         elif request.format == "markdown":
@@ -468,6 +845,66 @@ async def build_styled_cv(request: BuildRequest):
         raise HTTPException(status_code=500, detail=f"Build failed: {str(e)}")
 
 
+BUILD_MEDIA_TYPES = {
+    "html": "text/html",
+    "markdown": "text/markdown",
+    "json": "application/json"
+}
+
+
+@router.post("/build/stream")
+async def build_styled_cv_stream(request: BuildRequest):
+    """
+    **Node: CV Builder (streaming)**
+        
+    Streaming version of /api/build
+        
+    Takes the same request, but the response body is the document itself
+    (`text/html`, `text/markdown` or `application/json`), streamed from the
+    template as it renders instead of wrapped in JSON. Browsers start
+    painting the header before the last sections are rendered, and the
+    server never holds the whole document or its JSON-escaped copy.
+        
+    No preview file is written; use /api/build for a `preview_url`.
+    """
+    builder = CVBuilder()
+    try:
+        if request.format == "html":
+            chunks = builder.stream_html(
+                request.cv_data,
+                style=request.style,
+                color_scheme=request.color_scheme
+            )
+        elif request.format == "markdown":
+            chunks = builder.stream_markdown(request.cv_data)
+        else:
+            chunks = iter((builder.to_json(request.cv_data),))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Build failed: {str(e)}")
+        
+    return StreamingResponse(
+        chunks,
+        media_type=BUILD_MEDIA_TYPES[request.format],
+        headers={
+            "Content-Disposition": f'inline; filename="cv.{request.format}"',
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get("/themes")
+async def get_themes():
+    """
+    List the HTML CV styles accepted by /api/build and /api/export
+    
+    Each style's stylesheet is a versioned, long-cacheable /static asset.
+    """
+    return {
+        "themes": list_themes(),
+        "color_schemes": COLOR_SCHEMES
+    }
+
+
 # ============================================================================
 # ENDPOINT 4: /api/export - Export to PDF/DOCX
 # ============================================================================
@@ -502,8 +939,13 @@ async def export_cv_file(request: ExportRequest, background_tasks: BackgroundTas
         file_id = str(uuid.uuid4())
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Build HTML first
-        html_content = builder.to_html(request.cv_data, style=request.style)
+        # Build HTML first (self-contained: the PDF renderer does not fetch /static)
+        html_content = builder.to_html(
+            request.cv_data,
+            style=request.style,
+            color_scheme=request.color_scheme,
+            inline_css=True
+        )
         
         if request.format == "pdf":
             # Use the PDFGenerator service
@@ -690,7 +1132,6 @@ async def compare_cv_versions(request: FeedbackRequest):
     """
     try:
         from langchain_core.prompts import ChatPromptTemplate
-        from langchain_core.output_parsers import JsonOutputParser
         
         llm = get_llm()
         
@@ -746,9 +1187,7 @@ Provide detailed comparison and feedback.""")
         ]) or "Not provided"
         
         # Run LLM analysis
-        chain = prompt | llm | JsonOutputParser()
-        
-        result = await chain.ainvoke({
+        result = await ainvoke_structured(prompt, llm, CVComparisonFeedback, {
             "criteria": ", ".join(request.criteria),
             "original_summary": original_summary,
             "improved_summary": improved_summary,
@@ -760,11 +1199,7 @@ Provide detailed comparison and feedback.""")
         
         return FeedbackResponse(
             success=True,
-            overall_score=float(result.get("overall_score", 75)),
-            detailed_feedback=result.get("detailed_feedback", {}),
-            strengths=result.get("strengths", []),
-            weaknesses=result.get("weaknesses", []),
-            recommendations=result.get("recommendations", []),
+            **result.model_dump(),
             message="CV comparison completed successfully"
         )
         
@@ -934,11 +1369,21 @@ async def health_check():
         "version": "2.0",
         "endpoints": {
             "extract": "/api/extract",
+            "extract_batch": "/api/extract/batch",
             "enhance": "/api/enhance",
+            "enhance_stream": "/api/enhance/stream",
             "build": "/api/build",
+            "build_stream": "/api/build/stream",
+            "themes": "/api/themes",
             "export": "/api/export",
-            "feedback": "/api/feedback"
-        }
+            "feedback": "/api/feedback",
+            "metrics": "/metrics"
+        },
+        "llm_admission": get_admission_controller().snapshot(),
+        "parser_pool": get_parser_pool().snapshot(),
+        "document_cache": get_document_cache().snapshot(),
+        "render_cache": get_render_cache().snapshot(),
+        "fragment_cache": get_fragment_cache().snapshot()
     }
 
 
@@ -26,6 +26,69 @@ class Settings(BaseSettings):
     OPENAI_TEMPERATURE: float = 0.7
     OPENAI_EMBEDDING_MODEL: str = "text-embedding-3-small"
     
+    # LLM backend: "openai", or "fake" for offline benchmarks and load tests
+    LLM_BACKEND: str = "openai"
+    FAKE_LLM_LATENCY_MS: float = 800.0  # Mean time to first token (and per embeddings call)
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"  # fixed, uniform or lognormal
+    FAKE_LLM_LATENCY_SIGMA: float = 0.5  # Spread of the lognormal distribution
+    FAKE_LLM_TOKENS_PER_SECOND: float = 50.0  # 0 streams without delay
+    FAKE_LLM_RECORDINGS_PATH: Optional[str] = None  # JSON file of {prompt_hash: response}
+    FAKE_LLM_SEED: Optional[int] = None
+    
+    # LLM HTTP connection pool (shared by all LLM clients)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    LLM_HTTP_TIMEOUT: float = 60.0  # seconds
+    
+    # LLM admission control (process-wide; 0 disables a budget)
+    LLM_MAX_IN_FLIGHT: int = 32
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 200000
+    
+    # Structured output (CV extraction, job requirements, enhancer payloads)
+    LLM_STRUCTURED_OUTPUT_MODE: str = "json"  # "json" (prompted JSON + repair), or opt in to "json_schema" (provider-constrained) / "function_calling"
+    LLM_STRUCTURED_MAX_REPAIRS: int = 2  # Rounds of fixing only the invalid fragments of a response
+    
+    # Enhancement pipeline
+    ENHANCE_MAX_CONCURRENCY: int = 6  # Max concurrent LLM calls per /api/enhance request
+    ENHANCE_BATCH_THRESHOLD: int = 3  # Batch education/project entries into one call from this many
+    
+    # Document parsing (off the event loop)
+    PARSER_POOL_MODE: str = "process"  # "process", or "thread" where processes are unavailable
+    PARSER_POOL_SIZE: int = 2  # Worker processes/threads
+    PARSER_POOL_MAX_QUEUE: int = 16  # Parses waiting beyond this are rejected with 503
+    PARSER_TIMEOUT_SECONDS: float = 30.0  # 0 disables the timeout
+    PDF_MAX_PAGES: int = 10  # Pages read from an uploaded PDF (0 for no limit)
+    PDF_MAX_CHARS: int = 60000  # Characters of PDF text kept (~15k tokens; 0 for no limit)
+    PDF_STOP_AT_APPENDIX: bool = True  # Stop reading a PDF at a page headed "Appendix"/"Annex"
+    DOCX_FAST_PARSE_ENABLED: bool = True  # Stream DOCX text from the XML; python-docx is the fallback
+    TEXT_NORMALIZATION_ENABLED: bool = True  # Strip headers/footers, hyphenation and extra whitespace before the LLM
+    
+    # CV extraction
+    CV_PRE_EXTRACTION_ENABLED: bool = True  # Resolve contact/sections/skills without the LLM first
+    CV_SECTION_EXTRACTION_ENABLED: bool = True  # Extract long CVs section by section, concurrently
+    CV_SECTION_EXTRACTION_MIN_CHARS: int = 4000  # Shorter CVs use a single completion
+    CV_SECTION_EXTRACTION_ENTRIES_PER_CALL: int = 3  # Jobs/degrees/projects per section call
+    CV_SECTION_EXTRACTION_CONCURRENCY: int = 6  # Concurrent section calls per CV
+    CV_VALIDATION_JOB_TTL_SECONDS: int = 3600  # How long opt-in LLM validation results can be polled
+    CV_VALIDATION_JOB_MAX_ENTRIES: int = 1000
+    
+    # Document fingerprint cache (parse/extract results keyed on upload SHA-256)
+    DOCUMENT_CACHE_ENABLED: bool = True
+    DOCUMENT_CACHE_MAX_ENTRIES: int = 512
+    DOCUMENT_CACHE_TTL_SECONDS: int = 86400  # 24 hours
+    
+    # CV rendering (Jinja templates in app/templates/cv)
+    TEMPLATE_CACHE_SIZE: int = 64  # Compiled templates kept per process
+    TEMPLATE_AUTO_RELOAD: bool = False  # Recompile templates changed on disk (development)
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None  # Persist compiled bytecode across restarts/workers
+    CV_STATIC_BASE_URL: str = "/static"  # Where theme stylesheets are served (set to a CDN/API origin if needed)
+    RENDER_CACHE_ENABLED: bool = True  # Reuse Markdown/HTML for identical CVData and render options
+    RENDER_CACHE_MAX_ENTRIES: int = 256
+    RENDER_CACHE_TTL_SECONDS: int = 3600
+    FRAGMENT_CACHE_MAX_ENTRIES: int = 4096  # Rendered sections/entries (see RENDER_CACHE_ENABLED)
+    
     # CORS Configuration
     CORS_ORIGINS: list = ["*"]  # In production, specify exact origins
     
@@ -33,12 +96,25 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".doc", ".txt"]
     
+    # Batch extraction (/api/extract/batch)
+    BATCH_MAX_UPLOAD_SIZE: int = 500 * 1024 * 1024  # 500MB per request (each document still has MAX_UPLOAD_SIZE)
+    BATCH_MAX_FILES: int = 1000
+    BATCH_PARSE_CONCURRENCY: int = 2  # Documents parsed at once (keep within the parser pool's capacity)
+    BATCH_EXTRACT_CONCURRENCY: int = 8  # Documents in LLM extraction at once
+    
     # Database (if needed in future)
     DATABASE_URL: Optional[str] = None
     
-    # Redis (if needed for caching)
+    # Redis (optional second tier for the LLM response cache)
     REDIS_URL: Optional[str] = None
     
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 1024
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_REDIS_PREFIX: str = "rolekit:llm:"
+    LLM_COALESCE_ENABLED: bool = True  # Share one completion between identical in-flight calls
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,26 +1,20 @@
 """
 FastAPI dependencies for dependency injection.
 """
-from functools import lru_cache
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from app.core.config import settings
+from app.services.llm import get_llm_registry
 
 
-@lru_cache()
 def get_llm() -> ChatOpenAI:
-    """Get OpenAI LLM instance."""
-    return ChatOpenAI(
+    """Get the shared streaming OpenAI LLM instance."""
+    return get_llm_registry().get_chat_model(
         model=settings.OPENAI_MODEL,
         temperature=settings.OPENAI_TEMPERATURE,
-        openai_api_key=settings.OPENAI_API_KEY,
         streaming=True
     )
 
 
-@lru_cache()
 def get_embeddings() -> OpenAIEmbeddings:
-    """Get OpenAI embeddings instance."""
-    return OpenAIEmbeddings(
-        model=settings.OPENAI_EMBEDDING_MODEL,
-        openai_api_key=settings.OPENAI_API_KEY
-    )
+    """Get the shared OpenAI embeddings instance."""
+    return get_llm_registry().get_embeddings(model=settings.OPENAI_EMBEDDING_MODEL)
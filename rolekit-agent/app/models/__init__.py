@@ -11,6 +11,12 @@ from .cv_models import (
     CVEnhancementRequest,
     CVVersion,
     JobMatchResult,
+    JobRequirements,
+    ExperienceEnhancement,
+    DegreeEnhancement,
+    ProjectEnhancement,
+    CVValidationReport,
+    CVComparisonFeedback,
 )
 
 __all__ = [
@@ -25,4 +31,10 @@ __all__ = [
     'CVEnhancementRequest',
     'CVVersion',
     'JobMatchResult',
+    'JobRequirements',
+    'ExperienceEnhancement',
+    'DegreeEnhancement',
+    'ProjectEnhancement',
+    'CVValidationReport',
+    'CVComparisonFeedback',
 ]
@@ -3,7 +3,7 @@ CV Data Models and Schemas
 Defines Pydantic models for structured CV data
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date
 
 
@@ -137,3 +137,51 @@ class JobMatchResult(BaseModel):
     missing_keywords: List[str] = Field(default_factory=list)
     suggestions: List[str] = Field(default_factory=list)
     ats_friendly: bool = Field(default=True)
+
+
+class JobRequirements(BaseModel):
+    """Requirements extracted from a job description"""
+    role_title: Optional[str] = Field(None, description="Exact role title")
+    required_skills: List[str] = Field(default_factory=list)
+    preferred_skills: List[str] = Field(default_factory=list)
+    experience_years: Optional[float] = Field(None, description="Years of experience required")
+    education_required: Optional[str] = Field(None, description="Degree level")
+    key_responsibilities: List[str] = Field(default_factory=list)
+    must_have_keywords: List[str] = Field(default_factory=list)
+    nice_to_have_keywords: List[str] = Field(default_factory=list)
+    company_culture: List[str] = Field(default_factory=list)
+    tools_technologies: List[str] = Field(default_factory=list)
+
+
+class ExperienceEnhancement(BaseModel):
+    """LLM payload for an enhanced work experience entry"""
+    corrected_position: Optional[str] = Field(None, description="Corrected/validated job title")
+    bullets: List[str] = Field(..., description="Enhanced achievement bullets")
+
+
+class DegreeEnhancement(BaseModel):
+    """LLM payload for an enhanced education degree"""
+    enhanced_degree: str = Field(..., description="Corrected/enhanced degree")
+
+
+class ProjectEnhancement(BaseModel):
+    """LLM payload for an enhanced project"""
+    enhanced_description: str = Field(..., description="Improved project description")
+    enhanced_technologies: List[str] = Field(default_factory=list, description="Validated technologies")
+
+
+class CVValidationReport(BaseModel):
+    """LLM payload for a CV quality review"""
+    is_valid: bool = Field(..., description="Whether the CV data is usable as is")
+    quality_score: int = Field(..., ge=0, le=100, description="Overall quality score (0-100)")
+    issues: List[str] = Field(default_factory=list, description="Problems found")
+    suggestions: List[str] = Field(default_factory=list, description="Improvement suggestions")
+
+
+class CVComparisonFeedback(BaseModel):
+    """LLM payload comparing an original and an improved CV"""
+    overall_score: float = Field(75, ge=0, le=100, description="Improvement score (0-100)")
+    detailed_feedback: Dict[str, Any] = Field(default_factory=dict, description="Feedback by section")
+    strengths: List[str] = Field(default_factory=list, description="Improvements made well")
+    weaknesses: List[str] = Field(default_factory=list, description="Areas needing more work")
+    recommendations: List[str] = Field(default_factory=list, description="Suggestions for further improvement")
@@ -3,6 +3,11 @@ from .schema_extractor import CVSchemaExtractor, CVSchemaValidator
 from .profile_enhancer import ProfileEnhancer, ImpactQuantifier
 from .job_matcher import JobMatchOptimizer, ATSOptimizer
 from .cv_builder import CVBuilder
+from .quality_scorer import CVQualityScorer
+from .validation_jobs import ValidationJobStore, get_validation_jobs
+from .themes import THEMES, Theme, get_theme, list_themes
+from .render_cache import RenderCache, get_fragment_cache, get_render_cache
+from .fragments import render_fragments
 
 __all__ = [
     'CVSchemaExtractor',
@@ -12,4 +17,15 @@ __all__ = [
     'JobMatchOptimizer',
     'ATSOptimizer',
     'CVBuilder',
+    'CVQualityScorer',
+    'ValidationJobStore',
+    'get_validation_jobs',
+    'THEMES',
+    'Theme',
+    'get_theme',
+    'list_themes',
+    'RenderCache',
+    'get_render_cache',
+    'get_fragment_cache',
+    'render_fragments',
 ]
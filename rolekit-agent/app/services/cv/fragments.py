@@ -0,0 +1,140 @@
+"""
+CV Fragments
+Renders a CV section by section, caching each fragment on the hash of its own data
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Iterator, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.models.cv_models import CVData
+from app.services.cv.render_cache import get_fragment_cache
+from app.services.cv.template_env import get_template, get_template_env
+
+EXTENSIONS = {"markdown": "md", "html": "html"}
+
+
+@dataclass(frozen=True)
+class Section:
+    """A document section and the CVData field it renders"""
+
+    name: str  # Template name: "<format>/[<theme>/]<name>.<ext>.j2"
+    field: str
+    item: Optional[str] = None  # Loop variable; each item is its own fragment ("<name>_item" template)
+
+
+MARKDOWN_SECTIONS: Tuple[Section, ...] = (
+    Section("header", "contact"),
+    Section("summary", "summary"),
+    Section("experience", "experience", item="exp"),
+    Section("education", "education", item="edu"),
+    Section("skills", "skills"),
+    Section("projects", "projects", item="project"),
+    Section("certifications", "certifications"),
+    Section("languages", "languages"),
+    Section("awards", "awards"),
+)
+
+HTML_SECTIONS: Tuple[Section, ...] = (
+    Section("header", "contact"),
+    Section("summary", "summary"),
+    Section("experience", "experience", item="exp"),
+    Section("education", "education", item="edu"),
+    Section("projects", "projects", item="project"),
+    Section("skills", "skills"),
+    Section("certifications", "certifications"),
+    Section("languages", "languages"),
+    Section("awards", "awards"),
+    Section("future_goals", "future_goals"),
+)
+
+SECTIONS = {"markdown": MARKDOWN_SECTIONS, "html": HTML_SECTIONS}
+
+
+@lru_cache(maxsize=None)
+def template_name(fmt: str, name: str, theme: Optional[str] = None) -> str:
+    """
+    Resolve a section template, preferring the theme's own version
+
+    Args:
+        fmt: "markdown" or "html"
+        name: Section template name (e.g. "header", "experience_item", "layout")
+        theme: Theme whose overrides are tried first
+
+    Returns:
+        Template name for the environment
+    """
+    ext = EXTENSIONS[fmt]
+    candidates = [f"{fmt}/{theme}/{name}.{ext}.j2"] if theme else []
+    candidates.append(f"{fmt}/{name}.{ext}.j2")
+    return get_template_env().select_template(candidates).name
+
+
+def _context_value(value: Any) -> Any:
+    """Templates see plain dicts, as they did when rendering cv_data.model_dump()"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_context_value(item) for item in value]
+    return value
+
+
+def render_fragment(fmt: str, name: str, theme: Optional[str], variable: str, value: Any) -> str:
+    """
+    Render one fragment, or return it from the fragment cache
+
+    The cache key is the hash of ``value`` and the resolved template, so
+    themes that share a template share its fragments.
+
+    Args:
+        fmt: "markdown" or "html"
+        name: Section template name
+        theme: Theme (HTML only)
+        variable: Name the template knows the value by
+        value: Data the fragment renders
+
+    Returns:
+        Rendered fragment
+    """
+    resolved = template_name(fmt, name, theme)
+    return get_fragment_cache().get_or_render(
+        value,
+        (resolved,),
+        lambda: get_template(resolved).render({variable: _context_value(value)})
+    )
+
+
+def render_fragments(cv_data: CVData, fmt: str, theme: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield a CV's sections in document order
+
+    List sections (experience, education, projects) cache each entry
+    separately, so editing one bullet re-renders only that entry; the
+    section heading around the entries is rendered each time.
+
+    Each template holds exactly the text of its block in the former
+    whole-document template, blank lines and indentation included, so the
+    concatenated output is byte-identical to it (see the cv_render test
+    fixtures). Template files therefore need not end with a newline.
+
+    Args:
+        cv_data: Structured CV data
+        fmt: "markdown" or "html"
+        theme: Theme (HTML only)
+
+    Yields:
+        Rendered fragments, to be concatenated
+    """
+    for section in SECTIONS[fmt]:
+        value = getattr(cv_data, section.field)
+        if section.item is None:
+            yield render_fragment(fmt, section.name, theme, section.field, value)
+            continue
+
+        items = "".join(
+            render_fragment(fmt, f"{section.name}_item", theme, section.item, item)
+            for item in value
+        )
+        template = get_template(template_name(fmt, section.name, theme))
+        yield template.render({section.field: value, "items": items})
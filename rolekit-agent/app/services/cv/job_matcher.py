@@ -3,12 +3,10 @@ Job Match Optimizer Node
 Analyzes job descriptions and optimizes CV for ATS systems
 """
 from typing import List, Dict, Any, Tuple
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.prompts import ChatPromptTemplate
-from app.models.cv_models import CVData, JobMatchResult
-from app.core.config import get_settings
+from app.models.cv_models import CVData, JobMatchResult, JobRequirements
+from app.services.llm import get_llm_registry, ainvoke_structured, llm_operation, StructuredOutputError
 import numpy as np
-import json
 
 
 class JobMatchOptimizer:
@@ -21,17 +19,11 @@ class JobMatchOptimizer:
         Args:
             model: OpenAI model to use
         """
-        settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=model, 
-            temperature=0.3,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
-        self.embeddings = OpenAIEmbeddings(
-            model="text-embedding-3-small",
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        registry = get_llm_registry()
+        self.llm = registry.get_chat_model(model=model, temperature=0.3)
+        self.embeddings = registry.get_embeddings(model="text-embedding-3-small")
     
+    @llm_operation()
     async def extract_job_requirements(self, job_description: str) -> Dict[str, Any]:
         """
         Extract key requirements from job description
@@ -46,7 +38,7 @@ class JobMatchOptimizer:
             ("system", """Extract key requirements from the job description.
 
 Return a JSON object with:
-{
+{{
     "role_title": "exact title",
     "required_skills": ["skill1", "skill2"],
     "preferred_skills": ["skill1", "skill2"],
@@ -57,22 +49,16 @@ Return a JSON object with:
     "nice_to_have_keywords": ["keyword1", "keyword2"],
     "company_culture": ["value1", "value2"],
     "tools_technologies": ["tool1", "tool2"]
-}"""),
+}}"""),
             ("human", "Job Description:\n{job_description}")
         ])
         
-        chain = prompt | self.llm
-        result = await chain.ainvoke({"job_description": job_description})
-        
         try:
-            content = result.content.strip()
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            
-            return json.loads(content.strip())
-        except:
+            requirements = await ainvoke_structured(
+                prompt, self.llm, JobRequirements, {"job_description": job_description}
+            )
+            return requirements.model_dump()
+        except StructuredOutputError:
             return {"error": "Failed to parse job requirements"}
     
     async def calculate_match_score(
@@ -141,6 +127,7 @@ Return a JSON object with:
             ats_friendly=ats_friendly
         )
     
+    @llm_operation()
     async def optimize_cv_for_job(
         self,
         cv_data: CVData,
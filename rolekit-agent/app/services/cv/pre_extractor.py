@@ -0,0 +1,325 @@
+"""
+CV Pre-Extractor
+Deterministic pre-pass that finds contact details, section boundaries and date ranges without an LLM
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\d[\d\s().-]{7,}\d(?![\w/])")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[\w-]+\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s,;|]+", re.IGNORECASE)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}[/.-]\d{{4}}|\d{{4}}[/.-]\d{{1,2}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)",
+    re.IGNORECASE
+)
+
+# Canonical section -> header phrases (compared case-insensitively, without punctuation)
+SECTION_HEADERS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "about me", "about",
+                "objective", "career objective", "career summary"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "relevant experience"),
+    "education": ("education", "academic background", "education and training", "qualifications",
+                  "academic qualifications"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies",
+               "competencies", "technologies", "tech stack", "skills and tools"),
+    "projects": ("projects", "personal projects", "key projects", "selected projects", "side projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications",
+                       "certifications and licenses", "courses"),
+    "languages": ("languages", "language skills"),
+    "awards": ("awards", "honors", "honours", "awards and honors", "achievements"),
+    "publications": ("publications", "papers", "research"),
+    "volunteer": ("volunteer", "volunteering", "volunteer experience", "community involvement"),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+    "references": ("references",),
+}
+
+# Phrases that are also common subheadings within a role or project ("Achievements"
+# under a job, "Technologies" under a project): inside those sections they are content
+SUBHEADING_PHRASES = frozenset({"about", "achievements", "courses", "research", "technologies", "tech stack"})
+NESTING_SECTIONS = ("experience", "projects")
+
+_HEADER_LOOKUP = {phrase: section for section, phrases in SECTION_HEADERS.items() for phrase in phrases}
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:[,;|•·▪●]|\s-\s)\s*")
+_BULLET_RE = re.compile(r"^[\s•·▪●*-]+")
+
+
+@dataclass
+class PreExtraction:
+    """Result of the deterministic pre-pass"""
+
+    contact: Dict[str, str] = field(default_factory=dict)
+    name_guess: Optional[str] = None
+    header: str = ""
+    sections: Dict[str, str] = field(default_factory=dict)
+    date_ranges: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    skills: List[str] = field(default_factory=list)
+
+    @property
+    def resolved_fields(self) -> List[str]:
+        """Top-level CVData fields fully answered by the pre-pass"""
+        return ["skills"] if self.skills else []
+
+    def llm_text(self) -> str:
+        """
+        Text still needing the LLM: the header without contact lines plus
+        every section the pre-pass did not resolve, under normalized headings
+        """
+        parts = [self.header] if self.header else []
+        for section, body in self.sections.items():
+            if section in self.resolved_fields or section in ("references",):
+                continue
+            parts.append(f"## {section.title()}\n{body}")
+        return "\n\n".join(parts)
+
+    def apply(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge pre-extracted values into LLM output (deterministic values win)
+
+        Args:
+            data: CVData-shaped dict from the LLM
+
+        Returns:
+            The same dict, completed
+        """
+        contact = data.get("contact") or {}
+        if not isinstance(contact, dict):
+            contact = {}
+        contact.update(self.contact)
+        if not contact.get("full_name") and self.name_guess:
+            contact["full_name"] = self.name_guess
+        data["contact"] = contact
+
+        if self.skills:
+            data["skills"] = list(dict.fromkeys(self.skills + list(data.get("skills") or [])))
+
+        # Fill missing dates on experience entries from the ranges found in that section, in order
+        ranges = self.date_ranges.get("experience", [])
+        for entry, (start, end) in zip(data.get("experience") or [], ranges):
+            if isinstance(entry, dict):
+                if not entry.get("start_date"):
+                    entry["start_date"] = start
+                if not entry.get("end_date"):
+                    entry["end_date"] = end
+
+        return data
+
+
+def _normalize_header(line: str) -> str:
+    return re.sub(r"[^a-z& ]", "", line.lower().replace("&", "and")).strip()
+
+
+def detect_section(line: str, current: Optional[str] = None) -> Optional[str]:
+    """
+    Canonical section name if ``line`` is a section header
+
+    Args:
+        line: Line of CV text
+        current: Section the line appears in (subheading phrases do not
+            start a new section inside experience or projects)
+
+    Returns:
+        Section name, or None
+    """
+    stripped = line.strip().rstrip(":").strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    phrase = re.sub(r"\s+", " ", _normalize_header(stripped))
+    if current in NESTING_SECTIONS and phrase in SUBHEADING_PHRASES:
+        return None
+    return _HEADER_LOOKUP.get(phrase)
+
+
+def segment_sections(text: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Split CV text at recognised section headers
+
+    Args:
+        text: CV text
+
+    Returns:
+        (text before the first header, {section: body}) with bodies of
+        repeated headers concatenated
+    """
+    header_lines: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current: Optional[str] = None
+
+    for line in text.splitlines():
+        section = detect_section(line, current)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+            continue
+        if current is None:
+            header_lines.append(line)
+        else:
+            sections[current].append(line)
+
+    bodies = {name: "\n".join(lines).strip() for name, lines in sections.items()}
+    return "\n".join(header_lines).strip(), {name: body for name, body in bodies.items() if body}
+
+
+def extract_contact(text: str) -> Dict[str, str]:
+    """Find email, phone and profile URLs"""
+    contact: Dict[str, str] = {}
+
+    if match := EMAIL_RE.search(text):
+        contact["email"] = match.group(0)
+    if match := LINKEDIN_RE.search(text):
+        contact["linkedin"] = match.group(0)
+    if match := GITHUB_RE.search(text):
+        contact["github"] = match.group(0)
+
+    # Phone: only accept 8-15 digits so date ranges and IDs are not mistaken for numbers
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(0))
+        if 8 <= len(digits) <= 15 and not DATE_RANGE_RE.search(match.group(0)):
+            contact["phone"] = match.group(0).strip()
+            break
+
+    for match in URL_RE.finditer(text):
+        url = match.group(0).rstrip(".)")
+        if "linkedin.com" not in url.lower() and "github.com" not in url.lower():
+            contact["website"] = url
+            break
+
+    return contact
+
+
+def find_date_ranges(text: str) -> List[Tuple[str, str]]:
+    """All (start, end) date ranges in ``text``, with current-role markers as "Present" """
+    ranges = []
+    for match in DATE_RANGE_RE.finditer(text):
+        end = match.group("end")
+        if end.lower() in ("present", "current", "now", "today"):
+            end = "Present"
+        ranges.append((match.group("start"), end))
+    return ranges
+
+
+def split_entries(body: str) -> List[str]:
+    """
+    Split a section body into entries (jobs, degrees, ...) at date ranges
+
+    An entry starts at the line holding a date range, or at the title lines
+    directly above it (up to two non-bullet lines). Bodies without date
+    ranges come back as a single entry.
+
+    Args:
+        body: Section text
+
+    Returns:
+        Entry texts in document order
+    """
+    lines = body.splitlines()
+    starts: List[int] = []
+    for i, line in enumerate(lines):
+        if not DATE_RANGE_RE.search(line):
+            continue
+        start = i
+        floor = starts[-1] + 1 if starts else 0
+        while (
+            start > floor
+            and i - start < 2
+            and lines[start - 1].strip()
+            and not _BULLET_RE.match(lines[start - 1])
+        ):
+            start -= 1
+        starts.append(start)
+
+    if len(starts) < 2:
+        return [body] if body.strip() else []
+
+    # Anything before the first entry (an intro line) stays with it
+    starts[0] = 0
+    bounds = starts + [len(lines)]
+    entries = ["\n".join(lines[a:b]).strip() for a, b in zip(bounds, bounds[1:])]
+    return [entry for entry in entries if entry]
+
+
+def parse_skill_list(body: str) -> List[str]:
+    """
+    Parse a skills section made of delimited lists
+
+    Returns an empty list when any line reads like prose, so the section is
+    left to the LLM instead.
+    """
+    skills: List[str] = []
+    for line in body.splitlines():
+        line = _BULLET_RE.sub("", line).strip()
+        if not line:
+            continue
+        # "Languages: Python, Go" -> drop the category label
+        if ":" in line:
+            label, _, rest = line.partition(":")
+            if len(label.split()) <= 3:
+                line = rest.strip()
+        for item in _SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .")
+            if not item:
+                continue
+            if len(item.split()) > 4 or len(item) > 40:
+                return []
+            skills.append(item)
+    return list(dict.fromkeys(skills))
+
+
+_CONTACT_LABEL_RE = re.compile(r"\b(?:e-?mail|phone|tel|mobile|cell|linkedin|github|website|web)\b", re.IGNORECASE)
+
+
+def _is_contact_line(line: str, contact: Dict[str, str]) -> bool:
+    """True if a header line holds nothing but resolved contact details"""
+    remainder = line
+    for value in contact.values():
+        remainder = remainder.replace(value, "")
+    if remainder == line:
+        return False
+    # Whatever is left must be labels and separators only
+    remainder = _CONTACT_LABEL_RE.sub("", remainder)
+    return not re.sub(r"[\s|,;•·:/()-]", "", remainder)
+
+
+def pre_extract(text: str) -> PreExtraction:
+    """
+    Run the deterministic pre-pass over CV text
+
+    Args:
+        text: Raw CV text
+
+    Returns:
+        PreExtraction with contact fields, sections, date ranges and skills
+    """
+    header, sections = segment_sections(text)
+    contact = extract_contact(header or text[:2000])
+
+    header_lines = [line for line in header.splitlines() if line.strip() and not _is_contact_line(line, contact)]
+
+    name_guess = None
+    for line in header_lines:
+        candidate = line.strip()
+        if (
+            1 <= len(candidate.split()) <= 5
+            and not re.search(r"[\d@/:]", candidate)
+            and not detect_section(candidate)
+        ):
+            name_guess = candidate
+            break
+
+    skills = parse_skill_list(sections["skills"]) if "skills" in sections else []
+
+    return PreExtraction(
+        contact=contact,
+        name_guess=name_guess,
+        header="\n".join(header_lines),
+        sections=sections,
+        date_ranges={name: find_date_ranges(body) for name, body in sections.items()},
+        skills=skills,
+    )
@@ -3,13 +3,55 @@ Profile Enhancer Node
 Uses LLM to enhance CV content with professional phrasing and impact statements
 """
 from typing import List, Dict, Any
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from app.models.cv_models import CVData, WorkExperience
-from app.core.config import get_settings
+from app.models.cv_models import (
+    CVData,
+    WorkExperience,
+    ExperienceEnhancement,
+    DegreeEnhancement,
+    ProjectEnhancement,
+)
+from app.services.llm import (
+    get_llm_registry,
+    ainvoke_prompt,
+    ainvoke_structured,
+    llm_operation,
+    parse_json_content,
+    StructuredOutputError,
+)
+import asyncio
 import json
 
 
+DEGREE_GUIDELINES = """**PART 1: Validate & Correct Degree**
+- Check if the degree is written correctly and professionally
+- Fix common mistakes: typos, poor grammar, inconsistent capitalization, awkward phrasing
+- Ensure it follows academic naming conventions
+- Examples of corrections:
+  ✓ "bsc computer scince" → "Bachelor of Science in Computer Science"
+  ✓ "B.A english" → "Bachelor of Arts in English"
+  ✓ "mba" → "Master of Business Administration"
+  ✓ "PhD Physics" → "Doctor of Philosophy in Physics"
+  ✓ "BS" → "Bachelor of Science"
+- If the degree is already correct, keep it unchanged
+- Be formal and use full names (not abbreviations unless standard)"""
+
+PROJECT_GUIDELINES = """**PART 1: Enhance Description**
+- Make the description more impactful and results-focused
+- Add metrics and outcomes if possible
+- Use professional, concise language
+- Highlight the key achievements and business value
+- Keep it between 1-3 sentences
+
+**PART 2: Validate & Enhance Technologies**
+- Review the list of technologies
+- Ensure proper capitalization and naming conventions
+- Remove duplicates
+- Ensure they are actual technologies/tools
+- Examples: "react" → "React", "node" → "Node.js", "sql" → "SQL", etc.
+- Keep them in a comma-separated list format"""
+
+
 class ProfileEnhancer:
     """Enhances CV content using LLM"""
     
@@ -21,13 +63,9 @@ class ProfileEnhancer:
             model: OpenAI model to use
             temperature: LLM temperature
         """
-        settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=model, 
-            temperature=temperature,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        self.llm = get_llm_registry().get_chat_model(model=model, temperature=temperature)
     
+    @llm_operation()
     async def enhance_summary(self, summary: str, role: str = None, experience_level: str = None) -> str:
         """
         Enhance professional summary
@@ -67,11 +105,11 @@ Return ONLY the enhanced summary, no extra text or explanation."""),
             ("human", f"Context: {context_str}\n\nOriginal summary:\n{summary}")
         ])
         
-        chain = prompt | self.llm
-        result = await chain.ainvoke({})
+        result = await ainvoke_prompt(prompt, self.llm)
         
         return result.content.strip()
     
+    @llm_operation()
     async def enhance_experience_description(
         self,
         experience: WorkExperience,
@@ -167,60 +205,33 @@ Tasks:
 Enhance the description with focus on: {focus_areas}""")
         ])
         
-        chain = prompt | self.llm
-        
-        result = await chain.ainvoke({
-            "position": experience.position,
-            "company": experience.company,
-            "description": experience.description or "Not provided",
-            "achievements": json.dumps(experience.achievements) if experience.achievements else "[]",
-            "technologies": ", ".join(experience.technologies) if experience.technologies else "Not specified",
-            "focus_areas": ", ".join(focus_areas)
-        })
-        
-        # Parse the result
-        content = result.content.strip()
-        
-        # Try to extract JSON with corrected position and bullets
         try:
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            
-            response_data = json.loads(content.strip())
-            
-            # Update position if it was corrected
-            if isinstance(response_data, dict):
-                if "corrected_position" in response_data and response_data["corrected_position"]:
-                    corrected_title = response_data["corrected_position"].strip()
-                    # Only update if different from original (meaning LLM corrected it)
-                    if corrected_title and corrected_title != experience.position:
-                        experience.position = corrected_title
-                
-                # Update achievements/bullets
-                if "bullets" in response_data:
-                    enhanced_bullets = response_data["bullets"]
-                    if isinstance(enhanced_bullets, list):
-                        experience.achievements = enhanced_bullets
-                    else:
-                        # Fallback if bullets is a string
-                        experience.achievements = [enhanced_bullets]
-            else:
-                # Legacy support: if response is just an array
-                if isinstance(response_data, list):
-                    experience.achievements = response_data
-            
-        except json.JSONDecodeError:
-            # If JSON parsing fails, split by newlines
-            bullets = [line.strip().lstrip('•-*').strip() 
-                      for line in content.split('\n') 
-                      if line.strip() and not line.strip().startswith('[')]
-            experience.achievements = bullets
+            response_data = await ainvoke_structured(prompt, self.llm, ExperienceEnhancement, {
+                "position": experience.position,
+                "company": experience.company,
+                "description": experience.description or "Not provided",
+                "achievements": json.dumps(experience.achievements) if experience.achievements else "[]",
+                "technologies": ", ".join(experience.technologies) if experience.technologies else "Not specified",
+                "focus_areas": ", ".join(focus_areas)
+            })
+        except StructuredOutputError:
+            # Unusable response even after repair: keep the original entry
+            return experience
+        
+        # Update position if it was corrected
+        if response_data.corrected_position:
+            corrected_title = response_data.corrected_position.strip()
+            # Only update if different from original (meaning LLM corrected it)
+            if corrected_title and corrected_title != experience.position:
+                experience.position = corrected_title
+        
+        # Update achievements/bullets
+        if response_data.bullets:
+            experience.achievements = response_data.bullets
         
         return experience
     
+    @llm_operation()
     async def enhance_education_degree(self, education_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enhance and validate education degree field
@@ -236,18 +247,7 @@ Enhance the description with focus on: {focus_areas}""")
 
 Your task: Validate and enhance the degree field
 
-**PART 1: Validate & Correct Degree**
-- Check if the degree is written correctly and professionally
-- Fix common mistakes: typos, poor grammar, inconsistent capitalization, awkward phrasing
-- Ensure it follows academic naming conventions
-- Examples of corrections:
-  ✓ "bsc computer scince" → "Bachelor of Science in Computer Science"
-  ✓ "B.A english" → "Bachelor of Arts in English"
-  ✓ "mba" → "Master of Business Administration"
-  ✓ "PhD Physics" → "Doctor of Philosophy in Physics"
-  ✓ "BS" → "Bachelor of Science"
-- If the degree is already correct, keep it unchanged
-- Be formal and use full names (not abbreviations unless standard)
+""" + DEGREE_GUIDELINES + """
 
 **Return Format:**
 Return ONLY a JSON object with one field:
@@ -261,37 +261,23 @@ Field of Study: {field_of_study}
 Please validate and enhance the degree field if needed.""")
         ])
         
-        chain = prompt | self.llm
-        result = await chain.ainvoke({
-            "school": education_data.get("institution") or education_data.get("school") or "Unknown",
-            "degree": education_data.get("degree") or "Not provided",
-            "field_of_study": education_data.get("field_of_study") or ""
-        })
-        
-        # Parse the result
-        content = result.content.strip()
-        
         try:
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            
-            response_data = json.loads(content.strip())
+            response_data = await ainvoke_structured(prompt, self.llm, DegreeEnhancement, {
+                "school": education_data.get("institution") or education_data.get("school") or "Unknown",
+                "degree": education_data.get("degree") or "Not provided",
+                "field_of_study": education_data.get("field_of_study") or ""
+            })
             
             # Update degree if it was enhanced
-            if isinstance(response_data, dict) and "enhanced_degree" in response_data:
-                enhanced_degree = response_data["enhanced_degree"].strip()
-                if enhanced_degree:
-                    education_data["degree"] = enhanced_degree
+            self._apply_degree_enhancement(education_data, response_data.model_dump())
             
-        except json.JSONDecodeError:
-            # If JSON parsing fails, just keep the original
+        except StructuredOutputError:
+            # If the response cannot be parsed, just keep the original
             pass
         
         return education_data
     
+    @llm_operation()
     async def enhance_project(self, project_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enhance project description and technologies
@@ -307,20 +293,7 @@ Please validate and enhance the degree field if needed.""")
 
 Your task: Enhance and validate the project information
 
-**PART 1: Enhance Description**
-- Make the description more impactful and results-focused
-- Add metrics and outcomes if possible
-- Use professional, concise language
-- Highlight the key achievements and business value
-- Keep it between 1-3 sentences
-
-**PART 2: Validate & Enhance Technologies**
-- Review the list of technologies
-- Ensure proper capitalization and naming conventions
-- Remove duplicates
-- Ensure they are actual technologies/tools
-- Examples: "react" → "React", "node" → "Node.js", "sql" → "SQL", etc.
-- Keep them in a comma-separated list format
+""" + PROJECT_GUIDELINES + """
 
 **Return Format:**
 Return ONLY a JSON object with these fields:
@@ -337,49 +310,198 @@ Repository: {repository}
 Please enhance the description and validate the technologies list.""")
         ])
         
-        chain = prompt | self.llm
-        
         # Format technologies for the prompt
         tech_list = ", ".join(project_data.get("technologies", [])) if project_data.get("technologies") else "Not provided"
         
-        result = await chain.ainvoke({
-            "name": project_data.get("name") or "Untitled Project",
-            "description": project_data.get("description") or "No description provided",
-            "technologies": tech_list,
-            "url": project_data.get("url") or "",
-            "repository": project_data.get("repository") or ""
-        })
-        
-        # Parse the result
-        content = result.content.strip()
-        
         try:
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
+            response_data = await ainvoke_structured(prompt, self.llm, ProjectEnhancement, {
+                "name": project_data.get("name") or "Untitled Project",
+                "description": project_data.get("description") or "No description provided",
+                "technologies": tech_list,
+                "url": project_data.get("url") or "",
+                "repository": project_data.get("repository") or ""
+            })
             
-            response_data = json.loads(content.strip())
+            # Update description and technologies if they were enhanced
+            self._apply_project_enhancement(project_data, response_data.model_dump())
             
-            # Update description if it was enhanced
-            if isinstance(response_data, dict):
-                if "enhanced_description" in response_data:
-                    enhanced_desc = response_data["enhanced_description"].strip()
-                    if enhanced_desc:
-                        project_data["description"] = enhanced_desc
-                
-                if "enhanced_technologies" in response_data:
-                    enhanced_techs = response_data["enhanced_technologies"]
-                    if isinstance(enhanced_techs, list) and enhanced_techs:
-                        project_data["technologies"] = enhanced_techs
-            
-        except json.JSONDecodeError:
-            # If JSON parsing fails, just keep the original
+        except StructuredOutputError:
+            # If the response cannot be parsed, just keep the original
             pass
         
         return project_data
     
+    @llm_operation()
+    async def enhance_education_degrees(self, education_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enhance the degree field of several education entries in one completion
+        
+        Items missing from the batch response (or all items, if the response
+        does not parse) fall back to enhance_education_degree one by one.
+        
+        Args:
+            education_items: Education entries with school, degree, field_of_study
+            
+        Returns:
+            Enhanced education entries in the same order
+        """
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an expert at validating and enhancing education credentials.
+
+Your task: Validate and enhance the degree field of EVERY education entry provided
+
+""" + DEGREE_GUIDELINES + """
+
+**Return Format:**
+Return ONLY a JSON array with one object per entry, in any order, each with the entry's index:
+[
+  {{"index": 0, "enhanced_degree": "The corrected/enhanced degree"}}
+]"""),
+            ("human", """Education entries:
+{items}
+
+Please validate and enhance the degree field of each entry if needed.""")
+        ])
+        
+        items = [
+            {
+                "index": i,
+                "school": item.get("institution") or item.get("school") or "Unknown",
+                "degree": item.get("degree") or "Not provided",
+                "field_of_study": item.get("field_of_study") or ""
+            }
+            for i, item in enumerate(education_items)
+        ]
+        
+        result = await ainvoke_prompt(prompt, self.llm, {
+            "items": json.dumps(items, indent=2, ensure_ascii=False)
+        })
+        
+        responses = self._parse_batch_response(result.content, len(education_items))
+        
+        missing = []
+        for i, item in enumerate(education_items):
+            if i in responses:
+                self._apply_degree_enhancement(item, responses[i])
+            else:
+                missing.append(i)
+        
+        if missing:
+            await asyncio.gather(*(self.enhance_education_degree(education_items[i]) for i in missing))
+        
+        return education_items
+    
+    @llm_operation()
+    async def enhance_projects(self, projects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Enhance several projects in one completion
+        
+        Items missing from the batch response (or all items, if the response
+        does not parse) fall back to enhance_project one by one.
+        
+        Args:
+            projects: Project dicts with name, description, technologies, etc.
+            
+        Returns:
+            Enhanced project dicts in the same order
+        """
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an expert at enhancing project descriptions for professional portfolios.
+
+Your task: Enhance and validate the information of EVERY project provided
+
+""" + PROJECT_GUIDELINES + """
+
+**Return Format:**
+Return ONLY a JSON array with one object per project, in any order, each with the project's index:
+[
+  {{
+    "index": 0,
+    "enhanced_description": "The improved project description",
+    "enhanced_technologies": ["Technology 1", "Technology 2", "Technology 3"]
+  }}
+]"""),
+            ("human", """Projects:
+{items}
+
+Please enhance the description and validate the technologies list of each project.""")
+        ])
+        
+        items = [
+            {
+                "index": i,
+                "name": project.get("name") or "Untitled Project",
+                "description": project.get("description") or "No description provided",
+                "technologies": project.get("technologies") or [],
+                "url": project.get("url") or "",
+                "repository": project.get("repository") or ""
+            }
+            for i, project in enumerate(projects)
+        ]
+        
+        result = await ainvoke_prompt(prompt, self.llm, {
+            "items": json.dumps(items, indent=2, ensure_ascii=False)
+        })
+        
+        responses = self._parse_batch_response(result.content, len(projects))
+        
+        missing = []
+        for i, project in enumerate(projects):
+            if i in responses:
+                self._apply_project_enhancement(project, responses[i])
+            else:
+                missing.append(i)
+        
+        if missing:
+            await asyncio.gather(*(self.enhance_project(projects[i]) for i in missing))
+        
+        return projects
+    
+    @staticmethod
+    def _parse_batch_response(content: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Parse a batch completion into {index: item} for indexes 0..count-1
+        
+        Returns an empty dict if the content is not a JSON array.
+        """
+        try:
+            items = parse_json_content(content, expect=list)
+        except StructuredOutputError:
+            return {}
+        
+        responses = {}
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index", position if len(items) == count else None)
+            if isinstance(index, int) and 0 <= index < count:
+                responses[index] = item
+        
+        return responses
+    
+    @staticmethod
+    def _apply_degree_enhancement(education_data: Dict[str, Any], response_data: Any):
+        """Copy an enhanced degree from an LLM response into the education entry"""
+        if isinstance(response_data, dict) and isinstance(response_data.get("enhanced_degree"), str):
+            enhanced_degree = response_data["enhanced_degree"].strip()
+            if enhanced_degree:
+                education_data["degree"] = enhanced_degree
+    
+    @staticmethod
+    def _apply_project_enhancement(project_data: Dict[str, Any], response_data: Any):
+        """Copy an enhanced description and technologies from an LLM response into the project"""
+        if not isinstance(response_data, dict):
+            return
+        
+        if isinstance(response_data.get("enhanced_description"), str):
+            enhanced_desc = response_data["enhanced_description"].strip()
+            if enhanced_desc:
+                project_data["description"] = enhanced_desc
+        
+        enhanced_techs = response_data.get("enhanced_technologies")
+        if isinstance(enhanced_techs, list) and enhanced_techs:
+            project_data["technologies"] = enhanced_techs
+    
     async def enhance_full_cv(
         self,
         cv_data: CVData,
@@ -420,6 +542,7 @@ Please enhance the description and validate the technologies list.""")
         
         return cv_data
     
+    @llm_operation()
     async def rewrite_with_tone(self, text: str, tone: str = "professional") -> str:
         """
         Rewrite text with specific tone
@@ -450,6 +573,7 @@ Please enhance the description and validate the technologies list.""")
         
         return result.content.strip()
 
+    @llm_operation()
     async def suggest_skills(self, cv_data: Dict[str, Any]) -> List[str]:
         """
         Suggest relevant skills based on experience, projects, and technologies
@@ -518,36 +642,20 @@ Existing Skills (avoid these):
 Suggested Skills (JSON array only):""")
         ])
         
-        chain = prompt | self.llm
-        result = await chain.ainvoke({
+        result = await ainvoke_prompt(prompt, self.llm, {
             "context": context_str,
             "existing_skills": existing_skills_str
         })
         
         try:
-            content = result.content.strip()
-            
             # Parse JSON array from response
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
+            skills = parse_json_content(result.content, expect=list)
             
-            # Find JSON array in the content
-            start_idx = content.find('[')
-            end_idx = content.rfind(']') + 1
+            # Filter out existing skills (case-insensitive)
+            existing_lower = {s.lower() for s in existing_skills}
+            suggested = [s for s in skills if isinstance(s, str) and s.lower() not in existing_lower]
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                skills = json.loads(json_str)
-                
-                # Filter out existing skills (case-insensitive)
-                existing_lower = {s.lower() for s in existing_skills}
-                suggested = [s for s in skills if s.lower() not in existing_lower]
-                
-                return suggested[:12]  # Return max 12 suggestions
-            
-            return []
+            return suggested[:12]  # Return max 12 suggestions
         except Exception as e:
             print(f"Error parsing suggested skills: {e}")
             print(f"Response content: {result.content}")
@@ -558,13 +666,9 @@ class ImpactQuantifier:
     """Adds quantifiable metrics to achievements"""
     
     def __init__(self, model: str = "gpt-4o-mini"):
-        settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=model, 
-            temperature=0.6,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        self.llm = get_llm_registry().get_chat_model(model=model, temperature=0.6)
     
+    @llm_operation()
     async def suggest_metrics(self, achievement: str) -> List[str]:
         """
         Suggest ways to add metrics to an achievement
@@ -601,18 +705,10 @@ Output: [
             ("human", "Achievement: {achievement}")
         ])
         
-        chain = prompt | self.llm
-        result = await chain.ainvoke({"achievement": achievement})
+        result = await ainvoke_prompt(prompt, self.llm, {"achievement": achievement})
         
         try:
-            content = result.content.strip()
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            
-            suggestions = json.loads(content.strip())
-            return suggestions
-        except:
+            return parse_json_content(result.content, expect=list)
+        except StructuredOutputError:
             return [result.content.strip()]
 
@@ -0,0 +1,197 @@
+"""
+CV Quality Scorer
+Deterministic quality score for extracted CV data, computed locally without an LLM
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from app.models.cv_models import CVData
+
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_PRESENT = ("present", "current", "now", "today", "ongoing")
+_YEAR_RE = re.compile(r"\b(19[5-9]\d|20\d{2})\b")
+_NUMERIC_MONTH_RE = re.compile(r"\b(?:(\d{4})[/.-](\d{1,2})|(\d{1,2})[/.-](\d{4}))\b")
+_MONTH_NAME_RE = re.compile(r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?", re.IGNORECASE)
+# Numbers, percentages and currency amounts mark a quantified achievement
+_METRIC_RE = re.compile(r"\d|%|[$€£¥]|\b(?:double[sd]?|triple[sd]?|halved)\b", re.IGNORECASE)
+
+CORE_SECTIONS = ("summary", "experience", "education", "skills")
+EXTRA_SECTIONS = ("projects", "certifications", "languages", "awards", "publications", "volunteer")
+
+# Component weights in the overall score
+WEIGHTS = {
+    "completeness": 0.35,
+    "date_consistency": 0.2,
+    "quantified_achievements": 0.25,
+    "section_coverage": 0.2,
+}
+
+
+def parse_cv_date(value: Optional[str], today: Optional[date] = None) -> Optional[Tuple[int, int]]:
+    """
+    Parse a CV date into (year, month)
+
+    Accepts "2021-03", "03/2021", "Mar 2021", "2021" and current-role markers
+    ("Present", "Current", ...). A bare year is read as January.
+
+    Args:
+        value: Date text
+        today: Date used for current-role markers (defaults to today)
+
+    Returns:
+        (year, month), or None if no date could be read
+    """
+    if not value:
+        return None
+    text = value.strip().lower()
+    if text in _PRESENT:
+        today = today or date.today()
+        return today.year, today.month
+
+    if match := _NUMERIC_MONTH_RE.search(text):
+        year, month = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        if 1 <= int(month) <= 12:
+            return int(year), int(month)
+
+    year_match = _YEAR_RE.search(text)
+    if not year_match:
+        return None
+    month_match = _MONTH_NAME_RE.search(text)
+    month = _MONTHS[month_match.group(1).lower()] if month_match else 1
+    return int(year_match.group(1)), month
+
+
+class CVQualityScorer:
+    """
+    Scores extracted CV data from its structure alone.
+
+    The overall score (0-100) is a weighted blend of four components, each
+    in [0, 1]:
+
+    - completeness: contact details and the fields every entry needs
+    - date_consistency: dates that parse, run forwards and are not in the future
+    - quantified_achievements: share of bullet points with a number or metric
+    - section_coverage: core sections present, plus a bonus for extras
+
+    The result has the same shape as ``CVSchemaValidator.validate_with_llm``.
+    """
+
+    def __init__(self, today: Optional[date] = None):
+        """
+        Initialize the scorer
+
+        Args:
+            today: Reference date for "Present" and future-date checks
+        """
+        self.today = today or date.today()
+
+    def score(self, cv_data: CVData) -> Dict[str, Any]:
+        """
+        Score CV data
+
+        Args:
+            cv_data: Validated CV data
+
+        Returns:
+            Dictionary with is_valid, quality_score (0-100), issues,
+            suggestions and the per-component scores
+        """
+        issues: List[str] = []
+        suggestions: List[str] = []
+
+        components = {
+            "completeness": self._completeness(cv_data, issues),
+            "date_consistency": self._date_consistency(cv_data, issues),
+            "quantified_achievements": self._quantified_ratio(cv_data, suggestions),
+            "section_coverage": self._section_coverage(cv_data, suggestions),
+        }
+        overall = sum(WEIGHTS[name] * value for name, value in components.items())
+
+        return {
+            "is_valid": not issues,
+            "quality_score": round(overall * 100),
+            "issues": issues,
+            "suggestions": suggestions,
+            "components": {name: round(value, 3) for name, value in components.items()},
+        }
+
+    def _completeness(self, cv_data: CVData, issues: List[str]) -> float:
+        contact = cv_data.contact
+        checks = [
+            (bool(contact.full_name) and contact.full_name != "Unknown", "Full name is missing"),
+            (bool(contact.email), "Email address is missing"),
+            (bool(contact.phone), "Phone number is missing"),
+            (bool(contact.location), "Location is missing"),
+        ]
+        for i, exp in enumerate(cv_data.experience):
+            label = exp.position or f"experience entry {i + 1}"
+            checks.append((bool(exp.company and exp.position), f"Company or title missing for {label}"))
+            checks.append((bool(exp.start_date), f"Start date missing for {label}"))
+            checks.append((bool(exp.description or exp.achievements), f"No description for {label}"))
+        for edu in cv_data.education:
+            label = edu.degree or edu.institution or "education entry"
+            checks.append((bool(edu.institution and edu.degree), f"Institution or degree missing for {label}"))
+            checks.append((bool(edu.end_date), f"Graduation date missing for {label}"))
+
+        passed = 0
+        for ok, message in checks:
+            if ok:
+                passed += 1
+            else:
+                issues.append(message)
+        return passed / len(checks)
+
+    def _date_consistency(self, cv_data: CVData, issues: List[str]) -> float:
+        ranges = [(exp.position or exp.company, exp.start_date, exp.end_date or "Present") for exp in cv_data.experience]
+        ranges += [
+            (edu.degree or edu.institution, edu.start_date, edu.end_date)
+            for edu in cv_data.education
+            if edu.start_date or edu.end_date
+        ]
+        if not ranges:
+            return 1.0
+
+        now = (self.today.year, self.today.month)
+        consistent = 0
+        for label, start_text, end_text in ranges:
+            start = parse_cv_date(start_text, self.today)
+            end = parse_cv_date(end_text, self.today)
+            if (start_text and start is None) or (end_text and end is None):
+                issues.append(f"Unreadable date for {label}")
+            elif start and end and start > end:
+                issues.append(f"Start date after end date for {label}")
+            elif start and start > now:
+                issues.append(f"Start date in the future for {label}")
+            else:
+                consistent += 1
+        return consistent / len(ranges)
+
+    def _quantified_ratio(self, cv_data: CVData, suggestions: List[str]) -> float:
+        bullets = [item for exp in cv_data.experience for item in exp.achievements]
+        bullets += [item for project in cv_data.projects for item in project.highlights]
+        if not bullets:
+            # No bullet points: fall back to the role descriptions themselves
+            bullets = [exp.description for exp in cv_data.experience if exp.description]
+        if not bullets:
+            suggestions.append("Add achievements to each role")
+            return 0.0
+
+        ratio = sum(1 for bullet in bullets if _METRIC_RE.search(bullet)) / len(bullets)
+        if ratio < 0.5:
+            suggestions.append("Quantify more achievements with numbers, percentages or amounts")
+        return ratio
+
+    def _section_coverage(self, cv_data: CVData, suggestions: List[str]) -> float:
+        core_present = 0
+        for section in CORE_SECTIONS:
+            if getattr(cv_data, section):
+                core_present += 1
+            else:
+                suggestions.append(f"Add a {section} section")
+        extras_present = sum(1 for section in EXTRA_SECTIONS if getattr(cv_data, section))
+        return 0.8 * core_present / len(CORE_SECTIONS) + 0.2 * min(extras_present, 2) / 2
@@ -0,0 +1,165 @@
+"""
+CV Render Cache
+Memoises rendered CVs, and their section fragments, by a hash of the canonicalised data and the render options
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+import hashlib
+import json
+import threading
+
+from pydantic import BaseModel
+
+from app.core.config import Settings, get_settings
+from app.models.cv_models import CVData
+from app.services.llm.response_cache import MemoryTTLCache
+
+
+def _canonical(value: Any) -> str:
+    if isinstance(value, BaseModel):
+        # Fields serialise in declaration order, and the CV models have no
+        # free-form dicts, so pydantic's own JSON is already canonical
+        return value.model_dump_json()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canonical(item) for item in value) + "]"
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def fingerprint(value: Any) -> str:
+    """
+    Stable hash of a model, list of models or plain value
+
+    How a model was built (keyword order, dict key order) does not matter;
+    only the values do.
+
+    Args:
+        value: CVData, a sub-model (e.g. one WorkExperience), a list, or a scalar
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(_canonical(value).encode("utf-8")).hexdigest()
+
+
+def cv_fingerprint(cv_data: CVData) -> str:
+    """Stable hash of a CV's content"""
+    return fingerprint(cv_data)
+
+
+class RenderCache:
+    """
+    Rendered Markdown/HTML for content rendered before.
+
+    One instance holds whole documents: the frontend rebuilds on every
+    debounced edit and preview toggle, often with unchanged data, and a
+    repeat costs a hash instead of a render. A second, larger instance holds
+    section fragments, so an edit re-renders only the sections it touched.
+    Rendered strings are immutable, so they are shared rather than copied.
+    The cache is off while TEMPLATE_AUTO_RELOAD is on, as edited templates
+    would otherwise be masked by stale renders.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+            max_entries: Capacity (defaults to RENDER_CACHE_MAX_ENTRIES)
+        """
+        self.settings = settings or get_settings()
+        self.enabled = self.settings.RENDER_CACHE_ENABLED and not self.settings.TEMPLATE_AUTO_RELOAD
+        self.memory = MemoryTTLCache(
+            max_entries=self.settings.RENDER_CACHE_MAX_ENTRIES if max_entries is None else max_entries,
+            ttl_seconds=self.settings.RENDER_CACHE_TTL_SECONDS
+        )
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(value: Any, variant: Tuple[Any, ...]) -> str:
+        """
+        Build the cache key for a render
+
+        Args:
+            value: Data being rendered (CVData or a section of it)
+            variant: Everything else the output depends on (format, template, accent, ...)
+
+        Returns:
+            Cache key
+        """
+        return f"{fingerprint(value)}:{':'.join(str(part) for part in variant)}"
+
+    def get_or_render(self, value: Any, variant: Tuple[Any, ...], render: Callable[[], str]) -> str:
+        """
+        Return the cached render, or render and store it
+
+        Args:
+            value: Data being rendered (CVData or a section of it)
+            variant: Render options the output depends on
+            render: Produces the output on a miss
+
+        Returns:
+            Rendered content
+        """
+        if not self.enabled:
+            return render()
+
+        key = self.make_key(value, variant)
+        content = self.memory.get(key)
+        if content is not None:
+            self.stats["hits"] += 1
+            return content
+
+        self.stats["misses"] += 1
+        content = render()
+        self.memory.set(key, content)
+        return content
+
+    def get(self, value: Any, variant: Tuple[Any, ...]) -> Optional[str]:
+        """
+        Return the cached render without rendering on a miss
+
+        For streamed responses, which render piece by piece and never hold
+        the whole document to store.
+
+        Args:
+            value: Data being rendered (CVData or a section of it)
+            variant: Render options the output depends on
+
+        Returns:
+            Rendered content, or None if it is not cached
+        """
+        if not self.enabled:
+            return None
+
+        content = self.memory.get(self.make_key(value, variant))
+        self.stats["hits" if content is not None else "misses"] += 1
+        return content
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current cache state"""
+        return {"enabled": self.enabled, "entries": len(self.memory), **self.stats}
+
+
+_render_cache: Optional[RenderCache] = None
+_fragment_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Get the process-wide render cache"""
+    global _render_cache
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache()
+    return _render_cache
+
+
+def get_fragment_cache() -> RenderCache:
+    """Get the process-wide section fragment cache"""
+    global _fragment_cache
+    if _fragment_cache is None:
+        with _render_cache_lock:
+            if _fragment_cache is None:
+                _fragment_cache = RenderCache(max_entries=get_settings().FRAGMENT_CACHE_MAX_ENTRIES)
+    return _fragment_cache
@@ -2,13 +2,113 @@
 CV Schema Extractor Node
 Uses LLM to extract structured CV data from raw text
 """
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Type, Union, get_args, get_origin
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from app.models.cv_models import CVData
+from pydantic import BaseModel, create_model
 from app.core.config import get_settings
-import json
+from app.models.cv_models import CVData, CVValidationReport
+from app.services.cv.pre_extractor import PreExtraction, pre_extract, split_entries
+from app.services.llm import get_llm_registry, ainvoke_structured, llm_operation, validate_with_repair
+import asyncio
+
+
+# Pre-extracted section -> CVData fields extracted from it in section mode
+SECTION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "experience": ("experience",),
+    "education": ("education",),
+    "projects": ("projects",),
+    "certifications": ("certifications",),
+    "languages": ("languages",),
+    "skills": ("skills",),
+    "awards": ("awards",),
+    "publications": ("publications",),
+    "volunteer": ("volunteer",),
+}
+
+# Sections whose entries are split across calls when long
+ENTRY_SECTIONS = ("experience", "education", "projects")
+
+SECTION_SYSTEM_PROMPT = """You are an expert CV parser. Extract the {section} from the CV excerpt provided.
+
+Format guidelines:
+- Use "Present" for current positions
+- Keep date formats as provided (e.g., "Jan 2020", "2020-01", "2020")
+- Keep bullet points as achievements, with their metrics
+- Preserve all URLs
+
+{format_instructions}
+
+Return ONLY valid JSON, no markdown code blocks or extra text."""
+
+SectionChunk = Tuple[str, Tuple[str, ...], str]
+
+
+@lru_cache(maxsize=None)
+def section_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Partial CVData model holding only ``fields``, all optional
+    
+    Used as the response schema of a section-mode call. Contact details stay
+    a plain dict: missing names are filled in after the chunks are merged.
+    """
+    definitions: Dict[str, Any] = {}
+    for name in fields:
+        annotation = Dict[str, Any] if name == "contact" else CVData.model_fields[name].annotation
+        definitions[name] = (Optional[annotation], None)
+    return create_model("CVSection", **definitions)
+
+
+def _type_hint(annotation: Any, exclude: Iterable[str] = (), prefix: str = "") -> str:
+    """Render a field annotation as a terse type, recursing into nested models"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _type_hint(args[0], exclude, prefix) if args else "null"
+    if origin in (list, tuple, set):
+        args = get_args(annotation)
+        return f"[{_type_hint(args[0], exclude, prefix) if args else 'str'}]"
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "{" + compact_schema_hint(annotation, exclude, prefix, separator=", ") + "}"
+    if annotation in (int, float):
+        return "number"
+    if annotation is bool:
+        return "bool"
+    return "str"
+
+
+def compact_schema_hint(
+    model: Type[BaseModel],
+    exclude: Iterable[str] = (),
+    prefix: str = "",
+    separator: str = "\n"
+) -> str:
+    """
+    Describe a pydantic model as a compact JSON shape for prompts
+    
+    Much shorter than ``JsonOutputParser`` format instructions (a full JSON
+    schema with descriptions). Optional fields are marked with ``?``.
+    
+    Args:
+        model: Pydantic model to describe
+        exclude: Dotted field paths to leave out (e.g. "contact.email")
+        prefix: Path of ``model`` within the root model (used when recursing)
+        separator: Separator between fields
+        
+    Returns:
+        Schema hint such as ``name: str, url?: str, technologies: [str]``
+    """
+    exclude = set(exclude)
+    fields = []
+    for name, info in model.model_fields.items():
+        path = f"{prefix}{name}"
+        if path in exclude:
+            continue
+        optional = "" if info.is_required() else "?"
+        fields.append(f"{name}{optional}: {_type_hint(info.annotation, exclude, path + '.')}")
+    return separator.join(fields)
 
 
 class CVSchemaExtractor:
@@ -22,13 +122,9 @@ class CVSchemaExtractor:
             model: OpenAI model to use
             temperature: LLM temperature (lower for more structured output)
         """
-        settings = get_settings()
-        self.llm = ChatOpenAI(
-            model=model, 
-            temperature=temperature,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
+        self.llm = get_llm_registry().get_chat_model(model=model, temperature=temperature)
         self.parser = JsonOutputParser(pydantic_object=CVData)
+        self.pre_extraction = get_settings().CV_PRE_EXTRACTION_ENABLED
         
         # Create extraction prompt
         self.prompt = ChatPromptTemplate.from_messages([
@@ -38,6 +134,12 @@ class CVSchemaExtractor:
         
         # Create the chain
         self.chain = self.prompt | self.llm | self.parser
+        
+        # Section mode: one small prompt per section chunk
+        self.section_prompt = ChatPromptTemplate.from_messages([
+            ("system", SECTION_SYSTEM_PROMPT),
+            ("human", "{cv_text}")
+        ])
     
     def _get_system_prompt(self) -> str:
         """Get the system prompt for CV extraction"""
@@ -73,32 +175,157 @@ Format guidelines:
 
 Return ONLY valid JSON, no markdown code blocks or extra text."""
     
-    async def extract(self, cv_text: str) -> CVData:
+    @llm_operation()
+    async def extract(self, cv_text: str, context: Optional[str] = None) -> CVData:
         """
         Extract structured CV data from text
         
+        With pre-extraction enabled, contact details, section boundaries,
+        date ranges and plain skill lists are found deterministically first;
+        the LLM only sees the unresolved text and a compact schema hint.
+        
         Args:
             cv_text: Raw CV text
+            context: Optional context line (e.g. target role) shown to the LLM
             
         Returns:
             Structured CVData object
         """
         try:
-            # Get format instructions from parser
-            format_instructions = self.parser.get_format_instructions()
+            pre = None
+            if self.pre_extraction:
+                pre = pre_extract(cv_text)
+                llm_text = pre.llm_text() or cv_text
+                resolved = [f"contact.{key}" for key in pre.contact] + pre.resolved_fields
+                format_instructions = (
+                    "Respond with one JSON object of this shape (? marks optional fields):\n"
+                    + compact_schema_hint(CVData, exclude=resolved)
+                )
+            else:
+                llm_text = cv_text
+                format_instructions = self.parser.get_format_instructions()
+            
+            if pre is not None and self._use_section_mode(pre, llm_text):
+                # Chunks only validate their own fields; the merged document gets
+                # the same fragment repair as a single-call extraction
+                settings = get_settings()
+                return await validate_with_repair(
+                    self.llm,
+                    CVData,
+                    pre.apply(await self._extract_by_section(pre, context)),
+                    settings.LLM_STRUCTURED_OUTPUT_MODE,
+                    settings.LLM_STRUCTURED_MAX_REPAIRS
+                )
             
-            # Invoke the chain
-            result = await self.chain.ainvoke({
-                "cv_text": cv_text,
-                "format_instructions": format_instructions
-            })
+            if context:
+                llm_text = f"Context: {context}\n\n{llm_text}"
             
-            # Convert to CVData
-            return CVData(**result)
+            # Schema-constrained call; deterministic fields are merged in before validation
+            return await ainvoke_structured(
+                self.prompt,
+                self.llm,
+                CVData,
+                {"cv_text": llm_text, "format_instructions": format_instructions},
+                prepare=pre.apply if pre is not None else None
+            )
             
         except Exception as e:
             raise ValueError(f"Failed to extract CV schema: {str(e)}")
     
+    def _use_section_mode(self, pre: PreExtraction, llm_text: str) -> bool:
+        """Section mode pays off for long CVs with at least two extractable sections"""
+        settings = get_settings()
+        sections = [name for name in pre.sections if name in SECTION_FIELDS and name not in pre.resolved_fields]
+        return (
+            settings.CV_SECTION_EXTRACTION_ENABLED
+            and len(llm_text) >= settings.CV_SECTION_EXTRACTION_MIN_CHARS
+            and len(sections) >= 2
+        )
+    
+    def _plan_section_chunks(self, pre: PreExtraction) -> List[SectionChunk]:
+        """
+        Split the unresolved text into (label, fields, text) chunks
+        
+        The header and summary form one chunk for contact details and the
+        summary. Long entry sections (experience, education, projects) are
+        split into groups of CV_SECTION_EXTRACTION_ENTRIES_PER_CALL entries.
+        """
+        per_call = max(1, get_settings().CV_SECTION_EXTRACTION_ENTRIES_PER_CALL)
+        chunks: List[SectionChunk] = []
+        
+        head = "\n\n".join(part for part in (pre.header, pre.sections.get("summary", "")) if part)
+        if head:
+            chunks.append(("contact details and professional summary", ("contact", "summary"), head))
+        
+        for section, body in pre.sections.items():
+            fields = SECTION_FIELDS.get(section)
+            if not fields or section in pre.resolved_fields:
+                continue
+            
+            entries = split_entries(body) if section in ENTRY_SECTIONS else [body]
+            for i in range(0, len(entries), per_call):
+                text = "\n\n".join(entries[i:i + per_call])
+                chunks.append((f"{section} section", fields, f"## {section.title()}\n{text}"))
+        
+        return chunks
+    
+    async def _extract_chunk(self, pre: PreExtraction, chunk: SectionChunk, context: Optional[str]) -> Dict[str, Any]:
+        """Extract one chunk with a schema limited to its fields"""
+        label, fields, text = chunk
+        exclude = [name for name in CVData.model_fields if name not in fields]
+        exclude += [f"contact.{key}" for key in pre.contact]
+        format_instructions = (
+            "Respond with one JSON object of this shape (? marks optional fields):\n"
+            + compact_schema_hint(CVData, exclude=exclude)
+        )
+        if context:
+            text = f"Context: {context}\n\n{text}"
+        
+        result = await ainvoke_structured(self.section_prompt, self.llm, section_model(fields), {
+            "section": label,
+            "format_instructions": format_instructions,
+            "cv_text": text
+        })
+        return result.model_dump(exclude_none=True)
+    
+    async def _extract_by_section(self, pre: PreExtraction, context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract section chunks concurrently and merge them into one CVData dict
+        
+        Several short completions run in parallel instead of one long one, so
+        latency tracks the largest section rather than the whole document.
+        
+        Args:
+            pre: Pre-extraction of the CV text
+            context: Optional context line shown to the LLM
+            
+        Returns:
+            Merged CVData-shaped dict (before pre-extracted fields are applied)
+        """
+        chunks = self._plan_section_chunks(pre)
+        semaphore = asyncio.Semaphore(max(1, get_settings().CV_SECTION_EXTRACTION_CONCURRENCY))
+        
+        async def run(chunk: SectionChunk) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._extract_chunk(pre, chunk, context)
+        
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        
+        # Merge in document order: lists are concatenated, scalars keep the first value
+        merged: Dict[str, Any] = {}
+        for (_, fields, _), result in zip(chunks, results):
+            for name in fields:
+                value = result.get(name)
+                if isinstance(value, list):
+                    merged.setdefault(name, []).extend(value)
+                elif value and not merged.get(name):
+                    merged[name] = value
+        
+        contact = merged.setdefault("contact", {})
+        if not contact.get("full_name") and not pre.name_guess:
+            contact["full_name"] = "Unknown"
+        return merged
+    
     async def extract_with_context(
         self,
         cv_text: str,
@@ -123,12 +350,9 @@ Return ONLY valid JSON, no markdown code blocks or extra text."""
         if additional_context:
             context_parts.append(additional_context)
         
-        if context_parts:
-            enhanced_text = f"Context: {' | '.join(context_parts)}\n\n{cv_text}"
-        else:
-            enhanced_text = cv_text
+        context = ' | '.join(context_parts) if context_parts else None
         
-        return await self.extract(enhanced_text)
+        return await self.extract(cv_text, context=context)
 
 
 class CVSchemaValidator:
@@ -180,24 +404,20 @@ class CVSchemaValidator:
         return cv_data
     
     @staticmethod
+    @llm_operation()
     async def validate_with_llm(cv_data: CVData, llm: ChatOpenAI = None) -> Dict[str, Any]:
         """
         Use LLM to validate CV data quality
         
         Args:
             cv_data: CV data to validate
-            llm: LLM instance (creates new if None)
+            llm: LLM instance (uses the shared registry client if None)
             
         Returns:
             Validation results with issues and suggestions
         """
-        settings = get_settings()
         if llm is None:
-            llm = ChatOpenAI(
-                model="gpt-4o-mini", 
-                temperature=0.2,
-                openai_api_key=settings.OPENAI_API_KEY
-            )
+            llm = get_llm_registry().get_chat_model(model="gpt-4o-mini", temperature=0.2)
         
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are a CV quality validator. Analyze the CV data and identify:
@@ -217,10 +437,8 @@ Return a JSON object with:
             ("human", "Validate this CV:\n\n{cv_json}")
         ])
         
-        chain = prompt | llm | JsonOutputParser()
-        
-        result = await chain.ainvoke({
+        result = await ainvoke_structured(prompt, llm, CVValidationReport, {
             "cv_json": cv_data.model_dump_json(indent=2)
         })
         
-        return result
+        return result.model_dump()
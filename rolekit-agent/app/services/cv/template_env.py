@@ -0,0 +1,57 @@
+"""
+CV Template Environment
+Shared Jinja environment that loads, compiles and caches the CV templates once per process
+"""
+from functools import lru_cache
+from pathlib import Path
+import os
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+from app.core.config import get_settings
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[2] / "templates" / "cv"
+
+
+@lru_cache(maxsize=1)
+def get_template_env() -> Environment:
+    """
+    Get the process-wide CV template environment
+
+    Templates are compiled on first use and kept in the environment's cache,
+    so later renders skip lexing, parsing and compiling. Autoescaping stays
+    off to match what the builder has always produced, and trailing newlines
+    are kept so section fragments concatenate exactly. With
+    TEMPLATE_BYTECODE_CACHE_DIR set, compiled bytecode also survives restarts
+    and is shared between workers.
+
+    Returns:
+        Jinja Environment
+    """
+    settings = get_settings()
+    bytecode_cache = None
+    if settings.TEMPLATE_BYTECODE_CACHE_DIR:
+        os.makedirs(settings.TEMPLATE_BYTECODE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR)
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=False,
+        keep_trailing_newline=True,  # Section fragments are concatenated as-is
+        cache_size=settings.TEMPLATE_CACHE_SIZE,
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def get_template(name: str) -> Template:
+    """
+    Get a compiled CV template
+
+    Args:
+        name: Template path (e.g. "html/layout.html.j2")
+
+    Returns:
+        Compiled template
+    """
+    return get_template_env().get_template(name)
@@ -0,0 +1,185 @@
+"""
+CV Themes
+Registry of HTML CV styles: each has its own templates and a versioned stylesheet under /static
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+import hashlib
+import os
+import re
+
+from fastapi.staticfiles import StaticFiles
+from starlette.responses import Response
+from starlette.types import Scope
+
+from app.core.config import get_settings
+
+STATIC_DIR = Path(__file__).resolve().parents[3] / "static"
+THEME_STATIC_PATH = "cv/themes"
+
+DEFAULT_THEME = "modern"
+
+# Named accent colours accepted as ``color_scheme`` (a #rgb/#rrggbb value is also accepted)
+COLOR_SCHEMES: Dict[str, str] = {
+    "blue": "#0066cc",
+    "green": "#2e7d32",
+    "red": "#c62828",
+    "purple": "#6a1b9a",
+    "teal": "#00796b",
+    "orange": "#e65100",
+    "gray": "#455a64",
+    "black": "#1a1a1a",
+}
+
+_HEX_COLOR_RE = re.compile(r"^#(?:[0-9a-fA-F]{3}){1,2}$")
+
+
+@dataclass(frozen=True)
+class Theme:
+    """
+    An HTML CV style
+
+    Templates live in ``templates/cv/html/<name>/``: the theme's layout, plus
+    any section templates it overrides (the rest come from ``html/``).
+    """
+
+    name: str
+    description: str
+    default_accent: str
+
+    @property
+    def stylesheet_path(self) -> Path:
+        return STATIC_DIR / THEME_STATIC_PATH / f"{self.name}.css"
+
+
+THEMES: Dict[str, Theme] = {
+    "modern": Theme("modern", "Sans-serif with accent-coloured headings and skill tags", COLOR_SCHEMES["blue"]),
+    "classic": Theme("classic", "Serif type with a centred header and ruled sections", COLOR_SCHEMES["black"]),
+    "minimal": Theme("minimal", "Single column without rules or backgrounds", COLOR_SCHEMES["black"]),
+}
+
+
+def get_theme(style: Optional[str]) -> Theme:
+    """
+    Look up a theme by name
+
+    Unknown names fall back to the default theme, as ``style`` has always
+    been accepted free-form.
+
+    Args:
+        style: Theme name (modern, classic, minimal)
+
+    Returns:
+        Theme
+    """
+    return THEMES.get((style or "").strip().lower(), THEMES[DEFAULT_THEME])
+
+
+def list_themes() -> List[Dict[str, str]]:
+    """Themes and their stylesheet URLs, for clients to offer a choice"""
+    return [
+        {"name": theme.name, "description": theme.description, "stylesheet_url": stylesheet_url(theme)}
+        for theme in THEMES.values()
+    ]
+
+
+def resolve_accent(theme: Theme, color_scheme: Optional[str]) -> str:
+    """
+    Accent colour for a theme and requested colour scheme
+
+    Args:
+        theme: Theme being rendered
+        color_scheme: Scheme name or hex colour (None for the theme's default)
+
+    Returns:
+        CSS colour
+    """
+    if not color_scheme:
+        return theme.default_accent
+    scheme = color_scheme.strip().lower()
+    if scheme in COLOR_SCHEMES:
+        return COLOR_SCHEMES[scheme]
+    if _HEX_COLOR_RE.match(scheme):
+        return scheme
+    return theme.default_accent
+
+
+@lru_cache(maxsize=None)
+def _stylesheet(name: str) -> str:
+    return THEMES[name].stylesheet_path.read_text(encoding="utf-8")
+
+
+def stylesheet_text(theme: Theme) -> str:
+    """The theme's CSS, for inlining into self-contained documents (PDF export)"""
+    return _stylesheet(theme.name)
+
+
+@lru_cache(maxsize=256)
+def _content_version(path: str, mtime_ns: int, size: int) -> str:
+    # Keyed on mtime and size too, so an edited file gets a new version
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def file_version(path: "os.PathLike[str]", stat_result: Optional[os.stat_result] = None) -> str:
+    """
+    Content version of a static file, as used in ``?v=`` URLs
+
+    Args:
+        path: File path
+        stat_result: The file's stat (looked up if None)
+
+    Returns:
+        First 12 hex digits of the SHA-256 of the file's bytes
+    """
+    stat_result = stat_result or os.stat(path)
+    return _content_version(os.fspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+@lru_cache(maxsize=None)
+def _stylesheet_version(name: str) -> str:
+    return file_version(THEMES[name].stylesheet_path)
+
+
+def stylesheet_url(theme: Theme) -> str:
+    """
+    Versioned URL of the theme's stylesheet
+
+    The version is a hash of the file's contents, so the URL changes
+    whenever the CSS does and browsers can cache it indefinitely.
+
+    Args:
+        theme: Theme
+
+    Returns:
+        Stylesheet URL
+    """
+    base = get_settings().CV_STATIC_BASE_URL.rstrip("/")
+    return f"{base}/{THEME_STATIC_PATH}/{theme.name}.css?v={_stylesheet_version(theme.name)}"
+
+
+class VersionedStaticFiles(StaticFiles):
+    """
+    Static files where versioned URLs (``?v=...``) are cached as immutable
+
+    Only a ``v`` matching the file's current content version counts: a stale
+    or made-up version would otherwise pin whatever is served now under that
+    URL for a year. Other requests keep the default revalidation
+    (ETag/Last-Modified).
+    """
+
+    def file_response(
+        self,
+        full_path: "os.PathLike[str]",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        version = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("v", [None])[0]
+        if version and version == file_version(full_path, stat_result):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
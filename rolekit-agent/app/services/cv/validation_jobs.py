@@ -0,0 +1,91 @@
+"""
+LLM Validation Jobs
+Runs the optional LLM quality review in the background so extraction doesn't wait for it
+"""
+from typing import Any, Dict, Optional, Set
+import asyncio
+import logging
+import threading
+import uuid
+
+from app.core.config import Settings, get_settings
+from app.models.cv_models import CVData
+from app.services.cv.schema_extractor import CVSchemaValidator
+from app.services.llm.response_cache import MemoryTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationJobStore:
+    """
+    In-memory registry of background ``validate_with_llm`` runs.
+
+    ``submit`` starts the review as a task and returns a job ID at once;
+    ``get`` reports ``pending``, ``completed`` (with the result) or
+    ``failed`` (with the error). Finished jobs expire after
+    CV_VALIDATION_JOB_TTL_SECONDS.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the store
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self.jobs = MemoryTTLCache(
+            max_entries=self.settings.CV_VALIDATION_JOB_MAX_ENTRIES,
+            ttl_seconds=self.settings.CV_VALIDATION_JOB_TTL_SECONDS
+        )
+        # Strong references so running tasks are not garbage-collected
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, cv_data: CVData) -> str:
+        """
+        Start an LLM validation of ``cv_data`` in the background
+
+        Args:
+            cv_data: Validated CV data
+
+        Returns:
+            Job ID to poll with ``get``
+        """
+        job_id = str(uuid.uuid4())
+        self.jobs.set(job_id, {"job_id": job_id, "status": "pending", "result": None, "error": None})
+
+        task = asyncio.ensure_future(self._run(job_id, cv_data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job_id
+
+    async def _run(self, job_id: str, cv_data: CVData):
+        try:
+            result = await CVSchemaValidator.validate_with_llm(cv_data)
+            self.jobs.set(job_id, {"job_id": job_id, "status": "completed", "result": result, "error": None})
+        except Exception as e:
+            logger.warning(f"LLM validation job {job_id} failed: {e}")
+            self.jobs.set(job_id, {"job_id": job_id, "status": "failed", "result": None, "error": str(e)})
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job state, or None if unknown or expired"""
+        return self.jobs.get(job_id)
+
+    @property
+    def running(self) -> int:
+        """Number of validations still in progress"""
+        return len(self._tasks)
+
+
+_validation_jobs: Optional[ValidationJobStore] = None
+_validation_jobs_lock = threading.Lock()
+
+
+def get_validation_jobs() -> ValidationJobStore:
+    """Get the process-wide validation job store"""
+    global _validation_jobs
+    if _validation_jobs is None:
+        with _validation_jobs_lock:
+            if _validation_jobs is None:
+                _validation_jobs = ValidationJobStore()
+    return _validation_jobs
@@ -0,0 +1,62 @@
+"""LLM Client Infrastructure"""
+from .client_registry import (
+    LLMClientRegistry,
+    get_llm_registry,
+    init_llm_registry,
+    close_llm_registry,
+)
+from .response_cache import (
+    LLMResponseCache,
+    MemoryTTLCache,
+    get_response_cache,
+    close_response_cache,
+)
+from .scheduler import (
+    LLMAdmissionController,
+    AdmissionControlledTransport,
+    get_admission_controller,
+)
+from .coalescing import SingleFlight, get_single_flight
+from .invocation import ainvoke_prompt
+from .structured import (
+    StructuredOutputError,
+    ainvoke_structured,
+    parse_json_content,
+    validate_with_repair,
+)
+from .fake_backend import FakeChatModel, FakeEmbeddings
+from .metrics import (
+    LLMMetrics,
+    LLMMetricsMiddleware,
+    get_llm_metrics,
+    llm_operation,
+    render_metrics,
+)
+
+__all__ = [
+    'LLMClientRegistry',
+    'get_llm_registry',
+    'init_llm_registry',
+    'close_llm_registry',
+    'LLMResponseCache',
+    'MemoryTTLCache',
+    'get_response_cache',
+    'close_response_cache',
+    'LLMAdmissionController',
+    'AdmissionControlledTransport',
+    'get_admission_controller',
+    'SingleFlight',
+    'get_single_flight',
+    'ainvoke_prompt',
+    'StructuredOutputError',
+    'ainvoke_structured',
+    'parse_json_content',
+    'validate_with_repair',
+    'FakeChatModel',
+    'FakeEmbeddings',
+    'LLMMetrics',
+    'LLMMetricsMiddleware',
+    'get_llm_metrics',
+    'llm_operation',
+    'render_metrics',
+]
@@ -0,0 +1,199 @@
+"""
+LLM Client Registry
+Process-wide pool of chat and embedding clients sharing one keep-alive HTTP connection pool
+"""
+from typing import Dict, Optional, Tuple
+import threading
+import logging
+
+import httpx
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from app.core.config import Settings, get_settings
+from app.services.llm.fake_backend import FakeChatModel, FakeEmbeddings
+from app.services.llm.metrics import get_metrics_callback_handler
+from app.services.llm.scheduler import AdmissionControlledTransport, get_admission_controller
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClientRegistry:
+    """
+    Hands out LLM clients keyed by (model, temperature, streaming).
+
+    Every client is built once and reuses the same ``httpx.AsyncClient``, so
+    requests share keep-alive connections instead of paying a TLS handshake
+    and client construction per call. With ``LLM_BACKEND=fake`` the registry
+    hands out offline fakes instead, so benchmarks exercise the same code paths
+    without calling OpenAI.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the registry
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._chat_models: Dict[Tuple[str, float, bool], BaseChatModel] = {}
+        self._embeddings: Dict[str, Embeddings] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_fake(self) -> bool:
+        """Whether the offline fake backend is selected"""
+        return self.settings.LLM_BACKEND.lower() == "fake"
+
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """
+        Create the shared async HTTP client with the configured pool limits
+
+        Requests go through the admission controller, so every client handed
+        out by the registry shares the same concurrency and RPM/TPM budgets.
+        """
+        limits = httpx.Limits(
+            max_connections=self.settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=self.settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+        transport = AdmissionControlledTransport(
+            httpx.AsyncHTTPTransport(limits=limits),
+            get_admission_controller()
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(self.settings.LLM_HTTP_TIMEOUT),
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Shared async HTTP client (recreated if it has been closed)"""
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                # Clients bound to a closed pool are unusable, drop them too
+                self._chat_models.clear()
+                self._embeddings.clear()
+                self._http_client = self._create_http_client()
+            return self._http_client
+
+    def get_chat_model(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        streaming: bool = False
+    ) -> BaseChatModel:
+        """
+        Get a shared chat model client
+
+        Args:
+            model: OpenAI model name (defaults to OPENAI_MODEL)
+            temperature: Sampling temperature (defaults to OPENAI_TEMPERATURE)
+            streaming: Whether the client streams tokens
+
+        Returns:
+            Cached chat model (ChatOpenAI, or FakeChatModel on the fake backend)
+        """
+        model = model or self.settings.OPENAI_MODEL
+        if temperature is None:
+            temperature = self.settings.OPENAI_TEMPERATURE
+        key = (model, round(float(temperature), 3), bool(streaming))
+
+        http_client = self.http_client
+        with self._lock:
+            llm = self._chat_models.get(key)
+            if llm is None and self.is_fake:
+                llm = FakeChatModel.from_settings(
+                    self.settings,
+                    model_name=model,
+                    temperature=temperature,
+                    streaming=streaming,
+                    callbacks=[get_metrics_callback_handler()]
+                )
+                self._chat_models[key] = llm
+            elif llm is None:
+                llm = ChatOpenAI(
+                    model=model,
+                    temperature=temperature,
+                    openai_api_key=self.settings.OPENAI_API_KEY,
+                    streaming=streaming,
+                    stream_usage=True,  # Token usage for streamed completions
+                    callbacks=[get_metrics_callback_handler()],
+                    http_async_client=http_client
+                )
+                self._chat_models[key] = llm
+            return llm
+
+    def get_embeddings(self, model: Optional[str] = None) -> Embeddings:
+        """
+        Get a shared embeddings client
+
+        Args:
+            model: Embedding model name (defaults to OPENAI_EMBEDDING_MODEL)
+
+        Returns:
+            Cached embeddings client (OpenAIEmbeddings, or FakeEmbeddings on the fake backend)
+        """
+        model = model or self.settings.OPENAI_EMBEDDING_MODEL
+
+        http_client = self.http_client
+        with self._lock:
+            embeddings = self._embeddings.get(model)
+            if embeddings is None and self.is_fake:
+                embeddings = FakeEmbeddings.from_settings(self.settings)
+                self._embeddings[model] = embeddings
+            elif embeddings is None:
+                embeddings = OpenAIEmbeddings(
+                    model=model,
+                    openai_api_key=self.settings.OPENAI_API_KEY,
+                    http_async_client=http_client
+                )
+                self._embeddings[model] = embeddings
+            return embeddings
+
+    async def aclose(self):
+        """Close the shared HTTP pool and drop all cached clients"""
+        with self._lock:
+            http_client = self._http_client
+            self._http_client = None
+            self._chat_models.clear()
+            self._embeddings.clear()
+
+        if http_client is not None and not http_client.is_closed:
+            await http_client.aclose()
+
+
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Get the process-wide LLM client registry, creating it on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LLMClientRegistry()
+    return _registry
+
+
+def init_llm_registry() -> LLMClientRegistry:
+    """Create the registry and its HTTP pool (called at application startup)"""
+    registry = get_llm_registry()
+    registry.http_client  # Open the pool eagerly
+    logger.info(
+        "LLM client registry ready (backend=%s, max_connections=%s, keepalive=%s)",
+        registry.settings.LLM_BACKEND,
+        registry.settings.LLM_HTTP_MAX_CONNECTIONS,
+        registry.settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+    return registry
+
+
+async def close_llm_registry():
+    """Close the registry's HTTP pool (called at application shutdown)"""
+    if _registry is not None:
+        await _registry.aclose()
@@ -0,0 +1,77 @@
+"""
+Request Coalescing
+Single-flight de-duplication of identical in-flight LLM requests
+"""
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+
+class _Flight:
+    """One shared in-flight call and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the same
+    key await the same result.
+
+    The shared call runs in its own task, so a caller that is cancelled only
+    stops waiting. The call itself is cancelled once every caller has gone.
+    Exceptions are propagated to every waiting caller, and the key is
+    released as soon as the call finishes so later calls start fresh.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.stats: Dict[str, int] = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``factory()`` for ``key`` or join the call already in flight
+
+        Args:
+            key: Request identity (e.g. the prompt hash)
+            factory: Creates the awaitable that performs the call
+
+        Returns:
+            The shared call's result
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(factory())
+            flight = _Flight(task)
+            self._flights[key] = flight
+            task.add_done_callback(lambda _, key=key, flight=flight: self._forget(key, flight))
+            self.stats["leaders"] += 1
+        else:
+            self.stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is waiting any more: stop the shared call
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight):
+        """Drop the in-flight entry for ``key`` if it still belongs to ``flight``"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group for LLM requests"""
+    return _single_flight
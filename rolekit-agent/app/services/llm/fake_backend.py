@@ -0,0 +1,437 @@
+"""
+Offline LLM Backend
+Deterministic fake chat model and embeddings for benchmarks and load tests.
+Responses come from a recordings file (keyed by prompt hash) or are
+synthesized in the shape each CV service expects, with configurable latency
+and token streaming.
+"""
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import time
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, Field, PrivateAttr
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+
+def _load_recordings(path: Optional[str]) -> Dict[str, str]:
+    """Load recorded responses ({prompt_hash: response}) from a JSON file"""
+    if not path:
+        return {}
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            recordings = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load fake LLM recordings from {path}: {e}")
+        return {}
+
+    if not isinstance(recordings, dict):
+        logger.warning(f"Fake LLM recordings in {path} must be a JSON object")
+        return {}
+    return {str(k): str(v) for k, v in recordings.items()}
+
+
+def recording_key(messages: List[BaseMessage]) -> str:
+    """Key used to look up a recorded response (model and temperature independent)"""
+    payload = [[message.type, message.content] for message in messages]
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _json_items(text: str) -> List[Dict[str, Any]]:
+    """Find the JSON array of items embedded in a batch prompt"""
+    start, end = text.find("["), text.rfind("]") + 1
+    if start < 0 or end <= start:
+        return []
+    try:
+        items = json.loads(text[start:end])
+    except ValueError:
+        return []
+    return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+
+def _field(text: str, label: str, default: str = "") -> str:
+    """Read a 'Label: value' line from a prompt"""
+    match = re.search(rf"^{re.escape(label)}:\s*(.*)$", text, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def _synthesize_cv(text: str) -> Dict[str, Any]:
+    lines = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("Context:")]
+    email = _EMAIL_RE.search(text)
+    return {
+        "contact": {
+            "full_name": lines[0][:80] if lines else "Unknown",
+            "email": email.group(0) if email else None,
+        },
+        "summary": " ".join(lines[1:3])[:400] or None,
+        "experience": [],
+        "education": [],
+        "skills": [],
+    }
+
+
+# (system prompt marker, builder(human_text, system_text) -> response text)
+_SYNTHETIC_RESPONDERS: List[tuple] = [
+    ('"enhanced_degree"', lambda human, system: json.dumps(
+        [{"index": item.get("index", i), "enhanced_degree": str(item.get("degree", "")).title()}
+         for i, item in enumerate(_json_items(human))]
+        if "JSON array" in system else
+        {"enhanced_degree": _field(human, "Current Degree").title()}
+    )),
+    ('"enhanced_description"', lambda human, system: json.dumps(
+        [{"index": item.get("index", i),
+          "enhanced_description": f"Delivered {item.get('name', 'the project')}: {item.get('description', '')}".strip(),
+          "enhanced_technologies": item.get("technologies") or []}
+         for i, item in enumerate(_json_items(human))]
+        if "JSON array" in system else
+        {"enhanced_description": f"Delivered {_field(human, 'Project Name')}: {_field(human, 'Current Description')}",
+         "enhanced_technologies": [t.strip() for t in _field(human, "Current Technologies").split(",") if t.strip()]}
+    )),
+    ('"corrected_position"', lambda human, system: json.dumps({
+        "corrected_position": _field(human, "Job Title").split(" at ")[0],
+        "bullets": [
+            "Led delivery of core features, improving throughput by 30%",
+            "Optimized critical workflows, reducing processing time by 45%",
+            "Mentored 4 engineers and established code review practices",
+        ],
+    })),
+    ('"role_title"', lambda human, system: json.dumps({
+        "role_title": "Software Engineer",
+        "required_skills": ["Python", "SQL"],
+        "preferred_skills": ["Docker"],
+        "experience_years": 3,
+        "education_required": "Bachelor's degree",
+        "key_responsibilities": ["Build services"],
+        "must_have_keywords": ["Python"],
+        "nice_to_have_keywords": ["Kubernetes"],
+        "company_culture": ["Ownership"],
+        "tools_technologies": ["Git"],
+    })),
+    ('"quality_score"', lambda human, system: json.dumps({
+        "is_valid": True, "quality_score": 80, "issues": [], "suggestions": [],
+    })),
+    ("overall_score", lambda human, system: json.dumps({
+        "overall_score": 78,
+        "detailed_feedback": {"summary": "Clearer", "experience": "More quantified"},
+        "strengths": ["Stronger action verbs"],
+        "weaknesses": ["Few metrics in older roles"],
+        "recommendations": ["Quantify the remaining achievements"],
+    })),
+    ("identify relevant skills", lambda human, system: json.dumps(
+        ["Problem Solving", "Communication", "System Design", "Testing", "Cloud Computing", "Leadership"]
+    )),
+    ("quantifying achievements", lambda human, system: json.dumps([
+        f"{_field(human, 'Achievement')}, improving results by 25%",
+        f"{_field(human, 'Achievement')}, saving 10 hours per week",
+        f"{_field(human, 'Achievement')}, serving 5,000+ users",
+    ])),
+    ("CV parser", lambda human, system: json.dumps(_synthesize_cv(human))),
+]
+
+
+def synthesize_response(messages: List[BaseMessage]) -> str:
+    """
+    Build a deterministic response shaped like what the calling service expects
+
+    Args:
+        messages: Prompt messages
+
+    Returns:
+        Response text
+    """
+    system = "\n".join(str(m.content) for m in messages if m.type == "system")
+    human = "\n".join(str(m.content) for m in messages if m.type != "system")
+
+    for marker, build in _SYNTHETIC_RESPONDERS:
+        if marker in system:
+            return build(human, system)
+
+    # Free-text prompts (summaries, rewrites, chat): a stable rewording of the input
+    words = human.split()
+    digest = hashlib.sha256(human.encode("utf-8")).hexdigest()[:8]
+    return f"Results-driven professional ({digest}). " + " ".join(words[-60:])
+
+
+def _sample_latency(rng: random.Random, latency_ms: float, distribution: str, sigma: float) -> float:
+    """Sample a latency in seconds with mean ``latency_ms`` from a fixed, uniform or lognormal distribution"""
+    mean = max(0.0, latency_ms) / 1000
+    if distribution == "fixed" or mean == 0:
+        return mean
+    if distribution == "uniform":
+        return rng.uniform(0, 2 * mean)
+    # lognormal with the configured mean
+    sigma = max(0.0, sigma)
+    return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers offline with recorded or synthetic responses"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model_name: str = Field(default="fake-chat")
+    temperature: float = 0.0
+    streaming: bool = False
+    latency_ms: float = 800.0
+    latency_distribution: str = "lognormal"
+    latency_sigma: float = 0.5
+    tokens_per_second: float = 50.0
+    recordings: Dict[str, str] = Field(default_factory=dict)
+    seed: Optional[int] = None
+
+    _rng: random.Random = PrivateAttr()
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None, **kwargs: Any) -> "FakeChatModel":
+        """Build a fake chat model configured from FAKE_LLM_* settings"""
+        settings = settings or get_settings()
+        return cls(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+            latency_sigma=settings.FAKE_LLM_LATENCY_SIGMA,
+            tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+            recordings=_load_recordings(settings.FAKE_LLM_RECORDINGS_PATH),
+            seed=settings.FAKE_LLM_SEED,
+            **kwargs
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def bind_tools(self, tools: List[Any], tool_choice: Optional[Any] = None, **kwargs: Any) -> Runnable:
+        """
+        Bind tools; responses then come back as a call to the chosen tool
+
+        The recorded or synthetic response becomes the call's arguments when
+        it is a JSON object, as with a forced function call. Any other
+        response is returned as text.
+        """
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    @staticmethod
+    def _tool_call(text: str, tools: Optional[List[Dict[str, Any]]], tool_choice: Any) -> Optional[Dict[str, Any]]:
+        """The tool call answering a tool-bound request, or None to answer with text"""
+        if not tools:
+            return None
+        try:
+            args = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(args, dict):
+            return None
+
+        names = [tool["function"]["name"] for tool in tools]
+        if isinstance(tool_choice, dict):
+            tool_choice = tool_choice.get("function", {}).get("name")
+        name = tool_choice if tool_choice in names else names[0]
+        call_id = "call_" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+        return {"name": name, "args": args, "id": call_id}
+
+    def sample_latency(self) -> float:
+        """Sample time-to-first-token in seconds from the configured distribution"""
+        return _sample_latency(self._rng, self.latency_ms, self.latency_distribution, self.latency_sigma)
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        return self.recordings.get(recording_key(messages)) or synthesize_response(messages)
+
+    def _chunks(self, text: str) -> List[str]:
+        return re.findall(r"\S+\s*|\s+", text) or [text]
+
+    def _token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _message(self, messages: List[BaseMessage], text: str, **kwargs: Any) -> AIMessage:
+        prompt_tokens = sum(_estimate_tokens(str(m.content)) for m in messages)
+        completion_tokens = len(self._chunks(text))
+        tool_call = self._tool_call(text, kwargs.get("tools"), kwargs.get("tool_choice"))
+        return AIMessage(
+            content="" if tool_call else text,
+            tool_calls=[tool_call] if tool_call else [],
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        time.sleep(self.sample_latency() + self._token_delay() * len(self._chunks(text)))
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, text, **kwargs))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        await asyncio.sleep(self.sample_latency() + self._token_delay() * len(self._chunks(text)))
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, text, **kwargs))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        time.sleep(self.sample_latency())
+        tool_call = self._tool_call(text, kwargs.get("tools"), kwargs.get("tool_choice"))
+        if tool_call:
+            # Arguments arrive as one tool-call chunk rather than text tokens
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[{
+                "name": tool_call["name"], "args": text, "id": tool_call["id"], "index": 0
+            }]))
+            yield ChatGenerationChunk(message=self._final_chunk(messages, text))
+            return
+        for token in self._chunks(text):
+            time.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=self._final_chunk(messages, text))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        await asyncio.sleep(self.sample_latency())
+        tool_call = self._tool_call(text, kwargs.get("tools"), kwargs.get("tool_choice"))
+        if tool_call:
+            # Arguments arrive as one tool-call chunk rather than text tokens
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[{
+                "name": tool_call["name"], "args": text, "id": tool_call["id"], "index": 0
+            }]))
+            yield ChatGenerationChunk(message=self._final_chunk(messages, text))
+            return
+        for token in self._chunks(text):
+            await asyncio.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=self._final_chunk(messages, text))
+
+    def _final_chunk(self, messages: List[BaseMessage], text: str) -> AIMessageChunk:
+        """Empty closing chunk carrying usage, like OpenAI's stream_usage chunk"""
+        usage = self._message(messages, text).usage_metadata
+        return AIMessageChunk(content="", usage_metadata=usage)
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic hash-based embeddings with simulated latency"""
+
+    def __init__(
+        self,
+        size: int = 256,
+        latency_ms: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize fake embeddings
+
+        Args:
+            size: Vector dimension
+            latency_ms: Mean simulated latency per call in milliseconds
+            latency_distribution: fixed, uniform or lognormal
+            latency_sigma: Spread of the lognormal distribution
+            seed: Seed for the latency samples
+        """
+        self.size = size
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Settings] = None, **kwargs: Any) -> "FakeEmbeddings":
+        """Build fake embeddings with the FAKE_LLM_* latency settings"""
+        settings = settings or get_settings()
+        return cls(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            latency_distribution=settings.FAKE_LLM_LATENCY_DISTRIBUTION,
+            latency_sigma=settings.FAKE_LLM_LATENCY_SIGMA,
+            seed=settings.FAKE_LLM_SEED,
+            **kwargs
+        )
+
+    def sample_latency(self) -> float:
+        """Sample the latency of one call in seconds"""
+        return _sample_latency(self._rng, self.latency_ms, self.latency_distribution, self.latency_sigma)
+
+    def _embed(self, text: str) -> List[float]:
+        values: List[float] = []
+        counter = 0
+        while len(values) < self.size:
+            digest = hashlib.sha256(f"{counter}:{text}".encode("utf-8")).digest()
+            values.extend((byte - 127.5) / 127.5 for byte in digest)
+            counter += 1
+        vector = values[:self.size]
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.sample_latency())
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.sample_latency())
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.sample_latency())
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.sample_latency())
+        return self._embed(text)
@@ -0,0 +1,67 @@
+"""
+LLM Invocation Helpers
+Single entry point used by the CV services to run a prompt against a chat model
+"""
+from typing import Any, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.core.config import get_settings
+from app.services.llm.coalescing import get_single_flight
+from app.services.llm.metrics import record_response_cache_hit
+from app.services.llm.response_cache import get_response_cache
+
+
+async def ainvoke_prompt(
+    prompt: ChatPromptTemplate,
+    llm: BaseChatModel,
+    inputs: Optional[Dict[str, Any]] = None,
+    cache: bool = True,
+    coalesce: bool = True
+) -> BaseMessage:
+    """
+    Render a prompt and invoke the chat model
+
+    Repeats are served from the response cache, and identical calls that are
+    already in flight are joined instead of issuing another completion.
+
+    Args:
+        prompt: Prompt template
+        llm: Chat model to invoke
+        inputs: Template variables
+        cache: Whether to read from and write to the response cache
+        coalesce: Whether to share one completion between identical concurrent calls
+
+    Returns:
+        The model's message (an AIMessage rebuilt from the cache on a hit)
+    """
+    messages = prompt.format_messages(**(inputs or {}))
+    coalesce = coalesce and get_settings().LLM_COALESCE_ENABLED
+
+    if not cache and not coalesce:
+        return await llm.ainvoke(messages)
+
+    response_cache = get_response_cache()
+    key = response_cache.make_key(
+        messages,
+        model=getattr(llm, "model_name", None),
+        temperature=getattr(llm, "temperature", None)
+    )
+
+    if cache:
+        cached = await response_cache.get(key)
+        if cached is not None:
+            record_response_cache_hit()
+            return AIMessage(content=cached)
+
+    async def complete() -> BaseMessage:
+        result = await llm.ainvoke(messages)
+        if cache and isinstance(result.content, str):
+            await response_cache.set(key, result.content)
+        return result
+
+    if coalesce:
+        return await get_single_flight().do(key, complete)
+    return await complete()
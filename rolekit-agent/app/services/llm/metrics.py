@@ -0,0 +1,386 @@
+"""
+LLM Metrics
+Per-route and per-operation token and latency accounting, exported in Prometheus text format
+"""
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import functools
+import threading
+import time
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# In-flight run state is dropped after this long, or beyond this many runs:
+# cancelled calls (client disconnects) fire neither on_llm_end nor on_llm_error
+RUN_STATE_TTL_SECONDS = 600.0
+MAX_TRACKED_RUNS = 10000
+
+_request_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar("llm_request_scope", default=None)
+_operation: ContextVar[str] = ContextVar("llm_operation", default="unattributed")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def current_route() -> str:
+    """Route template of the request being served ("none" outside a request)"""
+    scope = _request_scope.get()
+    if scope is None:
+        return "none"
+    route = scope.get("route")
+    # Prefer the template ("/cv/{cv_id}") so path parameters don't explode label cardinality
+    return getattr(route, "path", None) or "unmatched"
+
+
+def current_operation() -> str:
+    """Service method currently issuing LLM calls"""
+    return _operation.get()
+
+
+def llm_operation(name: Optional[str] = None) -> Callable:
+    """
+    Attribute LLM calls made inside an async function to a named operation
+
+    Args:
+        name: Operation label (defaults to ``Class.method``)
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            token = _operation.set(label)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _operation.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+class _Histogram:
+    """Cumulative histogram with fixed upper bounds"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class LLMMetrics:
+    """Thread-safe store of labelled counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def inc(self, name: str, labels: Dict[str, str], value: float = 1.0, help: str = ""):
+        """Add ``value`` to a counter"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+            if help:
+                self._help.setdefault(name, help)
+
+    def observe(self, name: str, labels: Dict[str, str], value: float, help: str = ""):
+        """Record one histogram observation"""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(LATENCY_BUCKETS)
+            histogram.observe(value)
+            if help:
+                self._help.setdefault(name, help)
+
+    def reset(self):
+        """Drop all recorded series"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> List[str]:
+        """Render all series as Prometheus exposition lines"""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines += _header(name, "counter", self._help.get(name))
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines += _header(name, "histogram", self._help.get(name))
+                for labels, histogram in sorted(series.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        bucket_labels = labels + (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {count}")
+                    inf_labels = labels + (("le", "+Inf"),)
+                    lines.append(f"{name}_bucket{_format_labels(inf_labels)} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return lines
+
+
+def _header(name: str, kind: str, help: Optional[str]) -> List[str]:
+    lines = [f"# HELP {name} {help}"] if help else []
+    return lines + [f"# TYPE {name} {kind}"]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _RunState:
+    """Timing and labels of one in-flight LLM run"""
+
+    __slots__ = ("labels", "started", "first_token")
+
+    def __init__(self, labels: Dict[str, str]):
+        self.labels = labels
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+
+
+class LLMMetricsCallbackHandler(AsyncCallbackHandler):
+    """
+    Records tokens, time to first token and latency for every chat model run.
+
+    Labels (route, operation, model) are captured when the run starts, so
+    they reflect the request and service method that issued the call. Time to
+    first token is only recorded for streamed runs. Runs that never finish
+    (cancelled mid-call) are evicted after RUN_STATE_TTL_SECONDS, or once
+    MAX_TRACKED_RUNS are tracked, and counted with status "abandoned".
+    """
+
+    run_inline = True
+
+    def __init__(self, metrics: "LLMMetrics"):
+        self.metrics = metrics
+        self._runs: Dict[UUID, _RunState] = {}  # In start order, so the oldest come first
+        self._lock = threading.Lock()
+
+    def _track(self, run_id: UUID, state: _RunState) -> None:
+        with self._lock:
+            while self._runs:
+                oldest_id, oldest = next(iter(self._runs.items()))
+                if len(self._runs) < MAX_TRACKED_RUNS and state.started - oldest.started < RUN_STATE_TTL_SECONDS:
+                    break
+                del self._runs[oldest_id]
+                self.metrics.inc(
+                    "rolekit_llm_requests_total",
+                    {**oldest.labels, "status": "abandoned"},
+                    help="LLM completions by outcome"
+                )
+            self._runs[run_id] = state
+
+    def _finish(self, run_id: UUID) -> Optional[_RunState]:
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    async def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = (metadata or {}).get("ls_model_name") or params.get("model") or params.get("model_name") or "unknown"
+        self._track(run_id, _RunState({
+            "route": current_route(),
+            "operation": current_operation(),
+            "model": str(model),
+        }))
+
+    async def on_llm_new_token(self, token: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        state = self._runs.get(run_id)
+        if state is not None and state.first_token is None and token:
+            state.first_token = time.perf_counter()
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        state = self._finish(run_id)
+        if state is None:
+            return
+
+        labels = state.labels
+        self.metrics.observe(
+            "rolekit_llm_request_duration_seconds", labels,
+            time.perf_counter() - state.started,
+            help="End-to-end latency of LLM completions"
+        )
+        if state.first_token is not None:
+            self.metrics.observe(
+                "rolekit_llm_time_to_first_token_seconds", labels,
+                state.first_token - state.started,
+                help="Time from request to first streamed token"
+            )
+        self.metrics.inc("rolekit_llm_requests_total", {**labels, "status": "ok"}, help="LLM completions by outcome")
+
+        prompt_tokens, completion_tokens, cached_tokens = _usage(response)
+        self.metrics.inc("rolekit_llm_prompt_tokens_total", labels, prompt_tokens, help="Prompt tokens billed")
+        self.metrics.inc("rolekit_llm_completion_tokens_total", labels, completion_tokens, help="Completion tokens billed")
+        self.metrics.inc(
+            "rolekit_llm_cached_prompt_tokens_total", labels, cached_tokens,
+            help="Prompt tokens served from the provider's prompt cache"
+        )
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        state = self._finish(run_id)
+        if state is None:
+            return
+        self.metrics.inc(
+            "rolekit_llm_requests_total",
+            {**state.labels, "status": type(error).__name__},
+            help="LLM completions by outcome"
+        )
+
+
+def _usage(response: LLMResult) -> Tuple[int, int, int]:
+    """Extract (prompt, completion, cached prompt) token counts from a result"""
+    prompt = completion = cached = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                cached += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    if prompt or completion:
+        return prompt, completion, cached
+
+    # Fall back to the provider's raw usage block
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        token_usage.get("completion_tokens", 0),
+        details.get("cached_tokens", 0) or 0,
+    )
+
+
+class LLMMetricsMiddleware:
+    """ASGI middleware exposing the current request to LLM metric labels"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token: Token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
+
+
+_metrics = LLMMetrics()
+_callback_handler = LLMMetricsCallbackHandler(_metrics)
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """Get the process-wide LLM metrics store"""
+    return _metrics
+
+
+def get_metrics_callback_handler() -> LLMMetricsCallbackHandler:
+    """Get the callback handler attached to every registry client"""
+    return _callback_handler
+
+
+def record_response_cache_hit():
+    """Count a completion served from the response cache for the current labels"""
+    _metrics.inc(
+        "rolekit_llm_response_cache_hits_total",
+        {"route": current_route(), "operation": current_operation()},
+        help="LLM calls answered from the response cache"
+    )
+
+
+def record_structured_output(mode: str, outcome: str):
+    """
+    Count a structured LLM response by how it was obtained
+
+    Outcomes: ``ok`` (valid first time), ``repaired`` (valid after fixing
+    fragments), ``degraded`` (invalid list items dropped) and ``failed``.
+    """
+    _metrics.inc(
+        "rolekit_llm_structured_outputs_total",
+        {"route": current_route(), "operation": current_operation(), "mode": mode, "outcome": outcome},
+        help="Structured LLM responses by parse/validation outcome"
+    )
+
+
+def record_text_normalization(tokens_before: int, tokens_after: int):
+    """Count the tokens of parsed document text before and after normalization"""
+    route = current_route()
+    for stage, tokens in (("before", tokens_before), ("after", tokens_after)):
+        _metrics.inc(
+            "rolekit_text_normalization_tokens_total",
+            {"route": route, "stage": stage},
+            tokens,
+            help="Tokens of parsed document text before and after normalization"
+        )
+
+
+def render_metrics() -> str:
+    """
+    Render LLM metrics plus cache, coalescing and admission state
+
+    Returns:
+        Prometheus text exposition
+    """
+    from app.services.llm.coalescing import get_single_flight
+    from app.services.llm.response_cache import get_response_cache
+    from app.services.llm.scheduler import get_admission_controller
+
+    lines = _metrics.render()
+
+    cache_stats = get_response_cache().stats
+    lines += _header("rolekit_llm_response_cache_lookups_total", "counter", "Response cache lookups by result")
+    for result, value in sorted(cache_stats.items()):
+        lines.append(f'rolekit_llm_response_cache_lookups_total{{result="{result}"}} {value}')
+
+    flight_stats = get_single_flight().stats
+    lines += _header("rolekit_llm_singleflight_calls_total", "counter", "Single-flight calls by role")
+    for role, value in sorted(flight_stats.items()):
+        lines.append(f'rolekit_llm_singleflight_calls_total{{role="{role}"}} {value}')
+
+    for key, value in get_admission_controller().snapshot().items():
+        name = f"rolekit_llm_admission_{key}"
+        lines += _header(name, "counter" if key.endswith("_total") else "gauge", None)
+        lines.append(f"{name} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,213 @@
+"""
+LLM Response Cache
+Content-addressed cache for LLM completions with an in-process LRU+TTL tier
+and an optional Redis tier
+"""
+from typing import Any, Dict, Optional, Sequence
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from langchain_core.messages import BaseMessage
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTTLCache:
+    """Bounded LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of entries kept (least recently used evicted first)
+            ttl_seconds: Time-to-live of each entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value, evicting the least recently used entries when full"""
+        if self.max_entries <= 0:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        """Remove an entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions.
+
+    Keys are a SHA-256 of the rendered prompt messages plus model and
+    temperature, so identical requests map to the same entry regardless of
+    which service issued them.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the response cache
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self.enabled = self.settings.LLM_CACHE_ENABLED
+        self.ttl_seconds = self.settings.LLM_CACHE_TTL_SECONDS
+        self.memory = MemoryTTLCache(
+            max_entries=self.settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.ttl_seconds
+        )
+        self._redis = None
+        self._redis_failed = False
+        self.stats: Dict[str, int] = {"memory_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(
+        messages: Sequence[BaseMessage],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """
+        Build the content-addressed key for a prompt
+
+        Args:
+            messages: Rendered prompt messages
+            model: Model name
+            temperature: Sampling temperature
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "messages": [[message.type, message.content] for message in messages],
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def _get_redis(self):
+        """Lazily connect to Redis when REDIS_URL is configured"""
+        if self._redis is not None or self._redis_failed or not self.settings.REDIS_URL:
+            return self._redis
+
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using memory cache only")
+            self._redis_failed = True
+            return None
+
+        self._redis = redis_asyncio.from_url(self.settings.REDIS_URL)
+        return self._redis
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached completion, checking memory first and then Redis"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(key)
+        if value is not None:
+            self.stats["memory_hits"] += 1
+            return value
+
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                raw = await redis_client.get(self.settings.LLM_CACHE_REDIS_PREFIX + key)
+            except Exception as e:
+                logger.warning(f"Redis cache lookup failed: {e}")
+                raw = None
+
+            if raw is not None:
+                value = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+                self.memory.set(key, value)
+                self.stats["redis_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: str):
+        """Store a completion in every configured tier"""
+        if not self.enabled or not value:
+            return
+
+        self.memory.set(key, value)
+
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                await redis_client.set(
+                    self.settings.LLM_CACHE_REDIS_PREFIX + key,
+                    value,
+                    ex=int(self.ttl_seconds)
+                )
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+
+    async def aclose(self):
+        """Close the Redis connection if one was opened"""
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            finally:
+                self._redis = None
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Get the process-wide LLM response cache"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = LLMResponseCache()
+    return _response_cache
+
+
+async def close_response_cache():
+    """Release the response cache's Redis connection (called at shutdown)"""
+    if _response_cache is not None:
+        await _response_cache.aclose()
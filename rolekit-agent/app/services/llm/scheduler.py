@@ -0,0 +1,319 @@
+"""
+LLM Admission Control
+Process-wide scheduler that every OpenAI request passes through: a concurrency
+limiter plus requests-per-minute and tokens-per-minute token buckets, with
+adaptive back-off when the API answers 429
+"""
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+from collections import deque
+import asyncio
+import json
+import logging
+import re
+import time
+import weakref
+
+import httpx
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``capacity`` tokens per minute"""
+
+    def __init__(self, capacity_per_minute: int):
+        """
+        Initialize the bucket
+
+        Args:
+            capacity_per_minute: Budget per minute (0 or less disables the bucket)
+        """
+        self.capacity = float(capacity_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until_available(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` tokens can be consumed (0 if available now)"""
+        if not self.enabled:
+            return 0.0
+
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """Take ``amount`` tokens (call after time_until_available returned 0)"""
+        if self.enabled:
+            self.tokens -= min(amount, self.capacity)
+
+
+def _parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset headers such as '1s', '6m0s', '20ms' or '0.5' into seconds"""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    total = 0.0
+    matched = False
+    for amount, unit in re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value):
+        matched = True
+        amount = float(amount)
+        total += {"ms": amount / 1000, "s": amount, "m": amount * 60, "h": amount * 3600}[unit]
+    return total if matched else None
+
+
+class LLMAdmissionController:
+    """
+    Admits LLM requests subject to an in-flight limit and RPM/TPM budgets.
+
+    Waiters queue on a semaphore first and then on the shared budgets, so the
+    request that has waited longest is admitted first. A 429 response pauses
+    admission until the reset time advertised in its headers.
+
+    asyncio primitives belong to one event loop, so the semaphore and budget
+    lock are created per loop on first use; the budgets and back-off are
+    shared across loops.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the controller
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self.max_in_flight = max(1, self.settings.LLM_MAX_IN_FLIGHT)
+        self._loop_primitives = weakref.WeakKeyDictionary()  # event loop -> (semaphore, budget lock)
+        self._requests = TokenBucket(self.settings.LLM_REQUESTS_PER_MINUTE)
+        self._tokens = TokenBucket(self.settings.LLM_TOKENS_PER_MINUTE)
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+
+        # Metrics
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.admitted_total = 0
+        self.throttled_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent_waits: deque = deque(maxlen=1000)
+
+    def _primitives(self) -> Tuple[asyncio.Semaphore, asyncio.Lock]:
+        """The in-flight semaphore and budget lock of the running event loop"""
+        loop = asyncio.get_running_loop()
+        primitives = self._loop_primitives.get(loop)
+        if primitives is None:
+            primitives = (asyncio.Semaphore(self.max_in_flight), asyncio.Lock())
+            self._loop_primitives[loop] = primitives
+        return primitives
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait until a request may be sent
+
+        Args:
+            estimated_tokens: Token cost charged against the TPM budget
+        """
+        semaphore, budget_lock = self._primitives()
+        enqueued_at = time.monotonic()
+        self.queue_depth += 1
+        try:
+            await semaphore.acquire()
+            try:
+                async with budget_lock:
+                    while True:
+                        now = time.monotonic()
+                        delay = max(
+                            self._paused_until - now,
+                            self._requests.time_until_available(1, now),
+                            self._tokens.time_until_available(estimated_tokens, now)
+                        )
+                        if delay <= 0:
+                            break
+                        await asyncio.sleep(delay)
+
+                    self._requests.consume(1)
+                    self._tokens.consume(estimated_tokens)
+            except BaseException:
+                semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - enqueued_at
+        self.in_flight += 1
+        self.admitted_total += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        self._recent_waits.append(waited)
+
+    def release(self):
+        """Mark an admitted request as finished (on the loop that admitted it)"""
+        self.in_flight -= 1
+        semaphore, _ = self._primitives()
+        semaphore.release()
+
+    def observe_response(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Adapt to the rate-limit headers of a response
+
+        Args:
+            status_code: HTTP status code
+            headers: Response headers
+        """
+        now = time.monotonic()
+
+        if status_code == 429:
+            self.throttled_total += 1
+            self._consecutive_throttles += 1
+
+            delay = None
+            if headers.get("retry-after-ms"):
+                delay = _parse_reset_duration(headers["retry-after-ms"])
+                delay = delay / 1000 if delay is not None else None
+            if delay is None:
+                delay = _parse_reset_duration(headers.get("retry-after"))
+            if delay is None:
+                delay = max(
+                    _parse_reset_duration(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                    _parse_reset_duration(headers.get("x-ratelimit-reset-tokens")) or 0.0
+                ) or None
+            if delay is None:
+                # No hint from the API: exponential back-off capped at one minute
+                delay = min(60.0, 0.5 * 2 ** (self._consecutive_throttles - 1))
+
+            self._paused_until = max(self._paused_until, now + delay)
+            logger.warning(f"LLM API rate limited (429); pausing admission for {delay:.2f}s")
+            return
+
+        self._consecutive_throttles = 0
+
+        # Budget nearly exhausted on the API side: hold new requests until it resets
+        if headers.get("x-ratelimit-remaining-requests") == "0":
+            delay = _parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            if delay:
+                self._paused_until = max(self._paused_until, now + delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current scheduler metrics"""
+        waits = sorted(self._recent_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "requests_per_minute": int(self._requests.capacity),
+            "tokens_per_minute": int(self._tokens.capacity),
+            "admitted_total": self.admitted_total,
+            "throttled_total": self.throttled_total,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 3),
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_seconds_p50": round(percentile(0.50), 6),
+            "wait_seconds_p95": round(percentile(0.95), 6),
+        }
+
+
+def estimate_request_tokens(request: httpx.Request) -> int:
+    """
+    Estimate the token cost of an OpenAI request for the TPM budget
+
+    Uses ~4 characters per token for the request body plus any requested
+    completion budget (max_tokens / max_completion_tokens).
+    """
+    try:
+        body = request.content
+    except httpx.RequestNotRead:
+        return 0
+
+    if not body:
+        return 0
+
+    estimate = len(body) // 4
+    try:
+        payload = json.loads(body)
+        if isinstance(payload, dict):
+            estimate += int(payload.get("max_completion_tokens") or payload.get("max_tokens") or 0)
+    except (ValueError, TypeError):
+        pass
+    return estimate
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that releases the admission slot once closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class AdmissionControlledTransport(httpx.AsyncBaseTransport):
+    """httpx transport that routes every request through an LLMAdmissionController"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, controller: LLMAdmissionController):
+        self._transport = transport
+        self.controller = controller
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.controller.acquire(estimate_request_tokens(request))
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self.controller.release()
+            raise
+
+        self.controller.observe_response(response.status_code, response.headers)
+        # Streaming responses keep their slot until the body is closed
+        response.stream = _ReleasingStream(response.stream, self.controller.release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+_controller: Optional[LLMAdmissionController] = None
+
+
+def get_admission_controller() -> LLMAdmissionController:
+    """Get the process-wide LLM admission controller"""
+    global _controller
+    if _controller is None:
+        _controller = LLMAdmissionController()
+    return _controller
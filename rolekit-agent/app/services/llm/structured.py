@@ -0,0 +1,312 @@
+"""
+Structured Output
+Schema-constrained LLM responses with JSON parsing and fragment-level repair
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+import asyncio
+import json
+import re
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.core.config import get_settings
+from app.services.llm.invocation import ainvoke_prompt
+from app.services.llm.metrics import record_structured_output
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Path = Tuple[Union[str, int], ...]
+
+STRUCTURED_OUTPUT_MODES = ("json", "json_schema", "function_calling")
+
+_FENCE_RE = re.compile(r"^```[a-zA-Z]*\s*\n?(.*?)\n?```\s*$", re.DOTALL)
+
+REPAIR_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You fix JSON that failed schema validation.
+
+The value must match this JSON schema:
+{schema}
+
+Return ONLY the corrected JSON value, no markdown code blocks or extra text. Keep every valid part unchanged."""),
+    ("human", """Value at {path}:
+{fragment}
+
+Validation errors:
+{errors}""")
+])
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a response cannot be parsed or repaired into its schema"""
+
+
+def parse_json_content(content: str, expect: Optional[type] = None) -> Any:
+    """
+    Parse JSON from an LLM response
+
+    Accepts bare JSON, JSON inside a markdown code block, and JSON preceded or
+    followed by prose (the first complete value is used).
+
+    Args:
+        content: Response text
+        expect: ``dict`` or ``list`` to only accept a value of that type
+
+    Returns:
+        The parsed value
+
+    Raises:
+        StructuredOutputError: No JSON value (of the expected type) was found
+    """
+    text = (content or "").strip()
+    if match := _FENCE_RE.match(text):
+        text = match.group(1).strip()
+
+    try:
+        value = json.loads(text)
+        if expect is None or isinstance(value, expect):
+            return value
+    except json.JSONDecodeError:
+        pass
+
+    openers = {dict: "{", list: "["}.get(expect, "{[")
+    decoder = json.JSONDecoder()
+    for i, char in enumerate(text):
+        if char not in openers:
+            continue
+        try:
+            value, _ = decoder.raw_decode(text, i)
+        except json.JSONDecodeError:
+            continue
+        if expect is None or isinstance(value, expect):
+            return value
+
+    raise StructuredOutputError("Response did not contain valid JSON")
+
+
+def _response_format(schema: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": schema.__name__, "schema": schema.model_json_schema(), "strict": False},
+    }
+
+
+async def ainvoke_structured(
+    prompt: ChatPromptTemplate,
+    llm: BaseChatModel,
+    schema: Type[ModelT],
+    inputs: Optional[Dict[str, Any]] = None,
+    prepare: Optional[Callable[[Any], Any]] = None,
+    mode: Optional[str] = None
+) -> ModelT:
+    """
+    Invoke the chat model and return its response as a validated ``schema``
+
+    The response is requested according to LLM_STRUCTURED_OUTPUT_MODE:
+
+    - ``json``: the prompt asks for JSON, the text is parsed
+    - ``json_schema``: provider schema-constrained output (``response_format``)
+    - ``function_calling``: the schema is a forced tool; its arguments are the payload
+
+    If the payload fails validation, only the invalid fragments (e.g. one
+    experience entry) are sent back to the model to be fixed, up to
+    LLM_STRUCTURED_MAX_REPAIRS times. List items that still fail are dropped
+    rather than failing the whole call.
+
+    Args:
+        prompt: Prompt template
+        llm: Chat model to invoke
+        schema: Pydantic model the response must match
+        inputs: Template variables
+        prepare: Applied to the parsed payload before validation (e.g. to merge
+            in fields resolved without the LLM)
+        mode: Overrides LLM_STRUCTURED_OUTPUT_MODE
+
+    Returns:
+        The validated model instance
+
+    Raises:
+        StructuredOutputError: The response could not be parsed or repaired
+    """
+    settings = get_settings()
+    mode = mode or settings.LLM_STRUCTURED_OUTPUT_MODE
+
+    if mode == "json_schema":
+        result = await ainvoke_prompt(prompt, llm.bind(response_format=_response_format(schema)), inputs)
+    elif mode == "function_calling":
+        # Tool calls are not plain text, so they bypass the response cache
+        bound = llm.bind_tools([schema], tool_choice=schema.__name__)
+        result = await ainvoke_prompt(prompt, bound, inputs, cache=False)
+    else:
+        result = await ainvoke_prompt(prompt, llm, inputs)
+
+    tool_calls = getattr(result, "tool_calls", None) or []
+    repaired = False
+    try:
+        payload = tool_calls[0]["args"] if tool_calls else parse_json_content(result.content, expect=dict)
+    except StructuredOutputError:
+        payload = await _repair_text(llm, schema, result.content)
+        if payload is None:
+            record_structured_output(mode, "failed")
+            raise
+        repaired = True
+
+    if prepare is not None:
+        payload = prepare(payload)
+
+    return await validate_with_repair(
+        llm, schema, payload, mode, settings.LLM_STRUCTURED_MAX_REPAIRS, repaired=repaired
+    )
+
+
+async def validate_with_repair(
+    llm: BaseChatModel,
+    schema: Type[ModelT],
+    payload: Any,
+    mode: str = "json",
+    max_repairs: int = 2,
+    repaired: bool = False
+) -> ModelT:
+    """
+    Validate a payload against ``schema``, repairing invalid fragments with the LLM
+
+    Args:
+        llm: Chat model used for repairs
+        schema: Pydantic model to validate against
+        payload: Parsed JSON payload
+        mode: Structured output mode (metrics label)
+        max_repairs: Maximum repair rounds
+        repaired: The payload already needed a repair (metrics outcome)
+
+    Returns:
+        The validated model instance
+
+    Raises:
+        StructuredOutputError: The payload is still invalid after repairs
+    """
+    outcome = "repaired" if repaired else "ok"
+    for attempt in range(max_repairs + 1):
+        try:
+            instance = schema.model_validate(payload)
+            record_structured_output(mode, outcome)
+            return instance
+        except ValidationError as e:
+            if attempt == max_repairs:
+                error = e
+                break
+            outcome = "repaired"
+            payload = await _repair_fragments(llm, schema, payload, e)
+
+    # Last resort: drop the list items that could not be repaired
+    payload = _drop_invalid_items(payload, error)
+    try:
+        instance = schema.model_validate(payload)
+        record_structured_output(mode, "degraded")
+        return instance
+    except ValidationError as e:
+        record_structured_output(mode, "failed")
+        raise StructuredOutputError(f"Response does not match {schema.__name__}: {e.error_count()} errors") from e
+
+
+def _fragment_path(loc: Path) -> Path:
+    """The smallest repairable unit for an error: up to and including the first list index"""
+    for i, part in enumerate(loc):
+        if isinstance(part, int):
+            return loc[:i + 1]
+    return loc[:1]
+
+
+def _get(payload: Any, path: Path) -> Any:
+    for part in path:
+        try:
+            payload = payload[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return payload
+
+
+def _set(payload: Any, path: Path, value: Any):
+    parent = _get(payload, path[:-1]) if len(path) > 1 else payload
+    try:
+        parent[path[-1]] = value
+    except (KeyError, IndexError, TypeError):
+        pass
+
+
+def _unwrap(annotation: Any) -> Any:
+    """Strip Optional[...] from a type annotation"""
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _fragment_schema(schema: Type[BaseModel], path: Path) -> Dict[str, Any]:
+    """JSON schema of the value at ``path`` (the whole schema if it cannot be resolved)"""
+    annotation: Any = schema
+    for part in path:
+        annotation = _unwrap(annotation)
+        if isinstance(part, int):
+            if get_origin(annotation) not in (list, List):
+                return schema.model_json_schema()
+            annotation = get_args(annotation)[0]
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel) and part in annotation.model_fields:
+            annotation = annotation.model_fields[part].annotation
+        else:
+            return schema.model_json_schema()
+    return TypeAdapter(_unwrap(annotation)).json_schema()
+
+
+async def _repair_fragments(llm: BaseChatModel, schema: Type[BaseModel], payload: Any, error: ValidationError) -> Any:
+    """Ask the model to fix each invalid fragment, concurrently, and splice the fixes in"""
+    if not isinstance(payload, dict):
+        return await _repair_text(llm, schema, json.dumps(payload, ensure_ascii=False)) or payload
+
+    fragments: Dict[Path, List[str]] = {}
+    for item in error.errors():
+        path = _fragment_path(tuple(item["loc"]))
+        relative = ".".join(str(part) for part in item["loc"][len(path):]) or "value"
+        fragments.setdefault(path, []).append(f"{relative}: {item['msg']}")
+
+    async def repair(path: Path, messages: List[str]):
+        result = await ainvoke_prompt(REPAIR_PROMPT, llm, {
+            "schema": json.dumps(_fragment_schema(schema, path), ensure_ascii=False),
+            "path": ".".join(str(part) for part in path),
+            "fragment": json.dumps(_get(payload, path), ensure_ascii=False, indent=2),
+            "errors": "\n".join(messages),
+        })
+        try:
+            return path, parse_json_content(result.content)
+        except StructuredOutputError:
+            return path, None
+
+    results = await asyncio.gather(*(repair(path, messages) for path, messages in fragments.items()))
+    for path, value in results:
+        if value is not None:
+            _set(payload, path, value)
+    return payload
+
+
+async def _repair_text(llm: BaseChatModel, schema: Type[BaseModel], content: str) -> Optional[Dict[str, Any]]:
+    """Ask the model to turn a response that is not JSON into a JSON object, once"""
+    result = await ainvoke_prompt(REPAIR_PROMPT, llm, {
+        "schema": json.dumps(schema.model_json_schema(), ensure_ascii=False),
+        "path": "(response)",
+        "fragment": content,
+        "errors": "Not valid JSON",
+    })
+    try:
+        return parse_json_content(result.content, expect=dict)
+    except StructuredOutputError:
+        return None
+
+
+def _drop_invalid_items(payload: Any, error: ValidationError) -> Any:
+    """Remove list items that still fail validation (highest index first)"""
+    paths = {_fragment_path(tuple(item["loc"])) for item in error.errors()}
+    for path in sorted((p for p in paths if isinstance(p[-1], int)), key=lambda p: p[-1], reverse=True):
+        parent = _get(payload, path[:-1])
+        if isinstance(parent, list) and path[-1] < len(parent):
+            del parent[path[-1]]
+    return payload
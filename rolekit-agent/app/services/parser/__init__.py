@@ -1,4 +1,47 @@
 """Document Parsers"""
 from .document_parser import DocumentParser, parse_cv_document
+from .parser_pool import (
+    ParserPool,
+    ParserBusyError,
+    ParserTimeoutError,
+    get_parser_pool,
+    init_parser_pool,
+    shutdown_parser_pool,
+)
+from .document_cache import DocumentCache, get_document_cache
+from .text_normalizer import NormalizedText, count_tokens, normalize_pages, normalize_text
+from .uploads import (
+    BatchEntry,
+    SpooledUpload,
+    UploadSizeLimitMiddleware,
+    UploadTooLargeError,
+    UnsupportedUploadError,
+    parse_upload,
+    spool_batch,
+    spool_upload,
+)
 
-__all__ = ['DocumentParser', 'parse_cv_document']
+__all__ = [
+    'DocumentParser',
+    'parse_cv_document',
+    'ParserPool',
+    'ParserBusyError',
+    'ParserTimeoutError',
+    'get_parser_pool',
+    'init_parser_pool',
+    'shutdown_parser_pool',
+    'DocumentCache',
+    'get_document_cache',
+    'NormalizedText',
+    'count_tokens',
+    'normalize_pages',
+    'normalize_text',
+    'BatchEntry',
+    'SpooledUpload',
+    'UploadSizeLimitMiddleware',
+    'UploadTooLargeError',
+    'UnsupportedUploadError',
+    'parse_upload',
+    'spool_batch',
+    'spool_upload',
+]
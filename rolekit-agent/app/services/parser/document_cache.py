@@ -0,0 +1,92 @@
+"""
+Document Fingerprint Cache
+Caches parse and extraction results by the SHA-256 of the uploaded bytes
+"""
+from typing import Any, Dict, Optional
+import copy
+import threading
+
+from app.core.config import Settings, get_settings
+from app.services.llm.response_cache import MemoryTTLCache
+
+
+class DocumentCache:
+    """
+    Results for documents seen before, keyed on their content fingerprint.
+
+    Entries are namespaced by ``kind``:
+
+    - ``"parsed"``: ``DocumentParser`` output (depends on the bytes only)
+    - ``"extract"``: the ``/api/extract/upload`` response for a target role
+    - ``"cv_data"``: validated ``CVData`` for the legacy parse route
+
+    Values are deep-copied on the way in and out so callers can mutate what
+    they get back.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the cache
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self.enabled = self.settings.DOCUMENT_CACHE_ENABLED
+        self.memory = MemoryTTLCache(
+            max_entries=self.settings.DOCUMENT_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.settings.DOCUMENT_CACHE_TTL_SECONDS
+        )
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(kind: str, sha256: str, target_role: Optional[str] = None) -> str:
+        """
+        Build the cache key for a document result
+
+        Args:
+            kind: Result namespace ("parsed", "extract", "cv_data")
+            sha256: Hex digest of the uploaded bytes
+            target_role: Target role the result was produced for
+
+        Returns:
+            Cache key
+        """
+        role = (target_role or "").strip().lower()
+        return f"{kind}:{sha256}:{role}"
+
+    def get(self, kind: str, sha256: str, target_role: Optional[str] = None) -> Optional[Any]:
+        """Cached result for this document, or None"""
+        if not self.enabled:
+            return None
+
+        value = self.memory.get(self.make_key(kind, sha256, target_role))
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return copy.deepcopy(value)
+
+    def set(self, kind: str, sha256: str, value: Any, target_role: Optional[str] = None):
+        """Store a result for this document"""
+        if self.enabled:
+            self.memory.set(self.make_key(kind, sha256, target_role), copy.deepcopy(value))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current cache state"""
+        return {"enabled": self.enabled, "entries": len(self.memory), **self.stats}
+
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Get the process-wide document fingerprint cache"""
+    global _document_cache
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache()
+    return _document_cache
@@ -3,9 +3,21 @@ Document Parser Tools
 Extracts text from various document formats (PDF, DOCX, TXT)
 """
 import io
-from typing import Dict, Any, Optional
+import mmap
+import os
+import re
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from app.core.config import get_settings
+from app.services.parser.ooxml import iter_docx_blocks, read_core_properties
+from app.services.parser.parser_pool import get_parser_pool
+from app.services.parser.text_normalizer import normalize_pages, normalize_text
+
+# A page opening with one of these headings starts material appended after the CV
+# (only with PDF_STOP_AT_APPENDIX; "Portfolio" and the like are often part of the CV)
+_END_OF_CV_RE = re.compile(r"^(?:appendix|appendices|annex|annexes)\b", re.IGNORECASE)
+
 
 class DocumentParser:
     """Unified document parser for multiple formats"""
@@ -49,7 +61,7 @@ class DocumentParser:
     @staticmethod
     async def parse_pdf(file_bytes: bytes) -> Dict[str, Any]:
         """
-        Extract text from PDF file
+        Extract text from PDF file in the parser pool
         
         Args:
             file_bytes: PDF file content
@@ -57,31 +69,143 @@ class DocumentParser:
         Returns:
             Dictionary with text and metadata
         """
-        try:
-            import pymupdf  # PyMuPDF
+        settings = get_settings()
+        return await get_parser_pool().run(
+            DocumentParser.parse_pdf_sync,
+            file_bytes,
+            settings.PDF_MAX_PAGES,
+            settings.PDF_MAX_CHARS,
+            settings.TEXT_NORMALIZATION_ENABLED,
+            settings.PDF_STOP_AT_APPENDIX
+        )
+    
+    @staticmethod
+    async def parse_docx(file_bytes: bytes) -> Dict[str, Any]:
+        """
+        Extract text from DOCX file in the parser pool
+        
+        Args:
+            file_bytes: DOCX file content
             
-            # Open PDF from bytes
-            doc = pymupdf.open(stream=file_bytes, filetype="pdf")
+        Returns:
+            Dictionary with text and metadata
+        """
+        settings = get_settings()
+        return await get_parser_pool().run(
+            DocumentParser.parse_docx_sync,
+            file_bytes,
+            settings.DOCX_FAST_PARSE_ENABLED
+        )
+    
+    @staticmethod
+    def iter_pdf_pages(file_bytes: bytes) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Yield the text of a PDF one page at a time
+        
+        Each page is loaded, read and released before the next one, so memory
+        stays flat however many pages the document has. The document is
+        closed when the generator is exhausted or closed early.
+        
+        Args:
+            file_bytes: PDF file content
             
-            text_content = []
+        Yields:
+            (page_number, page_text, document_metadata) tuples
+        """
+        import pymupdf  # PyMuPDF
+        
+        doc = pymupdf.open(stream=file_bytes, filetype="pdf")
+        try:
             metadata = {
-                "pages": len(doc),
+                "pages": doc.page_count,
                 "title": doc.metadata.get("title", ""),
                 "author": doc.metadata.get("author", ""),
             }
+            for page_num in range(doc.page_count):
+                page = doc.load_page(page_num)
+                text = page.get_text()
+                del page  # Release the page's display list before loading the next
+                yield page_num, text, metadata
+        finally:
+            doc.close()
+    
+    @staticmethod
+    def parse_pdf_sync(
+        file_bytes: bytes,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        normalize: bool = False,
+        stop_at_appendix: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Extract text from PDF file (blocking; runs in a parser worker)
+        
+        Reading stops at the page or character budget, or, with
+        ``stop_at_appendix``, at a page headed "Appendix" or "Annex" once CV
+        text has been found. Pages without any text (scans, images) are
+        skipped and counted in metadata["empty_pages"].
+        
+        Args:
+            file_bytes: PDF file content
+            max_pages: Maximum number of pages to read (None for no limit)
+            max_chars: Maximum characters of text to keep (None for no limit)
+            normalize: Normalize the text page by page (see text_normalizer)
+            stop_at_appendix: End the CV at an appendix/annex page
             
-            # Extract text from each page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text_content.append(page.get_text())
+        Returns:
+            Dictionary with text and metadata
+        """
+        try:
+            text_content = []
+            metadata: Dict[str, Any] = {}
+            total_chars = 0
+            pages_read = 0
+            empty_pages = 0
+            stop_reason = None
             
-            doc.close()
+            pages = DocumentParser.iter_pdf_pages(file_bytes)
+            try:
+                for page_num, text, doc_metadata in pages:
+                    if not metadata:
+                        metadata = dict(doc_metadata)
+                    
+                    if max_pages and page_num >= max_pages:
+                        stop_reason = "max_pages"
+                        break
+                    pages_read += 1
+                    
+                    stripped = text.strip()
+                    if stop_at_appendix and text_content and _END_OF_CV_RE.match(stripped):
+                        stop_reason = "end_of_cv"
+                        break
+                    
+                    if not stripped:
+                        empty_pages += 1
+                        continue
+                    
+                    if max_chars and total_chars + len(text) > max_chars:
+                        text_content.append(text[:max_chars - total_chars])
+                        stop_reason = "max_chars"
+                        break
+                    
+                    text_content.append(text)
+                    total_chars += len(text)
+            finally:
+                pages.close()
             
-            return {
+            metadata["pages_read"] = pages_read
+            metadata["empty_pages"] = empty_pages
+            if stop_reason:
+                metadata["truncated"] = stop_reason
+            
+            result = {
                 "text": "\n\n".join(text_content),
                 "metadata": metadata,
                 "format": "pdf"
             }
+            if normalize:
+                DocumentParser.normalize_result(result, text_content)
+            return result
             
         except Exception as e:
             return {
@@ -92,21 +216,94 @@ class DocumentParser:
             }
     
     @staticmethod
-    async def parse_docx(file_bytes: bytes) -> Dict[str, Any]:
+    def normalize_result(result: Dict[str, Any], pages: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Normalize a parse result's text in place, recording the token saving
+        
+        Args:
+            result: Parse result
+            pages: Text of each page, so running headers/footers can be found
+            
+        Returns:
+            The same result
+        """
+        if result.get("error") or not result.get("text"):
+            return result
+        
+        normalized = normalize_pages(pages) if pages else normalize_text(result["text"])
+        result["text"] = normalized.text
+        result["metadata"]["normalization"] = {
+            "tokens_before": normalized.tokens_before,
+            "tokens_after": normalized.tokens_after,
+            "lines_removed": normalized.lines_removed,
+        }
+        return result
+    
+    @staticmethod
+    def parse_docx_ooxml(file_bytes: bytes) -> Dict[str, Any]:
+        """
+        Extract text from DOCX file by streaming word/document.xml
+        
+        Paragraphs and table rows come out in document order; images and
+        styles are never loaded.
+        
+        Args:
+            file_bytes: DOCX file content, or an open binary file
+            
+        Returns:
+            Dictionary with text and metadata
+            
+        Raises:
+            Exception: The archive or its XML could not be read
         """
-        Extract text from DOCX file
+        source = file_bytes if hasattr(file_bytes, "read") else io.BytesIO(file_bytes)
+        
+        text_content = []
+        counts = {"paragraph": 0, "table": 0}
+        for kind, text in iter_docx_blocks(source):
+            counts[kind] += 1
+            text_content.append(text)
+        
+        metadata = {
+            "paragraphs": counts["paragraph"],
+            "tables": counts["table"],
+            **read_core_properties(source),
+            "parser": "ooxml",
+        }
+        
+        return {
+            "text": "\n".join(text_content),
+            "metadata": metadata,
+            "format": "docx"
+        }
+    
+    @staticmethod
+    def parse_docx_sync(file_bytes: bytes, fast: bool = True) -> Dict[str, Any]:
+        """
+        Extract text from DOCX file (blocking; runs in a parser worker)
+        
+        The streaming OOXML reader is tried first; python-docx handles any
+        document it cannot read.
         
         Args:
             file_bytes: DOCX file content
+            fast: Try the streaming OOXML reader first
             
         Returns:
             Dictionary with text and metadata
         """
+        if fast:
+            try:
+                return DocumentParser.parse_docx_ooxml(file_bytes)
+            except Exception:
+                if hasattr(file_bytes, "seek"):
+                    file_bytes.seek(0)
+        
         try:
             from docx import Document
             
-            # Open DOCX from bytes
-            doc = Document(io.BytesIO(file_bytes))
+            # Open DOCX from bytes, or directly from an open file
+            doc = Document(file_bytes if hasattr(file_bytes, "read") else io.BytesIO(file_bytes))
             
             text_content = []
             
@@ -157,6 +354,21 @@ class DocumentParser:
         """
         Extract text from plain text file
         
+        Decoding is cheap, so this runs inline rather than in the parser pool.
+        
+        Args:
+            file_bytes: Text file content
+            
+        Returns:
+            Dictionary with text and metadata
+        """
+        return DocumentParser.parse_text_sync(file_bytes)
+    
+    @staticmethod
+    def parse_text_sync(file_bytes: bytes) -> Dict[str, Any]:
+        """
+        Extract text from plain text file (blocking)
+        
         Args:
             file_bytes: Text file content
             
@@ -219,13 +431,13 @@ class DocumentParser:
         else:
             doc_format = cls.detect_format(file_bytes=file_bytes, filename=filename)
         
-        # Parse based on format
+        # Parse based on format (PDFs are normalized page by page in the worker)
         if doc_format == 'pdf':
             return await cls.parse_pdf(file_bytes)
         elif doc_format == 'docx' or doc_format == 'doc':
-            return await cls.parse_docx(file_bytes)
+            result = await cls.parse_docx(file_bytes)
         elif doc_format == 'txt':
-            return await cls.parse_text(file_bytes)
+            result = await cls.parse_text(file_bytes)
         else:
             return {
                 "text": "",
@@ -233,6 +445,97 @@ class DocumentParser:
                 "format": "unknown",
                 "error": f"Unsupported format: {doc_format}"
             }
+        
+        if get_settings().TEXT_NORMALIZATION_ENABLED:
+            cls.normalize_result(result)
+        return result
+
+
+    @staticmethod
+    def parse_file_sync(
+        path: str,
+        doc_format: str,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        docx_fast: bool = True,
+        normalize: bool = False,
+        stop_at_appendix: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse a document on disk without reading it into a bytes copy (blocking)
+        
+        PDFs and text are read through a read-only memory map; DOCX archives
+        are read member by member from the open file.
+        
+        Args:
+            path: Path to the document
+            doc_format: 'pdf', 'docx', 'doc' or 'txt'
+            max_pages: PDF page budget
+            max_chars: PDF character budget
+            docx_fast: Try the streaming OOXML reader for DOCX first
+            normalize: Normalize the extracted text (see text_normalizer)
+            stop_at_appendix: End a PDF at an appendix/annex page
+            
+        Returns:
+            Parsed document with text and metadata
+        """
+        if doc_format not in ('pdf', 'docx', 'doc', 'txt'):
+            return {
+                "text": "",
+                "metadata": {},
+                "format": "unknown",
+                "error": f"Unsupported format: {doc_format}"
+            }
+        
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return DocumentParser.parse_text_sync(b"") if doc_format == 'txt' else {
+                    "text": "",
+                    "metadata": {},
+                    "format": doc_format,
+                    "error": "Empty file"
+                }
+            
+            if doc_format in ('docx', 'doc'):
+                # zipfile reads members lazily from the open file
+                result = DocumentParser.parse_docx_sync(f, docx_fast)
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if doc_format == 'pdf':
+                        with memoryview(mapped) as view:
+                            return DocumentParser.parse_pdf_sync(view, max_pages, max_chars, normalize, stop_at_appendix)
+                    result = DocumentParser.parse_text_sync(mapped[:])
+        
+        return DocumentParser.normalize_result(result) if normalize else result
+    
+    @classmethod
+    async def parse_file(cls, path: str, filename: Optional[str] = None, force_format: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Parse a document on disk in the parser pool
+        
+        Only the path crosses the process boundary; the worker maps the file
+        instead of receiving a copy of its bytes.
+        
+        Args:
+            path: Path to the document
+            filename: Original filename (for format detection)
+            force_format: Force specific format ('pdf', 'docx', 'txt')
+            
+        Returns:
+            Parsed document with text and metadata
+        """
+        doc_format = force_format or cls.detect_format(file_path=filename or path)
+        settings = get_settings()
+        return await get_parser_pool().run(
+            DocumentParser.parse_file_sync,
+            path,
+            doc_format,
+            settings.PDF_MAX_PAGES,
+            settings.PDF_MAX_CHARS,
+            settings.DOCX_FAST_PARSE_ENABLED,
+            settings.TEXT_NORMALIZATION_ENABLED,
+            settings.PDF_STOP_AT_APPENDIX
+        )
 
 
 # Convenience functions
@@ -0,0 +1,124 @@
+"""
+OOXML Text Streaming
+Reads DOCX text straight from word/document.xml with an incremental XML parser
+"""
+from typing import IO, Dict, Iterator, List, Tuple, Union
+import io
+import xml.etree.ElementTree as ET
+import zipfile
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+DC = "{http://purl.org/dc/elements/1.1/}"
+
+DOCUMENT_PART = "word/document.xml"
+CORE_PROPERTIES_PART = "docProps/core.xml"
+
+# Subtrees with no body text: images, embedded objects, paragraph/run styling
+SKIPPED = {
+    f"{W}drawing", f"{W}pict", f"{W}object", f"{W}pPr", f"{W}rPr", f"{W}sectPr",
+    f"{W}del", f"{W}instrText", MC_FALLBACK,
+}
+
+Block = Tuple[str, str]
+
+
+def iter_docx_blocks(source: Union[bytes, IO[bytes], str]) -> Iterator[Block]:
+    """
+    Stream the text of a DOCX in document order
+
+    ``word/document.xml`` is read from the archive and parsed incrementally;
+    each element is discarded once handled, so memory stays flat however long
+    the document is. Drawings (including text boxes), embedded objects,
+    styling and deleted revisions are skipped.
+
+    Args:
+        source: DOCX path, open binary file, or bytes
+
+    Yields:
+        ("paragraph", text) for body paragraphs and ("table", text) for
+        tables, one line per row with the non-empty cells joined by " | "
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as part:
+        paragraphs: List[List[str]] = []  # Open paragraphs, innermost last
+        cells: List[List[str]] = []  # Open table cells, innermost last
+        rows: List[List[str]] = []  # Open table rows, innermost last
+        table: List[str] = []  # Rows of the open top-level table
+        elements: List[ET.Element] = []
+        skip_depth = 0
+
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                elements.append(elem)
+                if skip_depth or tag in SKIPPED:
+                    skip_depth += 1
+                elif tag == f"{W}p":
+                    paragraphs.append([])
+                elif tag == f"{W}tc":
+                    cells.append([])
+                elif tag == f"{W}tr":
+                    rows.append([])
+                continue
+
+            elements.pop()
+            if skip_depth:
+                skip_depth -= 1
+            elif tag == f"{W}t" and paragraphs:
+                paragraphs[-1].append(elem.text or "")
+            elif tag == f"{W}tab" and paragraphs:
+                paragraphs[-1].append("\t")
+            elif tag in (f"{W}br", f"{W}cr") and paragraphs:
+                paragraphs[-1].append("\n")
+            elif tag == f"{W}p" and paragraphs:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                elif text.strip():
+                    yield "paragraph", text
+            elif tag == f"{W}tc" and cells:
+                cell = "\n".join(cells.pop()).strip()
+                if cell and rows:
+                    rows[-1].append(cell)
+            elif tag == f"{W}tr" and rows:
+                row = " | ".join(rows.pop())
+                if cells:
+                    # Nested table: its rows are part of the enclosing cell
+                    cells[-1].append(row)
+                elif row:
+                    table.append(row)
+            elif tag == f"{W}tbl" and not cells:
+                if table:
+                    yield "table", "\n".join(table)
+                table = []
+
+            # Drop the handled element so the tree never grows
+            if elements:
+                elements[-1].remove(elem)
+
+
+def read_core_properties(source: Union[IO[bytes], str]) -> Dict[str, str]:
+    """
+    Read the author and title from ``docProps/core.xml``
+
+    Args:
+        source: DOCX path or open binary file
+
+    Returns:
+        {"author": ..., "title": ...} (empty strings when absent)
+    """
+    properties = {"author": "", "title": ""}
+    try:
+        with zipfile.ZipFile(source) as archive, archive.open(CORE_PROPERTIES_PART) as part:
+            root = ET.parse(part).getroot()
+    except (KeyError, ET.ParseError, zipfile.BadZipFile):
+        return properties
+
+    for key, tag in (("author", f"{DC}creator"), ("title", f"{DC}title")):
+        elem = root.find(tag)
+        if elem is not None and elem.text:
+            properties[key] = elem.text
+    return properties
@@ -0,0 +1,212 @@
+"""
+Parser Pool
+Runs blocking document parsing off the event loop in a bounded process pool
+"""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import multiprocessing
+import threading
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ParserBusyError(RuntimeError):
+    """Raised when the parser queue is full"""
+
+
+class ParserTimeoutError(TimeoutError):
+    """Raised when a document takes longer than PARSER_TIMEOUT_SECONDS to parse"""
+
+
+def _warm_up_worker():
+    """Import the parsing libraries so the first real parse doesn't pay for it"""
+    try:
+        import pymupdf  # noqa: F401
+        import docx  # noqa: F401
+    except ImportError:
+        pass
+
+
+class ParserPool:
+    """
+    Bounded executor for CPU-bound parsing (PyMuPDF, python-docx).
+
+    Work runs in worker processes so a large upload cannot stall the event
+    loop or hold the GIL. At most ``size + max_queue`` parses are accepted at
+    once; beyond that callers get ``ParserBusyError`` immediately instead of
+    queueing without bound. A parse holds its slot until its worker finishes,
+    even after the caller has timed out, so abandoned parses still count
+    against the bound. If worker processes cannot be started (or the pool
+    breaks), parsing falls back to a thread pool of the same size.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None):
+        """
+        Initialize the pool (workers start lazily on first use)
+
+        Args:
+            settings: Application settings (defaults to the cached settings)
+        """
+        self.settings = settings or get_settings()
+        self.size = max(1, self.settings.PARSER_POOL_SIZE)
+        self.max_queue = max(0, self.settings.PARSER_POOL_MAX_QUEUE)
+        self.timeout = self.settings.PARSER_TIMEOUT_SECONDS
+        self.use_processes = self.settings.PARSER_POOL_MODE == "process"
+
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self.pending = 0
+        self.stats: Dict[str, int] = {"completed": 0, "rejected": 0, "timeouts": 0, "thread_fallbacks": 0}
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="parser")
+            return self._thread_pool
+
+    def _get_executor(self) -> Executor:
+        """Process pool if available, otherwise the thread pool"""
+        if self.use_processes:
+            with self._lock:
+                if self._process_pool is None:
+                    try:
+                        # spawn: forking a process that runs an event loop and threads is unsafe
+                        self._process_pool = ProcessPoolExecutor(
+                            max_workers=self.size,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+                    except (OSError, NotImplementedError, ImportError) as e:
+                        logger.warning(f"Parser process pool unavailable, using threads: {e}")
+                        self.use_processes = False
+                if self._process_pool is not None:
+                    return self._process_pool
+        return self._get_thread_pool()
+
+    def _submit(self, executor: Executor, func: Callable[..., Any], *args: Any) -> Future:
+        """Submit work, holding a slot until it finishes or is cancelled"""
+        with self._pending_lock:
+            self.pending += 1
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, _future: Optional[Future] = None):
+        # Runs on the worker (or executor management) thread when the work ends
+        with self._pending_lock:
+            self.pending -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking parse function in the pool
+
+        Args:
+            func: Module-level (picklable) function to run
+            *args: Arguments for ``func``
+
+        Returns:
+            The function's result
+
+        Raises:
+            ParserBusyError: Too many parses are already running or queued
+            ParserTimeoutError: The parse did not finish within the timeout
+        """
+        if self.pending >= self.size + self.max_queue:
+            self.stats["rejected"] += 1
+            raise ParserBusyError("Document parser is busy, please retry shortly")
+
+        try:
+            executor = self._get_executor()
+            try:
+                future = asyncio.wrap_future(self._submit(executor, func, *args))
+                result = await asyncio.wait_for(future, timeout=self.timeout or None)
+            except (BrokenProcessPool, OSError) as e:
+                if executor is not self._process_pool:
+                    raise
+                logger.warning(f"Parser process pool failed ({e}), falling back to threads")
+                self._discard_process_pool()
+                self.stats["thread_fallbacks"] += 1
+                future = asyncio.wrap_future(self._submit(self._get_thread_pool(), func, *args))
+                result = await asyncio.wait_for(future, timeout=self.timeout or None)
+        except asyncio.TimeoutError:
+            # A running worker cannot be interrupted; it finishes in the background
+            # and keeps its slot until then (a queued one is cancelled and frees it)
+            self.stats["timeouts"] += 1
+            raise ParserTimeoutError(f"Document parsing exceeded {self.timeout:g}s")
+
+        self.stats["completed"] += 1
+        return result
+
+    def warm_up(self):
+        """Start every worker now instead of on the first upload"""
+        executor = self._get_executor()
+        for _ in range(self.size):
+            executor.submit(_warm_up_worker)
+
+    def _discard_process_pool(self):
+        with self._lock:
+            pool, self._process_pool = self._process_pool, None
+            self.use_processes = False
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool state"""
+        return {
+            "mode": "process" if self.use_processes else "thread",
+            "size": self.size,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            **self.stats,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes and threads"""
+        with self._lock:
+            process_pool, self._process_pool = self._process_pool, None
+            thread_pool, self._thread_pool = self._thread_pool, None
+        if process_pool is not None:
+            process_pool.shutdown(wait=wait, cancel_futures=True)
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_parser_pool: Optional[ParserPool] = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool() -> ParserPool:
+    """Get the process-wide parser pool, creating it on first use"""
+    global _parser_pool
+    if _parser_pool is None:
+        with _parser_pool_lock:
+            if _parser_pool is None:
+                _parser_pool = ParserPool()
+    return _parser_pool
+
+
+def init_parser_pool() -> ParserPool:
+    """Create the parser pool and start its workers (called at application startup)"""
+    pool = get_parser_pool()
+    pool.warm_up()
+    logger.info("Parser pool ready (mode=%s, size=%s)", pool.snapshot()["mode"], pool.size)
+    return pool
+
+
+def shutdown_parser_pool():
+    """Stop the parser pool's workers (called at application shutdown)"""
+    global _parser_pool
+    with _parser_pool_lock:
+        pool, _parser_pool = _parser_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,205 @@
+"""
+Text Normalizer
+Strips layout noise from parsed document text before it reaches the LLM
+"""
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import re
+
+TOKEN_ENCODING = "o200k_base"
+
+# Lines at the top and bottom of each page that may be a running header/footer
+EDGE_LINES = 3
+
+# A header/footer must repeat, at the same position, on at least this many pages
+MIN_REPEAT_PAGES = 3
+
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?[-–—]?\s*\d{1,3}\s*[-–—]?(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+PAGE_REF_RE = re.compile(r"\bpage\s*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?\b", re.IGNORECASE)
+HYPHENATED_BREAK_RE = re.compile(r"(\w+)([-\u00ad])\n[ \t]*([a-z]\w*)")
+SOFT_HYPHEN = "\u00ad"
+BULLET_RE = re.compile(r"^[•·▪●◦■□►▸▶➢➤✓✔❖]+\s*")
+TAB_RUN_RE = re.compile(r"[ \u00a0\u2000-\u200b\u3000]*\t[ \t\u00a0\u2000-\u200b\u3000]*")
+SPACE_RUN_RE = re.compile(r"[ \u00a0\u2000-\u200b\u3000]+")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+@dataclass
+class NormalizedText:
+    """Normalized text with the token counts before and after"""
+
+    text: str
+    tokens_before: int
+    tokens_after: int
+    lines_removed: int = 0
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    """The tiktoken encoding, or None if tiktoken or its BPE file is unavailable"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in ``text``
+
+    Uses tiktoken when it is installed and its encoding can be loaded,
+    otherwise the usual ~4 characters per token estimate.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Token count
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4
+
+
+def _edge_key(line: str) -> str:
+    """
+    Header/footer identity: the line's text with spacing collapsed
+
+    Only page references ("Page 2", "page 2 of 5") are masked, so lines that
+    differ just by their page number still match; any other digits (dates,
+    years) must match exactly.
+    """
+    text = SPACE_RUN_RE.sub(" ", line.replace("\t", " ")).strip()
+    return PAGE_REF_RE.sub("page #", text)
+
+
+def _edge_positions(lines: List[str]) -> Dict[int, List[Tuple[str, int]]]:
+    """Positions ("top"/"bottom", n-th non-empty line) of the EDGE_LINES lines at each end of a page"""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    positions = defaultdict(list)
+    for rank, i in enumerate(filled[:EDGE_LINES]):
+        positions[i].append(("top", rank))
+    for rank, i in enumerate(reversed(filled[-EDGE_LINES:])):
+        positions[i].append(("bottom", rank))
+    return positions
+
+
+def _is_page_number(line: str, positions: Sequence[Tuple[str, int]]) -> bool:
+    """
+    A page number line at the edge of a page
+
+    "Page 2 (of 5)" may be anywhere in the edge lines; a bare "2" or "- 2 -"
+    only as the outermost line, as short numbers are common in CV content.
+    """
+    stripped = line.strip()
+    if not positions or not PAGE_NUMBER_RE.match(stripped):
+        return False
+    if stripped[:1].isalpha():
+        return True
+    return any(rank == 0 for _, rank in positions)
+
+
+def _strip_page_furniture(pages: Sequence[str]) -> Tuple[List[str], int]:
+    """Drop page numbers, and repeats of headers/footers found on most pages"""
+    pages_lines = [page.splitlines() for page in pages]
+    pages_positions = [_edge_positions(lines) for lines in pages_lines]
+    pages_edges = [
+        {i: [(position, _edge_key(lines[i])) for position in found] for i, found in positions.items()}
+        for lines, positions in zip(pages_lines, pages_positions)
+    ]
+
+    repeated = set()
+    if len(pages_lines) >= MIN_REPEAT_PAGES:
+        seen = Counter()
+        for edges in pages_edges:
+            seen.update({entry for entries in edges.values() for entry in entries if entry[1]})
+        threshold = max(MIN_REPEAT_PAGES, (len(pages_lines) + 1) // 2)
+        repeated = {entry for entry, count in seen.items() if count >= threshold}
+
+    removed = 0
+    kept_pages = []
+    for number, (lines, positions, edges) in enumerate(zip(pages_lines, pages_positions, pages_edges)):
+        kept = []
+        for i, line in enumerate(lines):
+            # The first page keeps its copy: a running header is often the candidate's name
+            furniture = number > 0 and any(entry in repeated for entry in edges.get(i, ()))
+            if line.strip() and (furniture or _is_page_number(line, positions.get(i, ()))):
+                removed += 1
+                continue
+            kept.append(line)
+        kept_pages.append("\n".join(kept))
+    return kept_pages, removed
+
+
+def _rejoin_hyphenated(text: str) -> str:
+    """
+    Rejoin words broken across a line break
+
+    Soft hyphens always mark a split word. A plain hyphen is kept
+    ("self-\nmotivated" becomes "self-motivated") unless the joined word
+    appears elsewhere in the document.
+    """
+    words = set(re.findall(r"\w+", text.lower()))
+
+    def join(match: re.Match) -> str:
+        head, hyphen, tail = match.groups()
+        if hyphen == SOFT_HYPHEN or (head + tail).lower() in words:
+            return head + tail
+        return f"{head}-{tail}"
+
+    return HYPHENATED_BREAK_RE.sub(join, text)
+
+
+def normalize_pages(pages: Sequence[str], paginated: bool = True) -> NormalizedText:
+    """
+    Normalize the text of a document, given page by page
+
+    - page numbers at the edges of pages, and headers/footers repeated at the
+      same position on most pages (at least MIN_REPEAT_PAGES), are removed
+      (paginated input only)
+    - words split across a line break are rejoined (compounds keep their hyphen)
+    - bullet glyphs become "- "
+    - runs of whitespace collapse to one space (or tab), and blank lines to one
+
+    Args:
+        pages: Text of each page (a single item for unpaginated formats)
+        paginated: ``pages`` are real pages (PDF), so may carry page furniture
+
+    Returns:
+        NormalizedText with before/after token counts
+    """
+    original = "\n\n".join(pages)
+    kept_pages, removed = _strip_page_furniture(pages) if paginated else (list(pages), 0)
+
+    text = "\n\n".join(kept_pages)
+    text = _rejoin_hyphenated(text)
+
+    lines = []
+    for line in text.splitlines():
+        line = SPACE_RUN_RE.sub(" ", TAB_RUN_RE.sub("\t", line)).strip()
+        lines.append(BULLET_RE.sub("- ", line) if line else line)
+    text = BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+    return NormalizedText(
+        text=text,
+        tokens_before=count_tokens(original),
+        tokens_after=count_tokens(text),
+        lines_removed=removed,
+    )
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Normalize unpaginated text (DOCX, TXT)
+
+    Args:
+        text: Document text
+
+    Returns:
+        NormalizedText with before/after token counts
+    """
+    return normalize_pages([text], paginated=False)
@@ -0,0 +1,310 @@
+"""
+Upload Spooling
+Streams uploads to disk in bounded chunks, enforcing MAX_UPLOAD_SIZE as bytes arrive
+"""
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import get_settings
+from app.services.llm.metrics import record_text_normalization
+from app.services.parser.document_cache import get_document_cache
+from app.services.parser.document_parser import DocumentParser
+
+CHUNK_SIZE = 64 * 1024
+# Bytes read up front for magic-byte detection
+SNIFF_SIZE = 8
+# Allowance for multipart boundaries and form fields on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds MAX_UPLOAD_SIZE"""
+
+
+class UnsupportedUploadError(ValueError):
+    """Raised when an upload's content does not match a supported format"""
+
+
+@dataclass
+class SpooledUpload:
+    """An upload written to a temporary file, with its size, digest and sniffed format"""
+
+    path: str
+    filename: Optional[str]
+    size: int
+    sha256: str
+    format: str
+
+
+@asynccontextmanager
+async def spool_upload(file: UploadFile, max_size: Optional[int] = None) -> AsyncIterator[SpooledUpload]:
+    """
+    Copy an upload to a temporary file chunk by chunk
+
+    The size limit is checked as each chunk arrives, so an oversized upload is
+    rejected after reading at most ``max_size`` bytes rather than after
+    buffering all of it. The SHA-256 digest is computed on the way through.
+    The format comes from the file's magic bytes via
+    ``DocumentParser.detect_format``, falling back to the extension for
+    formats without a signature (plain text). The file is deleted on exit.
+
+    Args:
+        file: Uploaded file
+        max_size: Size limit in bytes (defaults to MAX_UPLOAD_SIZE)
+
+    Yields:
+        The spooled upload
+
+    Raises:
+        UploadTooLargeError: The upload is larger than the limit
+        UnsupportedUploadError: The content contradicts the file extension
+    """
+    max_size = max_size or get_settings().MAX_UPLOAD_SIZE
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+
+    fd, path = tempfile.mkstemp(prefix="rolekit-upload-")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(
+                        f"File exceeds the maximum upload size of {max_size / (1024 * 1024):.1f}MB"
+                    )
+                if len(head) < SNIFF_SIZE:
+                    head += chunk[:SNIFF_SIZE - len(head)]
+                digest.update(chunk)
+                spool.write(chunk)
+
+        yield SpooledUpload(
+            path=path,
+            filename=file.filename,
+            size=size,
+            sha256=digest.hexdigest(),
+            format=_resolve_format(head, file.filename),
+        )
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+async def parse_upload(upload: SpooledUpload) -> Dict[str, Any]:
+    """
+    Parse a spooled upload, reusing the result for bytes parsed before
+
+    Args:
+        upload: Spooled upload
+
+    Returns:
+        Parsed document with text and metadata
+    """
+    cache = get_document_cache()
+    cached = cache.get("parsed", upload.sha256)
+    if cached is not None:
+        return cached
+
+    result = await DocumentParser.parse_file(upload.path, upload.filename, force_format=upload.format)
+    if not result.get("error"):
+        normalization = result.get("metadata", {}).get("normalization")
+        if normalization:
+            record_text_normalization(normalization["tokens_before"], normalization["tokens_after"])
+        cache.set("parsed", upload.sha256, result)
+    return result
+
+
+@dataclass
+class BatchEntry:
+    """One document of a batch upload: spooled, or the reason it could not be"""
+
+    filename: str
+    upload: Optional[SpooledUpload] = None
+    error: Optional[str] = None
+
+
+@asynccontextmanager
+async def spool_batch(files: List[UploadFile], max_files: Optional[int] = None) -> AsyncIterator[List[BatchEntry]]:
+    """
+    Spool a batch upload to disk, expanding ``.zip`` archives into their documents
+
+    Every document gets the per-file MAX_UPLOAD_SIZE limit; archives may be up
+    to BATCH_MAX_UPLOAD_SIZE. A document that is too large, unsupported or
+    unreadable becomes an entry with an ``error`` instead of failing the batch.
+    All spooled files are deleted on exit.
+
+    Args:
+        files: Uploaded documents and/or zip archives
+        max_files: Maximum number of documents (defaults to BATCH_MAX_FILES)
+
+    Yields:
+        Entries in upload order (archive members in archive order)
+
+    Raises:
+        UploadTooLargeError: The batch holds more than ``max_files`` documents
+    """
+    settings = get_settings()
+    max_files = max_files or settings.BATCH_MAX_FILES
+    entries: List[BatchEntry] = []
+
+    async with AsyncExitStack() as stack:
+        workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="rolekit-batch-"))
+        for file in files:
+            filename = file.filename or "upload"
+            try:
+                if Path(filename).suffix.lower() == ".zip":
+                    archive = await stack.enter_async_context(
+                        spool_upload(file, max_size=settings.BATCH_MAX_UPLOAD_SIZE)
+                    )
+                    entries += await asyncio.to_thread(
+                        _expand_archive, archive.path, workdir, settings.MAX_UPLOAD_SIZE, max_files - len(entries)
+                    )
+                else:
+                    entries.append(BatchEntry(filename, await stack.enter_async_context(spool_upload(file))))
+            except (UploadTooLargeError, UnsupportedUploadError, zipfile.BadZipFile) as e:
+                entries.append(BatchEntry(filename, error=str(e)))
+
+            if len(entries) > max_files:
+                raise UploadTooLargeError(f"Batch exceeds the maximum of {max_files} documents")
+
+        yield entries
+
+
+def _expand_archive(zip_path: str, dest_dir: str, max_size: int, limit: int) -> List[BatchEntry]:
+    """Copy supported documents out of a zip archive (blocking; runs in a thread)"""
+    allowed = {ext.lower() for ext in get_settings().ALLOWED_EXTENSIONS}
+    entries: List[BatchEntry] = []
+
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or Path(name).name.startswith("."):
+                continue
+            if len(entries) > limit:
+                # Over the batch limit; the caller rejects the batch
+                break
+            if Path(name).suffix.lower() not in allowed:
+                entries.append(BatchEntry(name, error=f"Unsupported file type: {Path(name).suffix or name}"))
+                continue
+            try:
+                entries.append(BatchEntry(name, _copy_member(archive, info, dest_dir, max_size)))
+            except (UploadTooLargeError, UnsupportedUploadError, zipfile.BadZipFile, RuntimeError, OSError) as e:
+                entries.append(BatchEntry(name, error=str(e)))
+
+    return entries
+
+
+def _copy_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, dest_dir: str, max_size: int) -> SpooledUpload:
+    """Copy one archive member to disk, counting real bytes (declared sizes can lie)"""
+    too_large = UploadTooLargeError(f"File exceeds the maximum upload size of {max_size / (1024 * 1024):.1f}MB")
+    if info.file_size > max_size:
+        raise too_large
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    fd, path = tempfile.mkstemp(prefix="member-", dir=dest_dir)
+    with os.fdopen(fd, "wb") as spool, archive.open(info) as member:
+        while chunk := member.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise too_large
+            if len(head) < SNIFF_SIZE:
+                head += chunk[:SNIFF_SIZE - len(head)]
+            digest.update(chunk)
+            spool.write(chunk)
+
+    return SpooledUpload(
+        path=path,
+        filename=info.filename,
+        size=size,
+        sha256=digest.hexdigest(),
+        format=_resolve_format(head, info.filename),
+    )
+
+
+def _resolve_format(head: bytes, filename: Optional[str]) -> str:
+    """Trust the magic bytes; use the extension only for formats without one"""
+    sniffed = DocumentParser.detect_format(file_bytes=head)
+    claimed = DocumentParser.detect_format(filename=filename) if filename else 'unknown'
+
+    if sniffed != 'unknown':
+        return sniffed
+    if claimed in ('pdf', 'docx'):
+        raise UnsupportedUploadError(f"File content is not a valid {claimed.upper()} document")
+    return claimed
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that rejects oversized multipart bodies before they are parsed
+
+    Requests declaring a Content-Length over the limit get 413 without their
+    body being read. Bodies without a length are counted as they stream in.
+    ``path_limits`` sets a different limit for specific paths (batch uploads).
+    """
+
+    def __init__(self, app, max_upload_size: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_body_size = max_upload_size + MULTIPART_OVERHEAD
+        self.path_limits = {path: limit + MULTIPART_OVERHEAD for path, limit in (path_limits or {}).items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.path_limits.get(scope["path"], self.max_body_size)
+        content_length = _header(scope, b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_body_size:
+            await _send_413(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _is_multipart(scope) -> bool:
+    return (_header(scope, b"content-type") or "").startswith("multipart/")
+
+
+async def _send_413(send):
+    body = json.dumps({"detail": "Upload too large"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -1,21 +1,42 @@
 from fastapi import FastAPI, Header
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional, List
+from contextlib import asynccontextmanager
 
 from app.core.config import settings
+from app.services.llm import (
+    init_llm_registry,
+    close_llm_registry,
+    close_response_cache,
+    LLMMetricsMiddleware,
+    render_metrics,
+)
+from app.services.parser import init_parser_pool, shutdown_parser_pool, UploadSizeLimitMiddleware
+from app.services.cv.themes import VersionedStaticFiles
 from app.agents.agent import get_agent_response_stream
 from app.agents.tools.cv_tools import create_cv_tools
 from app.api.routes.cv_routes import router as cv_router
 from app.api.routes.phase2_routes import router as phase2_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources at startup and release them at shutdown."""
+    init_llm_registry()
+    init_parser_pool()
+    yield
+    shutdown_parser_pool()
+    await close_response_cache()
+    await close_llm_registry()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="AI-powered CV enhancement and management system - Phase 2"
+    description="AI-powered CV enhancement and management system - Phase 2",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -27,8 +48,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Label LLM metrics with the route being served
+app.add_middleware(LLMMetricsMiddleware)
+
+# Reject oversized uploads before their body is parsed
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_upload_size=settings.MAX_UPLOAD_SIZE,
+    path_limits={"/api/extract/batch": settings.BATCH_MAX_UPLOAD_SIZE}
+)
+
 # Mount static files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", VersionedStaticFiles(directory="static"), name="static")
 
 # Include routers
 app.include_router(cv_router, prefix="/api/v1")  # Legacy routes
@@ -67,6 +98,12 @@ async def root():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics: LLM tokens and latency per route and operation."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/cv/{cv_id}")
 async def get_cv(cv_id: str, authorization: Optional[str] = Header(None)):
     """
@@ -0,0 +1,67 @@
+"""
+Tests for single-flight coalescing of identical LLM requests
+"""
+import asyncio
+
+from app.services.llm.coalescing import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    """Identical concurrent calls run the work once and all get its result"""
+    single_flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(single_flight.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert len(single_flight) == 0
+
+
+def test_errors_reach_every_waiter():
+    """A failing call raises in every caller and does not stick to the key"""
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(single_flight.do("key", fail) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(single_flight) == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    """Other callers still get the result when one of them is cancelled"""
+    single_flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        first = asyncio.ensure_future(single_flight.do("key", work))
+        second = asyncio.ensure_future(single_flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return first, await second
+
+    first, result = asyncio.run(run())
+
+    assert first.cancelled()
+    assert result == "result"
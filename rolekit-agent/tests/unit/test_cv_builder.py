@@ -0,0 +1,141 @@
+"""
+Tests for CV rendering through the shared template environment and theme registry
+"""
+import json
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import phase2_routes
+from app.models.cv_models import CVData
+from app.services.cv.cv_builder import CVBuilder
+from app.services.cv.fragments import template_name
+from app.services.cv.template_env import get_template
+from app.services.cv.themes import THEMES, VersionedStaticFiles, get_theme, stylesheet_text, stylesheet_url
+
+# Output of the single-template renderer that section fragments replaced
+FIXTURES = Path(__file__).parent / "fixtures" / "cv_render"
+
+
+def _cv() -> CVData:
+    return CVData(
+        contact={"full_name": "Jane <Doe>", "email": "jane@example.com"},
+        summary="Backend engineer",
+        skills=["Python", "SQL"],
+    )
+
+
+def test_templates_are_compiled_once():
+    """Repeated lookups return the cached compiled template"""
+    for theme in THEMES:
+        layout = template_name("html", "layout", theme)
+        assert layout == f"html/{theme}/layout.html.j2"
+        assert get_template(layout) is get_template(layout)
+    assert template_name("html", "header", "classic") == "html/classic/header.html.j2"
+    assert template_name("html", "header", "modern") == "html/header.html.j2"
+
+
+def test_rendering_is_not_autoescaped():
+    """Output is not HTML-escaped, as with the original inline templates"""
+    html = CVBuilder.to_html(_cv())
+    markdown = CVBuilder.to_markdown(_cv())
+
+    assert "<h1>Jane <Doe></h1>" in html
+    assert html.endswith("</html>")
+    assert markdown.startswith("# Jane <Doe>")
+    assert "Python • SQL" in markdown
+
+
+def test_each_style_links_its_own_versioned_stylesheet():
+    """Styles render different markup and link, rather than inline, their CSS"""
+    pages = {name: CVBuilder.to_html(_cv(), style=name) for name in THEMES}
+
+    assert len(set(pages.values())) == len(THEMES)
+    for name, html in pages.items():
+        assert f'<link rel="stylesheet" href="{stylesheet_url(THEMES[name])}">' in html
+        assert "?v=" in stylesheet_url(THEMES[name])
+        assert stylesheet_text(THEMES[name]) not in html
+    assert get_theme("unknown") is THEMES["modern"]
+
+
+def test_pdf_export_inlines_css_and_color_scheme_applies():
+    """Self-contained documents embed the stylesheet; the accent follows color_scheme"""
+    html = CVBuilder.to_html(_cv(), style="classic", color_scheme="green", inline_css=True)
+
+    assert stylesheet_text(THEMES["classic"]) in html
+    assert "<link" not in html
+    assert "#2e7d32" in html
+
+
+def test_build_without_color_scheme_uses_the_style_accent():
+    """/build defaults to each style's own accent rather than forcing blue"""
+    app = FastAPI()
+    app.include_router(phase2_routes.router)
+
+    with TestClient(app) as client:
+        response = client.post("/api/build/stream", json={"cv_data": _cv().model_dump(), "style": "classic"})
+
+    assert THEMES["classic"].default_accent in response.text
+    assert "#0066cc" not in response.text
+
+
+def test_only_the_current_stylesheet_version_is_immutable(tmp_path):
+    """?v= marks a response immutable only when it names the file's current version"""
+    css = tmp_path / "cv" / "themes" / "modern.css"
+    css.parent.mkdir(parents=True)
+    css.write_text(stylesheet_text(THEMES["modern"]), encoding="utf-8")
+    version = stylesheet_url(THEMES["modern"]).split("?v=")[1]
+
+    app = FastAPI()
+    app.mount("/static", VersionedStaticFiles(directory=str(tmp_path)), name="static")
+
+    with TestClient(app) as client:
+        current = client.get(f"/static/cv/themes/modern.css?v={version}")
+        stale = client.get("/static/cv/themes/modern.css?v=0123456789ab")
+        other = client.get(f"/static/cv/themes/modern.css?nov={version}")
+        plain = client.get("/static/cv/themes/modern.css")
+
+    assert current.headers["cache-control"] == "public, max-age=31536000, immutable"
+    for response in (stale, other, plain):
+        assert response.status_code == 200
+        assert "immutable" not in response.headers.get("cache-control", "")
+
+
+def test_streamed_render_matches_full_render():
+    """Streaming yields the same document, in chunks, from the template generator"""
+    cv = CVData(
+        contact={"full_name": "Streamed Author"},
+        experience=[
+            {"position": f"Engineer {i}", "company": "Acme", "start_date": "2020", "achievements": ["Shipped " + "x" * 200]}
+            for i in range(40)
+        ],
+    )
+
+    chunks = list(CVBuilder.stream_html(cv, style="classic"))
+    assert len(chunks) > 1
+    assert "".join(chunks) == CVBuilder.to_html(cv, style="classic")
+    assert "".join(CVBuilder.stream_markdown(cv)) == CVBuilder.to_markdown(cv)
+
+    # Once the whole document is cached it is sent as a single chunk
+    assert list(CVBuilder.stream_html(cv, style="classic")) == [CVBuilder.to_html(cv, style="classic")]
+
+
+@pytest.mark.parametrize("name", ["markdown", *THEMES])
+def test_fragment_render_matches_the_single_template_render(name):
+    """Rendering by section fragments is byte-identical to the former whole-document templates"""
+    cv = CVData(**json.loads((FIXTURES / "cv.json").read_text(encoding="utf-8")))
+
+    if name == "markdown":
+        expected = (FIXTURES / "cv.md").read_text(encoding="utf-8")
+        rendered = CVBuilder.to_markdown(cv)
+        streamed = "".join(CVBuilder.stream_markdown(cv))
+    else:
+        expected = (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+        expected = expected.replace("{stylesheet_url}", stylesheet_url(THEMES[name]))
+        rendered = CVBuilder.to_html(cv, style=name, color_scheme="green")
+        streamed = "".join(CVBuilder.stream_html(cv, style=name, color_scheme="green"))
+
+    assert rendered == expected
+    assert streamed == expected
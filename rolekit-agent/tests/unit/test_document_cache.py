@@ -0,0 +1,50 @@
+"""
+Tests for the document fingerprint cache
+"""
+import asyncio
+import io
+from unittest.mock import AsyncMock, patch
+
+from fastapi import UploadFile
+
+from app.core.config import Settings
+from app.services.parser import document_cache, uploads
+from app.services.parser.document_cache import DocumentCache
+
+
+def test_entries_keyed_on_digest_kind_and_role():
+    """Results are separated by kind and target role and copied on read"""
+    cache = DocumentCache(Settings(OPENAI_API_KEY="x"))
+
+    cache.set("extract", "abc", {"cv_data": {"skills": ["Python"]}}, target_role="Data Engineer")
+
+    hit = cache.get("extract", "abc", target_role=" data engineer ")
+    assert hit == {"cv_data": {"skills": ["Python"]}}
+    hit["cv_data"]["skills"].append("Go")
+    assert cache.get("extract", "abc", target_role="Data Engineer")["cv_data"]["skills"] == ["Python"]
+
+    assert cache.get("extract", "abc") is None
+    assert cache.get("cv_data", "abc", target_role="Data Engineer") is None
+    assert cache.snapshot()["hits"] == 2
+
+
+def test_repeat_upload_is_parsed_once():
+    """A second upload of the same bytes reuses the first parse"""
+    cache = DocumentCache(Settings(OPENAI_API_KEY="x"))
+    parsed = {"text": "Jane Doe\nEngineer", "metadata": {}, "format": "txt"}
+    data = b"Jane Doe\nEngineer"
+
+    async def upload_twice():
+        results = []
+        for _ in range(2):
+            upload = UploadFile(file=io.BytesIO(data), filename="cv.txt")
+            async with uploads.spool_upload(upload) as spooled:
+                results.append(await uploads.parse_upload(spooled))
+        return results
+
+    with patch.object(document_cache, "_document_cache", cache), \
+            patch.object(uploads.DocumentParser, "parse_file", AsyncMock(return_value=parsed)) as parse_file:
+        first, second = asyncio.run(upload_twice())
+
+    assert parse_file.await_count == 1
+    assert first == second == parsed
@@ -0,0 +1,114 @@
+"""
+Tests for page-streaming PDF extraction and streaming DOCX extraction
+"""
+import io
+
+import pymupdf
+from docx import Document
+
+from app.services.parser.document_parser import DocumentParser
+
+
+def _pdf(pages: int, first_lines: dict = None) -> bytes:
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if first_lines and i in first_lines:
+            page.insert_text((50, 50), first_lines[i])
+        for line in range(10):
+            page.insert_text((50, 80 + line * 18), f"Page {i} line {line}: delivered backend services")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_page_and_char_budgets_truncate_extraction():
+    """Reading stops at the page budget and text is capped at the char budget"""
+    result = DocumentParser.parse_pdf_sync(_pdf(30), max_pages=5)
+
+    assert result["metadata"]["pages"] == 30
+    assert result["metadata"]["pages_read"] == 5
+    assert result["metadata"]["truncated"] == "max_pages"
+    assert "Page 5 line" not in result["text"]
+
+    capped = DocumentParser.parse_pdf_sync(_pdf(30), max_chars=1000)
+    assert len(capped["text"]) <= 1000 + 2 * capped["metadata"]["pages_read"]
+    assert capped["metadata"]["truncated"] == "max_chars"
+
+
+def test_stops_at_appendix_after_cv_content():
+    """With stop_at_appendix, an appendix page ends the CV; earlier pages are kept"""
+    result = DocumentParser.parse_pdf_sync(_pdf(6, {2: "Appendix: Portfolio samples"}), stop_at_appendix=True)
+
+    assert result["metadata"]["pages_read"] == 3
+    assert result["metadata"]["truncated"] == "end_of_cv"
+    assert "Page 1 line" in result["text"]
+    assert "Page 2 line" not in result["text"]
+
+    # Off by default, and never for headings like "Portfolio" that are often part of the CV
+    assert "Page 5 line" in DocumentParser.parse_pdf_sync(_pdf(6, {2: "Appendix: Portfolio samples"}))["text"]
+    portfolio = DocumentParser.parse_pdf_sync(_pdf(4, {2: "Portfolio"}), stop_at_appendix=True)
+    assert "truncated" not in portfolio["metadata"]
+
+
+def test_short_pages_are_kept_and_blank_pages_counted():
+    """Only pages without any text are skipped; short pages are CV content"""
+    doc = pymupdf.open()
+    for text in ("Jane Doe - Engineer", "", "References: on request", "Languages: EN, DE", "", "", "Hobbies: chess"):
+        page = doc.new_page()
+        if text:
+            page.insert_text((50, 50), text)
+    result = DocumentParser.parse_pdf_sync(doc.tobytes())
+    doc.close()
+
+    for text in ("Jane Doe", "References: on request", "Languages: EN, DE", "Hobbies: chess"):
+        assert text in result["text"]
+    assert result["metadata"]["pages_read"] == 7
+    assert result["metadata"]["empty_pages"] == 3
+    assert "truncated" not in result["metadata"]
+
+
+def _docx() -> bytes:
+    doc = Document()
+    doc.core_properties.author = "Jane Doe"
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("Experience")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Acme"
+    table.cell(0, 1).text = "2020 - 2023"
+    table.cell(1, 0).text = "Globex"
+    doc.add_picture(io.BytesIO(_pdf_png()))
+    doc.add_paragraph("Skills: Python\tSQL")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_png() -> bytes:
+    doc = pymupdf.open(stream=_pdf(1), filetype="pdf")
+    png = doc.load_page(0).get_pixmap(dpi=10).tobytes("png")
+    doc.close()
+    return png
+
+
+def test_docx_streams_text_in_document_order():
+    """Tables stay where they are in the document; images are skipped"""
+    data = _docx()
+    result = DocumentParser.parse_docx_sync(data)
+
+    assert result["metadata"]["parser"] == "ooxml"
+    assert result["text"] == "Jane Doe\nExperience\nAcme | 2020 - 2023\nGlobex\nSkills: Python\tSQL"
+    assert result["metadata"]["tables"] == 1
+    assert result["metadata"]["author"] == "Jane Doe"
+
+    # Same lines as python-docx, which lists tables after all paragraphs
+    fallback = DocumentParser.parse_docx_sync(data, fast=False)
+    assert sorted(fallback["text"].splitlines()) == sorted(result["text"].splitlines())
+
+
+def test_docx_falls_back_to_python_docx():
+    """An archive the streaming reader cannot read is handed to python-docx"""
+    result = DocumentParser.parse_docx_sync(io.BytesIO(b"PK not a zip"))
+
+    assert result["text"] == ""
+    assert "error" in result
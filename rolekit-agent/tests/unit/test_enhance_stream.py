@@ -0,0 +1,97 @@
+"""
+Tests for concurrent enhancement job scheduling and the /api/enhance/stream events
+"""
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import phase2_routes
+from app.api.routes.phase2_routes import _iter_completed
+
+
+def test_stopping_early_cancels_and_awaits_remaining_jobs():
+    """Jobs still running when the consumer stops are cancelled and finished before it resumes"""
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fast():
+        return "done"
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise ValueError("job failed")
+
+    async def consume():
+        jobs = [("summary", None, fast), ("experience", 0, slow), ("experience", 1, failing)]
+        stream = _iter_completed(jobs, max_concurrency=3)
+        async for (section, _, _), result in stream:
+            assert (section, result) == ("summary", "done")
+            break
+        await stream.aclose()
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(consume()) == []
+    assert cancelled == [True]
+
+
+class _StubEnhancer:
+    """Deterministic stand-in for ProfileEnhancer"""
+
+    async def enhance_summary(self, summary, role=None):
+        return summary.upper()
+
+    async def enhance_education_degree(self, education):
+        return {"degree": education["degree"].title()}
+
+    async def enhance_projects(self, projects):
+        return [{"description": f"Improved: {project['description']}"} for project in projects]
+
+
+def _sse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_batched_sections_stream_one_event_per_entry(monkeypatch):
+    """A batched project list emits a section event for each entry, then the complete event"""
+    monkeypatch.setattr(phase2_routes, "ProfileEnhancer", _StubEnhancer)
+    app = FastAPI()
+    app.include_router(phase2_routes.router)
+
+    threshold = phase2_routes.get_settings().ENHANCE_BATCH_THRESHOLD
+    cv_data = {
+        "contact": {"full_name": "Ada Lovelace"},
+        "summary": "analyst",
+        "education": [{"institution": "UCL", "degree": "bsc maths", "field_of_study": "Maths"}],
+        "projects": [{"name": f"P{i}", "description": f"project {i}"} for i in range(threshold)],
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/api/enhance/stream", json={"cv_data": cv_data, "enhance_project": True})
+
+    events = _sse_events(response.text)
+    sections = sorted(
+        (data["section"], data["index"]) for event, data in events if event == "section"
+    )
+
+    assert sections == sorted(
+        [("summary", None), ("education", 0)] + [("project", i) for i in range(threshold)]
+    )
+    project_events = {data["index"]: data["data"] for event, data in events if data.get("section") == "project"}
+    assert project_events[1]["description"] == "Improved: project 1"
+
+    event, data = events[-1]
+    assert event == "complete"
+    assert data["enhanced_cv"]["projects"][0]["description"] == "Improved: project 0"
+    assert data["enhanced_cv"]["summary"] == "ANALYST"
@@ -0,0 +1,78 @@
+"""
+Tests for the offline fake LLM backend
+"""
+import asyncio
+import json
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.core.config import Settings
+from app.services.llm.client_registry import LLMClientRegistry
+from app.services.llm.fake_backend import FakeChatModel, FakeEmbeddings, recording_key
+
+
+def test_recorded_response_is_replayed_and_streamed():
+    """A recorded prompt replays its response, token by token when streaming"""
+    messages = [SystemMessage(content="Be brief."), HumanMessage(content="Hello")]
+    llm = FakeChatModel(
+        latency_ms=0,
+        tokens_per_second=0,
+        recordings={recording_key(messages): "Hi there, friend"}
+    )
+
+    async def run():
+        full = await llm.ainvoke(messages)
+        chunks = [chunk.content async for chunk in llm.astream(messages)]
+        return full, chunks
+
+    full, chunks = asyncio.run(run())
+
+    assert full.content == "Hi there, friend"
+    assert "".join(chunks) == "Hi there, friend"
+    assert len([c for c in chunks if c]) == 3
+    assert full.usage_metadata["output_tokens"] == 3
+
+
+def test_synthetic_response_matches_service_shape():
+    """Unrecorded prompts get deterministic JSON in the shape the service expects"""
+    llm = FakeChatModel(latency_ms=0, tokens_per_second=0)
+    messages = [
+        SystemMessage(content='Respond with JSON: {"enhanced_degree": "..."}'),
+        HumanMessage(content="Current Degree: bachelor of science"),
+    ]
+
+    first = asyncio.run(llm.ainvoke(messages)).content
+    second = asyncio.run(llm.ainvoke(messages)).content
+
+    assert first == second
+    assert json.loads(first) == {"enhanced_degree": "Bachelor Of Science"}
+
+
+def test_fake_embeddings_are_deterministic_unit_vectors():
+    """The same text always maps to the same normalized vector"""
+    embeddings = FakeEmbeddings(size=32)
+
+    first, second = embeddings.embed_documents(["python", "python"])
+
+    assert first == second
+    assert len(first) == 32
+    assert abs(sum(v * v for v in first) - 1.0) < 1e-9
+
+
+def test_fake_embeddings_use_the_backend_latency_settings():
+    """Registry embeddings on the fake backend are as slow as its chat model, not instant"""
+    settings = Settings(
+        OPENAI_API_KEY="test",
+        LLM_BACKEND="fake",
+        FAKE_LLM_LATENCY_MS=40,
+        FAKE_LLM_LATENCY_DISTRIBUTION="uniform",
+        FAKE_LLM_SEED=7
+    )
+    embeddings = LLMClientRegistry(settings).get_embeddings()
+
+    samples = [embeddings.sample_latency() for _ in range(200)]
+
+    assert isinstance(embeddings, FakeEmbeddings)
+    assert all(0 <= sample <= 0.08 for sample in samples)
+    assert 0.03 < sum(samples) / len(samples) < 0.05
+    assert FakeEmbeddings(latency_ms=40).sample_latency() == 0.04
@@ -0,0 +1,54 @@
+"""
+Tests for LLM token and latency metrics
+"""
+import asyncio
+from uuid import uuid4
+
+from langchain_core.messages import HumanMessage
+
+from app.services.llm.fake_backend import FakeChatModel
+from app.services.llm.metrics import LLMMetrics, LLMMetricsCallbackHandler, llm_operation
+
+
+def test_streamed_call_records_tokens_latency_and_operation():
+    """A streamed completion is counted under the decorated operation"""
+    metrics = LLMMetrics()
+    llm = FakeChatModel(
+        latency_ms=0,
+        tokens_per_second=0,
+        streaming=True,
+        callbacks=[LLMMetricsCallbackHandler(metrics)]
+    )
+
+    @llm_operation("Service.method")
+    async def call():
+        return await llm.ainvoke([HumanMessage(content="Summarize my career")])
+
+    asyncio.run(call())
+    output = "\n".join(metrics.render())
+
+    assert 'rolekit_llm_requests_total{model="fake-chat",operation="Service.method",route="none",status="ok"} 1' in output
+    assert "rolekit_llm_completion_tokens_total{" in output
+    assert "rolekit_llm_time_to_first_token_seconds_count{" in output
+    assert 'route="none",le="+Inf"} 1' in output
+
+
+def test_runs_that_never_finish_are_evicted(monkeypatch):
+    """Cancelled runs (no end or error callback) are dropped and counted as abandoned"""
+    metrics = LLMMetrics()
+    handler = LLMMetricsCallbackHandler(metrics)
+    monkeypatch.setattr("app.services.llm.metrics.MAX_TRACKED_RUNS", 3)
+
+    async def start(run_id):
+        await handler.on_chat_model_start({}, [[HumanMessage(content="hi")]], run_id=run_id)
+
+    run_ids = [uuid4() for _ in range(5)]
+    for run_id in run_ids:
+        asyncio.run(start(run_id))
+
+    assert list(handler._runs) == run_ids[-3:]
+    assert 'model="unknown",operation="unattributed",route="none",status="abandoned"} 2' in "\n".join(metrics.render())
+
+    monkeypatch.setattr("app.services.llm.metrics.RUN_STATE_TTL_SECONDS", 0.0)
+    asyncio.run(start(uuid4()))
+    assert len(handler._runs) == 1
@@ -0,0 +1,72 @@
+"""
+Tests for the bounded document parser pool
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import Settings
+from app.services.parser.parser_pool import ParserBusyError, ParserPool, ParserTimeoutError
+
+
+def _pool(**overrides) -> ParserPool:
+    settings = Settings(OPENAI_API_KEY="test", PARSER_POOL_MODE="thread", **overrides)
+    return ParserPool(settings)
+
+
+def test_rejects_work_beyond_queue_bound():
+    """Parses beyond size + max_queue fail fast instead of queueing"""
+    pool = _pool(PARSER_POOL_SIZE=1, PARSER_POOL_MAX_QUEUE=1)
+
+    async def run():
+        return await asyncio.gather(
+            *(pool.run(time.sleep, 0.05) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown()
+
+    assert sum(isinstance(result, ParserBusyError) for result in results) == 1
+    assert pool.stats["completed"] == 2
+    assert pool.pending == 0
+
+
+def test_slow_parse_times_out():
+    """A parse that exceeds the timeout raises ParserTimeoutError"""
+    pool = _pool(PARSER_POOL_SIZE=1, PARSER_TIMEOUT_SECONDS=0.01)
+
+    try:
+        with pytest.raises(ParserTimeoutError):
+            asyncio.run(pool.run(time.sleep, 0.2))
+    finally:
+        pool.shutdown()
+
+    assert pool.stats["timeouts"] == 1
+
+
+def test_timed_out_parse_keeps_its_slot():
+    """A timed-out parse still running in a worker counts against the bound until it finishes"""
+    pool = _pool(PARSER_POOL_SIZE=1, PARSER_POOL_MAX_QUEUE=0, PARSER_TIMEOUT_SECONDS=0.01)
+    release = threading.Event()
+
+    try:
+        with pytest.raises(ParserTimeoutError):
+            asyncio.run(pool.run(release.wait, 5))
+        assert pool.pending == 1
+
+        with pytest.raises(ParserBusyError):
+            asyncio.run(pool.run(time.sleep, 0))
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while pool.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
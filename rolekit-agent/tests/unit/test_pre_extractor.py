@@ -0,0 +1,82 @@
+"""
+Tests for the deterministic CV pre-extractor
+"""
+from app.models.cv_models import CVData
+from app.services.cv.pre_extractor import pre_extract
+from app.services.cv.schema_extractor import compact_schema_hint
+
+CV_TEXT = """Jane Doe
+Senior Backend Engineer | Berlin, Germany
+jane.doe@example.com | +49 151 2345 6789 | linkedin.com/in/janedoe
+
+Work Experience
+Acme Payments - Staff Engineer
+Jan 2021 - Present
+- Led the ledger migration
+
+Skills
+Languages: Python, Go
+Kafka • PostgreSQL
+"""
+
+
+def test_contact_sections_dates_and_skills_are_found():
+    """Contact details, sections, date ranges and skill lists need no LLM"""
+    pre = pre_extract(CV_TEXT)
+
+    assert pre.contact == {
+        "email": "jane.doe@example.com",
+        "phone": "+49 151 2345 6789",
+        "linkedin": "linkedin.com/in/janedoe",
+    }
+    assert pre.name_guess == "Jane Doe"
+    assert list(pre.sections) == ["experience", "skills"]
+    assert pre.date_ranges["experience"] == [("Jan 2021", "Present")]
+    assert pre.skills == ["Python", "Go", "Kafka", "PostgreSQL"]
+
+    llm_text = pre.llm_text()
+    assert "jane.doe@example.com" not in llm_text
+    assert "PostgreSQL" not in llm_text
+    assert "## Experience" in llm_text
+
+
+def test_apply_merges_deterministic_fields_into_llm_output():
+    """Pre-extracted values fill the LLM result and validate as CVData"""
+    pre = pre_extract(CV_TEXT)
+    llm_output = {
+        "contact": {"full_name": "Jane Doe", "location": "Berlin, Germany"},
+        "experience": [{"company": "Acme Payments", "position": "Staff Engineer"}],
+    }
+
+    cv = CVData(**pre.apply(llm_output))
+
+    assert cv.contact.email == "jane.doe@example.com"
+    assert cv.experience[0].start_date == "Jan 2021"
+    assert cv.experience[0].end_date == "Present"
+    assert cv.skills == ["Python", "Go", "Kafka", "PostgreSQL"]
+
+
+def test_compact_schema_hint_omits_resolved_fields():
+    """The schema hint marks optional fields and skips excluded paths"""
+    hint = compact_schema_hint(CVData, exclude=["contact.email", "skills"])
+
+    assert hint.startswith("contact: {full_name: str, phone?: str")
+    assert "email" not in hint
+    assert "\nskills" not in hint
+    assert "languages?: [{language: str, proficiency: str}]" in hint
+
+
+def test_achievements_subheading_stays_inside_its_role():
+    """Subheadings like "Achievements" under a job do not open a new section"""
+    text = (
+        "Experience\nSenior Engineer, Acme\nJan 2020 - Present\nAchievements\nCut latency by 40%\n"
+        "Engineer, Globex\n2017 - 2019\n"
+        "Education\nBSc Computer Science\n"
+        "Achievements\nDean's list"
+    )
+    sections = pre_extract(text).sections
+
+    assert list(sections) == ["experience", "education", "awards"]
+    assert "Engineer, Globex" in sections["experience"]
+    assert "Achievements\nCut latency by 40%" in sections["experience"]
+    assert sections["awards"] == "Dean's list"
@@ -0,0 +1,122 @@
+"""
+Tests for batched education/project enhancement and its per-item fallback
+"""
+import asyncio
+import json
+import uuid
+from typing import List, Optional
+
+from pydantic import Field
+
+from app.services.cv.profile_enhancer import ProfileEnhancer
+from app.services.llm.fake_backend import FakeChatModel
+
+
+class _ScriptedModel(FakeChatModel):
+    """Fake backend that records each completion and can override the batch reply"""
+
+    batch_reply: Optional[str] = None
+    calls: List[str] = Field(default_factory=list)
+
+    def _respond(self, messages):
+        batched = "JSON array" in messages[0].content
+        self.calls.append("batch" if batched else "single")
+        if batched and self.batch_reply is not None:
+            return self.batch_reply
+        return super()._respond(messages)
+
+
+def _enhancer(batch_reply: Optional[str] = None) -> ProfileEnhancer:
+    enhancer = ProfileEnhancer()
+    # A unique model name keeps the shared response cache from answering across tests
+    enhancer.llm = _ScriptedModel(
+        model_name=f"fake-{uuid.uuid4().hex}",
+        latency_ms=0,
+        tokens_per_second=0,
+        batch_reply=batch_reply
+    )
+    return enhancer
+
+
+def _degrees() -> list:
+    return [
+        {"institution": "MIT", "degree": "bachelor of science", "field_of_study": "CS"},
+        {"institution": "UCL", "degree": "master of arts", "field_of_study": "History"},
+        {"institution": "ETH", "degree": "doctor of philosophy", "field_of_study": "Physics"},
+    ]
+
+
+def test_projects_are_enhanced_in_one_completion():
+    """A parseable batch reply updates every project without per-item calls"""
+    enhancer = _enhancer()
+    projects = [
+        {"name": f"P{i}", "description": f"project {i}", "technologies": ["python"]}
+        for i in range(3)
+    ]
+
+    result = asyncio.run(enhancer.enhance_projects(projects))
+
+    assert enhancer.llm.calls == ["batch"]
+    assert [project["description"] for project in result] == [f"Delivered P{i}: project {i}" for i in range(3)]
+    assert result[0]["technologies"] == ["python"]
+
+
+def test_unparseable_batch_falls_back_to_each_item():
+    """If the batch reply is not a JSON array, every entry is enhanced on its own"""
+    enhancer = _enhancer(batch_reply="Sorry, I cannot help with that.")
+
+    result = asyncio.run(enhancer.enhance_education_degrees(_degrees()))
+
+    assert enhancer.llm.calls == ["batch", "single", "single", "single"]
+    assert [edu["degree"] for edu in result] == [
+        "Bachelor Of Science", "Master Of Arts", "Doctor Of Philosophy"
+    ]
+
+
+def test_incomplete_batch_only_retries_missing_items():
+    """Entries absent from the batch reply, and only those, fall back to single calls"""
+    enhancer = _enhancer(batch_reply=json.dumps([
+        {"index": 2, "enhanced_degree": "Doctor of Philosophy in Physics"},
+        {"index": 0, "enhanced_degree": "Bachelor of Science in Computer Science"},
+        {"index": 7, "enhanced_degree": "Out of range"},
+    ]))
+
+    result = asyncio.run(enhancer.enhance_education_degrees(_degrees()))
+
+    assert enhancer.llm.calls == ["batch", "single"]
+    assert [edu["degree"] for edu in result] == [
+        "Bachelor of Science in Computer Science",
+        "Master Of Arts",
+        "Doctor of Philosophy in Physics",
+    ]
+
+
+def test_wrong_length_batch_without_indexes_is_not_trusted():
+    """Unindexed items are only matched by position when the lengths agree"""
+    unindexed = [{"enhanced_degree": "A"}, {"enhanced_degree": "B"}]
+
+    assert ProfileEnhancer._parse_batch_response(json.dumps(unindexed), 3) == {}
+    assert ProfileEnhancer._parse_batch_response(json.dumps(unindexed), 2) == {
+        0: {"enhanced_degree": "A"}, 1: {"enhanced_degree": "B"}
+    }
+    assert ProfileEnhancer._parse_batch_response('```json\n[{"index": 1}, "x"]\n```', 2) == {1: {"index": 1}}
+
+    enhancer = _enhancer(batch_reply=json.dumps(unindexed))
+    asyncio.run(enhancer.enhance_education_degrees(_degrees()))
+    assert enhancer.llm.calls == ["batch", "single", "single", "single"]
+
+
+def test_blank_or_malformed_enhancements_keep_the_original():
+    """Empty strings, wrong types and empty technology lists leave the entry unchanged"""
+    education = {"degree": "BSc"}
+    ProfileEnhancer._apply_degree_enhancement(education, {"enhanced_degree": "   "})
+    ProfileEnhancer._apply_degree_enhancement(education, {"enhanced_degree": 3})
+    ProfileEnhancer._apply_degree_enhancement(education, "Bachelor of Science")
+    assert education == {"degree": "BSc"}
+
+    project = {"description": "old", "technologies": ["python"]}
+    ProfileEnhancer._apply_project_enhancement(project, {"enhanced_description": "", "enhanced_technologies": []})
+    assert project == {"description": "old", "technologies": ["python"]}
+
+    ProfileEnhancer._apply_project_enhancement(project, {"enhanced_description": " new ", "enhanced_technologies": ["Python"]})
+    assert project == {"description": "new", "technologies": ["Python"]}
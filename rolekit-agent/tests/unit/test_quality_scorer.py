@@ -0,0 +1,91 @@
+"""
+Tests for the local CV quality scorer and background LLM validation
+"""
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+from app.core.config import Settings
+from app.models.cv_models import CVData
+from app.services.cv.quality_scorer import CVQualityScorer, parse_cv_date
+from app.services.cv.schema_extractor import CVSchemaValidator
+from app.services.cv.validation_jobs import ValidationJobStore
+
+TODAY = date(2025, 6, 1)
+
+
+def _cv(**overrides) -> CVData:
+    data = {
+        "contact": {"full_name": "Jane Doe", "email": "jane@example.com", "phone": "+1 555 0100", "location": "Berlin"},
+        "summary": "Backend engineer.",
+        "experience": [{
+            "company": "Acme",
+            "position": "Senior Engineer",
+            "start_date": "Jan 2020",
+            "end_date": "Present",
+            "achievements": ["Cut API latency by 40%", "Led a team of 5", "Improved developer experience"],
+        }],
+        "education": [{"institution": "TU Berlin", "degree": "BSc", "field_of_study": "CS", "end_date": "2019"}],
+        "skills": ["Python", "Go"],
+        "projects": [{"name": "rolekit", "description": "CV tooling"}],
+    }
+    data.update(overrides)
+    return CVData(**data)
+
+
+def test_parse_cv_date_formats():
+    """Common CV date formats parse to (year, month)"""
+    assert parse_cv_date("2021-03") == (2021, 3)
+    assert parse_cv_date("03/2021") == (2021, 3)
+    assert parse_cv_date("March 2021") == (2021, 3)
+    assert parse_cv_date("2021") == (2021, 1)
+    assert parse_cv_date("Present", TODAY) == (2025, 6)
+    assert parse_cv_date("someday") is None
+
+
+def test_complete_cv_scores_high_and_flags_nothing():
+    """A complete, consistent CV scores well with no issues"""
+    result = CVQualityScorer(TODAY).score(_cv())
+
+    assert result["is_valid"] is True
+    assert result["issues"] == []
+    assert result["components"]["completeness"] == 1.0
+    assert result["components"]["date_consistency"] == 1.0
+    assert round(result["components"]["quantified_achievements"], 2) == 0.67
+    assert result["quality_score"] >= 85
+
+
+def test_inconsistent_dates_and_missing_fields_lower_the_score():
+    """Backwards dates and missing contact details are reported as issues"""
+    cv = _cv(
+        contact={"full_name": "Unknown"},
+        experience=[{"company": "Acme", "position": "Engineer", "start_date": "2022", "end_date": "2020"}],
+    )
+
+    result = CVQualityScorer(TODAY).score(cv)
+
+    assert result["is_valid"] is False
+    assert "Start date after end date for Engineer" in result["issues"]
+    assert "Email address is missing" in result["issues"]
+    assert result["quality_score"] < CVQualityScorer(TODAY).score(_cv())["quality_score"]
+
+
+def test_llm_validation_runs_as_pollable_background_job():
+    """Submitting returns immediately; the result is available once the task finishes"""
+    store = ValidationJobStore(Settings(OPENAI_API_KEY="x"))
+    review = {"is_valid": True, "quality_score": 90, "issues": [], "suggestions": []}
+
+    async def run():
+        job_id = store.submit(_cv())
+        pending = store.get(job_id)
+        await asyncio.sleep(0)
+        while store.running:
+            await asyncio.sleep(0)
+        return pending, store.get(job_id)
+
+    with patch.object(CVSchemaValidator, "validate_with_llm", AsyncMock(return_value=review)):
+        pending, done = asyncio.run(run())
+
+    assert pending["status"] == "pending"
+    assert done["status"] == "completed"
+    assert done["result"] == review
@@ -0,0 +1,62 @@
+"""
+Tests for the CV render cache
+"""
+from unittest.mock import patch
+
+from app.core.config import Settings
+from app.models.cv_models import CVData
+from app.services.cv import render_cache
+from app.services.cv.cv_builder import CVBuilder
+from app.services.cv.render_cache import RenderCache, cv_fingerprint
+
+
+def _experience(company: str, achievement: str) -> dict:
+    return {"company": company, "position": "Engineer", "start_date": "2020", "achievements": [achievement]}
+
+
+def _cv(**overrides) -> CVData:
+    data = {"contact": {"full_name": "Jane Doe", "email": "jane@example.com"}, "skills": ["Python"]}
+    data.update(overrides)
+    return CVData(**data)
+
+
+def test_fingerprint_ignores_key_order():
+    """Equal content hashes equally however the dicts were built"""
+    reordered = CVData(**{"skills": ["Python"], "contact": {"email": "jane@example.com", "full_name": "Jane Doe"}})
+
+    assert cv_fingerprint(_cv()) == cv_fingerprint(reordered)
+    assert cv_fingerprint(_cv()) != cv_fingerprint(_cv(skills=["Go"]))
+
+
+def test_identical_builds_render_once():
+    """Repeats are served from the cache; any option change renders again"""
+    cache = RenderCache(Settings(OPENAI_API_KEY="x"))
+
+    with patch.object(render_cache, "_render_cache", cache):
+        first = CVBuilder.to_html(_cv(), style="modern", color_scheme="blue")
+        second = CVBuilder.to_html(_cv(), style="Modern", color_scheme="blue")
+        CVBuilder.to_html(_cv(), style="modern", color_scheme="green")
+        CVBuilder.to_markdown(_cv())
+        CVBuilder.to_markdown(_cv(summary="Engineer"))
+
+    assert first is second
+    assert cache.snapshot() == {"enabled": True, "entries": 4, "hits": 1, "misses": 4}
+
+
+def test_editing_one_entry_rerenders_only_that_fragment():
+    """A changed bullet re-renders its own experience entry; the rest come from the cache"""
+    settings = Settings(OPENAI_API_KEY="x")
+    fragments = RenderCache(settings, max_entries=100)
+    documents = RenderCache(settings)
+    before = _cv(experience=[_experience("Acme", "Cut latency 40%"), _experience("Globex", "Led a team of 4")])
+    after = _cv(experience=[_experience("Acme", "Cut latency 45%"), _experience("Globex", "Led a team of 4")])
+
+    with patch.object(render_cache, "_fragment_cache", fragments), \
+            patch.object(render_cache, "_render_cache", documents):
+        first = CVBuilder.to_html(before)
+        misses = fragments.stats["misses"]
+        second = CVBuilder.to_html(after)
+
+    assert fragments.stats["misses"] - misses == 1
+    assert "Cut latency 45%" in second and "Led a team of 4" in second
+    assert first.replace("40%", "45%") == second
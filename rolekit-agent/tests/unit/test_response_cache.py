@@ -0,0 +1,59 @@
+"""
+Tests for the LLM response cache tiers
+"""
+import asyncio
+import time
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.services.llm.response_cache import MemoryTTLCache, LLMResponseCache
+
+
+def test_memory_cache_evicts_least_recently_used():
+    """Oldest untouched entry is evicted once the cache is full"""
+    cache = MemoryTTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_expires_entries():
+    """Entries past their TTL are treated as missing"""
+    cache = MemoryTTLCache(max_entries=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_key_depends_on_prompt_model_and_temperature():
+    """Same prompt with a different model or temperature gets a different key"""
+    messages = [SystemMessage(content="system"), HumanMessage(content="hello")]
+
+    key = LLMResponseCache.make_key(messages, model="gpt-4o-mini", temperature=0.7)
+
+    assert key == LLMResponseCache.make_key(list(messages), model="gpt-4o-mini", temperature=0.7)
+    assert key != LLMResponseCache.make_key(messages, model="gpt-4o", temperature=0.7)
+    assert key != LLMResponseCache.make_key(messages, model="gpt-4o-mini", temperature=0.2)
+    assert key != LLMResponseCache.make_key(messages[:1], model="gpt-4o-mini", temperature=0.7)
+
+
+def test_response_cache_round_trip_without_redis():
+    """Values written to the cache are served from the memory tier"""
+    cache = LLMResponseCache()
+
+    async def run():
+        await cache.set("key", "cached completion")
+        return await cache.get("key"), await cache.get("missing")
+
+    hit, miss = asyncio.run(run())
+
+    assert hit == "cached completion"
+    assert miss is None
+    assert cache.stats["memory_hits"] == 1
+    assert cache.stats["misses"] == 1
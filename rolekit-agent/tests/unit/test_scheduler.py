@@ -0,0 +1,165 @@
+"""
+Tests for LLM admission control: token buckets, 429 back-off and the admission-controlled transport
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import Settings
+from app.services.llm import scheduler
+from app.services.llm.scheduler import (
+    AdmissionControlledTransport,
+    LLMAdmissionController,
+    TokenBucket,
+    _parse_reset_duration,
+)
+
+
+def _controller(**overrides) -> LLMAdmissionController:
+    settings = Settings(OPENAI_API_KEY="x", **overrides)
+    return LLMAdmissionController(settings)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake monotonic clock; asyncio.sleep in the scheduler advances it instead of waiting"""
+    now = [1000.0]
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr(scheduler, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    monkeypatch.setattr(scheduler.asyncio, "sleep", sleep)
+    return SimpleNamespace(now=now, sleeps=sleeps)
+
+
+def test_token_bucket_refills_per_minute():
+    """A bucket holds its per-minute capacity and refills continuously"""
+    bucket = TokenBucket(60)
+    start = bucket._updated
+    assert bucket.time_until_available(60, now=start) == 0.0
+    bucket.consume(60)
+
+    assert bucket.time_until_available(1, now=start) == pytest.approx(1.0)
+    assert bucket.time_until_available(30, now=start + 30) == 0.0
+    # Requests larger than the bucket wait for a full bucket instead of forever
+    assert bucket.time_until_available(500, now=start + 30) == pytest.approx(30.0)
+    assert TokenBucket(0).time_until_available(10 ** 6, now=start) == 0.0
+
+
+def test_reset_durations_are_parsed():
+    """OpenAI reset headers come as durations ('6m0s', '20ms') or plain seconds"""
+    assert _parse_reset_duration("1s") == 1.0
+    assert _parse_reset_duration("6m0s") == 360.0
+    assert _parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert _parse_reset_duration("1h2m") == 3720.0
+    assert _parse_reset_duration("0.5") == 0.5
+    assert _parse_reset_duration("") is None
+    assert _parse_reset_duration("soon") is None
+
+
+def test_429_pauses_admission(clock):
+    """A 429 pauses for the advertised reset, else backs off exponentially"""
+    controller = _controller()
+
+    controller.observe_response(429, {"retry-after-ms": "1500"})
+    assert controller._paused_until == pytest.approx(clock.now[0] + 1.5)
+
+    controller = _controller()
+    controller.observe_response(429, {"x-ratelimit-reset-requests": "2s", "x-ratelimit-reset-tokens": "6m0s"})
+    assert controller._paused_until == pytest.approx(clock.now[0] + 360)
+
+    controller = _controller()
+    controller.observe_response(429, {})
+    controller.observe_response(429, {})
+    assert controller._paused_until == pytest.approx(clock.now[0] + 1.0)
+    assert controller.throttled_total == 2
+
+    # A success resets the back-off; an exhausted request budget holds admission until it resets
+    controller.observe_response(200, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "5s"})
+    assert controller._consecutive_throttles == 0
+    assert controller._paused_until == pytest.approx(clock.now[0] + 5)
+
+    asyncio.run(controller.acquire())
+    assert clock.sleeps == [pytest.approx(5)]
+
+
+def test_rpm_and_tpm_budgets_delay_admission(clock):
+    """Requests wait for the request and token budgets to refill"""
+    controller = _controller(LLM_REQUESTS_PER_MINUTE=60, LLM_TOKENS_PER_MINUTE=600)
+
+    async def run():
+        await controller.acquire(estimated_tokens=600)
+        controller.release()
+        await controller.acquire(estimated_tokens=300)
+        controller.release()
+
+    asyncio.run(run())
+
+    # The second request waits for 300 tokens at 10 tokens per second
+    assert clock.sleeps == [pytest.approx(30.0)]
+    assert controller.admitted_total == 2
+    assert controller.in_flight == 0
+
+
+def test_in_flight_limit_queues_requests():
+    """Beyond LLM_MAX_IN_FLIGHT, requests queue until a slot is released"""
+    controller = _controller(LLM_MAX_IN_FLIGHT=1, LLM_REQUESTS_PER_MINUTE=0, LLM_TOKENS_PER_MINUTE=0)
+
+    async def run():
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1 and not waiter.done()
+
+        controller.release()
+        await waiter
+        assert controller.in_flight == 1
+        controller.release()
+
+    asyncio.run(run())
+    # The controller is process-wide: a second event loop gets its own primitives
+    asyncio.run(run())
+    assert controller.in_flight == 0
+
+
+class _StubStream(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'{"ok": true}'
+
+
+class _StubTransport(httpx.AsyncBaseTransport):
+    """Returns unread streaming bodies, like a real network transport (MockTransport pre-reads them)"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(429 if request.url.path == "/limited" else 200, stream=_StubStream())
+
+
+def test_transport_releases_slot_when_body_closes():
+    """A response keeps its slot until its body is closed; failed sends release immediately"""
+    controller = _controller(LLM_REQUESTS_PER_MINUTE=0, LLM_TOKENS_PER_MINUTE=0)
+
+    async def run():
+        transport = AdmissionControlledTransport(_StubTransport(), controller)
+        async with httpx.AsyncClient(transport=transport, base_url="http://llm") as client:
+            async with client.stream("POST", "/chat", json={"max_tokens": 50}) as response:
+                assert controller.in_flight == 1
+                await response.aread()
+            assert controller.in_flight == 0
+
+            with pytest.raises(httpx.ConnectError):
+                await client.post("/fail")
+            assert controller.in_flight == 0
+
+            await client.post("/limited")
+            assert controller.throttled_total == 1
+
+    asyncio.run(run())
+    assert controller.admitted_total == 3
+    assert controller.in_flight == 0
@@ -0,0 +1,87 @@
+"""
+Tests for section-chunked CV extraction
+"""
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from app.services.cv.pre_extractor import pre_extract
+from app.services.cv.schema_extractor import CVSchemaExtractor
+
+JOBS = "\n".join(
+    f"Company {i} - Engineer\nJan {2010 + i} - Dec {2011 + i}\n- Shipped feature {i}\n"
+    for i in range(5)
+)
+CV_TEXT = f"""Jane Doe
+jane@example.com
+
+Experience
+{JOBS}
+Education
+MIT - BSc Computer Science, 2005 - 2009
+"""
+
+
+def test_sections_are_extracted_concurrently_and_merged_in_order(monkeypatch):
+    """Chunks run in parallel and their entries are merged in document order"""
+    extractor = CVSchemaExtractor()
+    pre = pre_extract(CV_TEXT)
+    running = {"now": 0, "peak": 0}
+
+    async def fake_chunk(pre, chunk, context):
+        label, fields, text = chunk
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        if fields == ("contact", "summary"):
+            return {"contact": {"full_name": "Jane Doe"}, "summary": "Engineer"}
+        if fields == ("experience",):
+            return {"experience": [
+                {"company": line.split(" - ")[0], "position": "Engineer"}
+                for line in text.splitlines() if line.startswith("Company")
+            ]}
+        return {"education": [{"institution": "MIT", "degree": "BSc", "field_of_study": "CS"}]}
+
+    monkeypatch.setattr(extractor, "_extract_chunk", fake_chunk)
+
+    chunks = extractor._plan_section_chunks(pre)
+    merged = pre.apply(asyncio.run(extractor._extract_by_section(pre)))
+
+    assert [fields for _, fields, _ in chunks].count(("experience",)) == 2
+    assert running["peak"] > 1
+    assert [job["company"] for job in merged["experience"]] == [f"Company {i}" for i in range(5)]
+    assert merged["experience"][0]["start_date"] == "Jan 2010"
+    assert merged["contact"]["email"] == "jane@example.com"
+    assert merged["education"][0]["institution"] == "MIT"
+
+
+def test_merged_sections_are_repaired_before_validation(monkeypatch):
+    """An invalid entry from one chunk is repaired, or dropped, instead of failing the extraction"""
+    extractor = CVSchemaExtractor()
+    repairs = []
+
+    async def fake_chunk(pre, chunk, context):
+        label, fields, text = chunk
+        if fields == ("education",):
+            # Missing institution: valid for the partial section model, invalid for CVData
+            return {"education": [{"degree": "BSc", "field_of_study": "CS"}, {"degree": "?"}]}
+        if fields == ("experience",):
+            return {"experience": [{"company": "Company 0", "position": "Engineer"}]}
+        return {"contact": {"full_name": "Jane Doe"}}
+
+    async def fake_repair(prompt, llm, inputs=None, **kwargs):
+        repairs.append(inputs["path"])
+        if inputs["path"] == "education.0":
+            return AIMessage(content='{"institution": "MIT", "degree": "BSc", "field_of_study": "CS"}')
+        return AIMessage(content="cannot fix")
+
+    monkeypatch.setattr(extractor, "_extract_chunk", fake_chunk)
+    monkeypatch.setattr(extractor, "_use_section_mode", lambda pre, text: True)
+    monkeypatch.setattr("app.services.llm.structured.ainvoke_prompt", fake_repair)
+
+    cv = asyncio.run(extractor.extract(CV_TEXT))
+
+    assert "education.0" in repairs and "education.1" in repairs
+    assert [(edu.institution, edu.degree) for edu in cv.education] == [("MIT", "BSc")]
+    assert cv.contact.email == "jane@example.com"
@@ -0,0 +1,113 @@
+"""
+Tests for structured output parsing and fragment repair
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from app.core.config import get_settings
+from app.models.cv_models import CVComparisonFeedback, CVData
+from app.services.cv.schema_extractor import CVSchemaValidator
+from app.services.llm import structured
+from app.services.llm.fake_backend import FakeChatModel
+from app.services.llm.metrics import get_llm_metrics
+from app.services.llm.structured import StructuredOutputError, parse_json_content, validate_with_repair
+
+
+def _payload() -> dict:
+    return {
+        "contact": {"full_name": "Jane Doe"},
+        "experience": [
+            {"company": "Acme", "position": "Engineer", "start_date": "2020"},
+            {"company": "Globex", "position": "Intern"},
+        ],
+    }
+
+
+def test_parse_json_content_handles_fences_and_prose():
+    """Code fences and surrounding prose are ignored; the expected type is honoured"""
+    assert parse_json_content('```json\n{"a": 1}\n```') == {"a": 1}
+    assert parse_json_content('Here you go: ["x", "y"] Hope that helps') == ["x", "y"]
+    assert parse_json_content('note {"a": 1} then ["b"]', expect=list) == ["b"]
+    with pytest.raises(StructuredOutputError):
+        parse_json_content("no json here")
+
+
+def test_only_the_invalid_fragment_is_repaired():
+    """A missing field in one entry sends just that entry back to the model"""
+    fixed = {"company": "Globex", "position": "Intern", "start_date": "2019"}
+    repair = AsyncMock(return_value=AIMessage(content=json.dumps(fixed)))
+    get_llm_metrics().reset()
+
+    with patch.object(structured, "ainvoke_prompt", repair):
+        cv = asyncio.run(validate_with_repair(None, CVData, _payload(), max_repairs=2))
+
+    assert cv.experience[1].start_date == "2019"
+    assert repair.await_count == 1
+    inputs = repair.await_args.args[2]
+    assert inputs["path"] == "experience.1"
+    assert "start_date: Field required" in inputs["errors"]
+    assert "Acme" not in inputs["fragment"]
+    assert 'outcome="repaired"' in "\n".join(get_llm_metrics().render())
+
+
+def test_unrepairable_list_items_are_dropped():
+    """Entries still invalid after the repair budget are dropped instead of failing the call"""
+    repair = AsyncMock(return_value=AIMessage(content="sorry, I cannot help"))
+
+    with patch.object(structured, "ainvoke_prompt", repair):
+        cv = asyncio.run(validate_with_repair(None, CVData, _payload(), max_repairs=1))
+
+    assert [exp.company for exp in cv.experience] == ["Acme"]
+
+
+def test_function_calling_mode_reads_the_tool_call():
+    """With tools bound the fake backend answers with a tool call, whose arguments are the payload"""
+    llm = FakeChatModel(latency_ms=0, tokens_per_second=0)
+    prompt = ChatPromptTemplate.from_messages([("system", "You are a CV parser."), ("human", "{text}")])
+    get_llm_metrics().reset()
+
+    bound = llm.bind_tools([CVData], tool_choice="CVData")
+    message = asyncio.run(bound.ainvoke(prompt.format_messages(text="Jane Doe\njane@example.com")))
+    assert message.tool_calls[0]["name"] == "CVData"
+    assert message.content == ""
+
+    with patch.object(structured, "parse_json_content", side_effect=AssertionError("text path used")):
+        cv = asyncio.run(structured.ainvoke_structured(
+            prompt, llm, CVData, {"text": "Jane Doe\njane@example.com"}, mode="function_calling"
+        ))
+
+    assert cv.contact.full_name == "Jane Doe"
+    assert cv.contact.email == "jane@example.com"
+    assert 'mode="function_calling",operation="unattributed",outcome="ok"' in "\n".join(get_llm_metrics().render())
+
+
+@pytest.mark.parametrize("mode", structured.STRUCTURED_OUTPUT_MODES)
+def test_llm_validation_returns_a_validated_report(mode, monkeypatch):
+    """CV validation goes through the structured output path in every mode"""
+    monkeypatch.setattr(get_settings(), "LLM_STRUCTURED_OUTPUT_MODE", mode)
+    llm = FakeChatModel(latency_ms=0, tokens_per_second=0)
+
+    result = asyncio.run(CVSchemaValidator.validate_with_llm(CVData(contact={"full_name": "Jane Doe"}), llm))
+
+    assert result == {"is_valid": True, "quality_score": 80, "issues": [], "suggestions": []}
+
+
+def test_feedback_payload_is_validated():
+    """Comparison feedback is parsed into CVComparisonFeedback, scores are bounded"""
+    llm = FakeChatModel(latency_ms=0, tokens_per_second=0)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", "You are an expert CV reviewer. Respond in JSON with overall_score, strengths and weaknesses."),
+        ("human", "{cv}")
+    ])
+
+    feedback = asyncio.run(structured.ainvoke_structured(prompt, llm, CVComparisonFeedback, {"cv": "Summary: x"}))
+
+    assert feedback.overall_score == 78
+    assert feedback.strengths == ["Stronger action verbs"]
+    with pytest.raises(ValueError):
+        CVComparisonFeedback(overall_score=250)
@@ -0,0 +1,86 @@
+"""
+Tests for parsed-text normalization
+"""
+from app.services.parser.document_parser import DocumentParser
+from app.services.parser.text_normalizer import normalize_pages, normalize_text
+
+
+def _page(number: int, body: str) -> str:
+    return f"Jane Doe  |  Curriculum Vitae\n{body}\nConfidential - jane@example.com\nPage {number} of 3"
+
+
+def test_repeated_headers_footers_and_page_numbers_are_removed():
+    """Running headers/footers are kept once, page numbers go, page content stays"""
+    pages = [
+        _page(1, "Experience\nSenior Engineer at Acme"),
+        _page(2, "Education\nBSc Computer Science"),
+        _page(3, "Skills\nPython, SQL"),
+    ]
+    result = normalize_pages(pages)
+
+    assert result.text.count("Curriculum Vitae") == 1
+    assert result.text.count("Confidential") == 1
+    assert "Page 2" not in result.text
+    assert "Senior Engineer at Acme" in result.text
+    assert "Python, SQL" in result.text
+    assert result.lines_removed == 7
+    assert result.tokens_after < result.tokens_before
+
+
+def test_hyphenation_bullets_and_whitespace():
+    """Broken words are rejoined, bullets unified and whitespace collapsed"""
+    result = normalize_text(
+        "Built   a  data pipe-\nline for reporting\n\n\n\n• Led migra\u00ad\n  tion\n▪ Mentored\tengineers\n- Owned the pipeline"
+    )
+
+    assert result.text == "Built a data pipeline for reporting\n\n- Led migration\n- Mentored\tengineers\n- Owned the pipeline"
+
+
+def test_compound_words_keep_their_hyphen():
+    """A hyphen at a line break is only dropped with evidence the word was split"""
+    result = normalize_text("A self-\nmotivated engineer\nBuilt Micro-\nservices on Kubernetes")
+
+    assert result.text == "A self-motivated engineer\nBuilt Micro-services on Kubernetes"
+
+
+def test_single_page_keeps_its_first_and_last_lines():
+    """Header/footer detection needs repetition across pages"""
+    assert normalize_pages(["Jane Doe\nEngineer\nLondon"]).text == "Jane Doe\nEngineer\nLondon"
+
+
+def test_parse_result_records_token_counts():
+    """Normalized parse results carry the before/after token counts"""
+    result = DocumentParser.normalize_result({"text": "a    b\n\n\n\nc", "metadata": {}, "format": "txt"})
+
+    assert result["text"] == "a b\n\nc"
+    assert set(result["metadata"]["normalization"]) == {"tokens_before", "tokens_after", "lines_removed"}
+
+
+def test_two_page_cv_keeps_date_ranges_and_years():
+    """Lines that only look alike once digits are ignored are content, not furniture"""
+    dates = normalize_pages(["Jane Doe\nEngineer\nAcme\n2015 - 2018", "Globex\n2012 - 2015\nBuilt things\nInitech\n2008 - 2012"])
+    years = normalize_pages(["Skills\n2019\nfoo", "Awards\n2021\nbar"])
+
+    assert dates.text == "Jane Doe\nEngineer\nAcme\n2015 - 2018\n\nGlobex\n2012 - 2015\nBuilt things\nInitech\n2008 - 2012"
+    assert dates.lines_removed == 0
+    assert years.text == "Skills\n2019\nfoo\n\nAwards\n2021\nbar"
+
+
+def test_headers_need_the_same_text_at_the_same_position():
+    """A repeated line only counts at the same edge position, with only page references masked"""
+    result = normalize_pages([f"Jane Doe - Page {n}\nRole {n}\nBody {n}" for n in range(1, 4)])
+
+    assert result.text == "Jane Doe - Page 1\nRole 1\nBody 1\n\nRole 2\nBody 2\n\nRole 3\nBody 3"
+    # Identical year lines, but not at the same position on every page
+    shifted = normalize_pages(["2020\nA\nB\nC\nD", "X\n2020\nB2\nC2\nD2", "Y\nZ\n2020\nC3\nD3"])
+    assert shifted.text.count("2020") == 3
+
+
+def test_numbers_in_content_are_not_page_numbers():
+    """Only edge lines of real pages can be page numbers; DOCX/TXT text keeps every number"""
+    text = "Skills\nPython\n5\nSQL\n4\nTeam size\n12"
+
+    assert normalize_text(text).text == text
+    # On a PDF page a bare number is only a page number as the page's first or last line
+    page = "Skills\nPython\n5\nSQL\n4\nTeam size 12\n1"
+    assert normalize_pages([page, "Education\nBSc\n- 2 -"]).text == "Skills\nPython\n5\nSQL\n4\nTeam size 12\n\nEducation\nBSc"
@@ -0,0 +1,91 @@
+"""
+Tests for size-enforced upload spooling
+"""
+import asyncio
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.parser.uploads import UnsupportedUploadError, UploadTooLargeError, spool_batch, spool_upload
+
+
+def _upload(data: bytes, filename: str) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def test_spools_with_digest_and_sniffed_format():
+    """Content is written to disk, hashed, and typed by its magic bytes"""
+    data = b"%PDF-1.7\n" + b"x" * 200_000
+
+    async def run():
+        async with spool_upload(_upload(data, "resume.bin"), max_size=1_000_000) as upload:
+            with open(upload.path, "rb") as f:
+                assert f.read() == data
+            return upload
+
+    upload = asyncio.run(run())
+
+    assert upload.format == "pdf"
+    assert upload.size == len(data)
+    assert upload.sha256 == hashlib.sha256(data).hexdigest()
+    assert not os.path.exists(upload.path)
+
+
+def test_rejects_oversized_and_mislabelled_uploads():
+    """Uploads over the limit, or claiming a format they are not, are refused"""
+    async def spool(data: bytes, filename: str, max_size: int):
+        async with spool_upload(_upload(data, filename), max_size=max_size):
+            pass
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool(b"%PDF" + b"x" * 5000, "cv.pdf", 1000))
+    with pytest.raises(UnsupportedUploadError):
+        asyncio.run(spool(b"plain text pretending", "cv.pdf", 1000))
+
+
+def _zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_batch_expands_archives_and_reports_bad_entries():
+    """Zip members become entries; unsupported or mislabelled ones carry an error"""
+    archive = _zip({
+        "cvs/a.txt": b"Jane Doe",
+        "cvs/photo.png": b"png",
+        "cvs/fake.pdf": b"not a pdf",
+        "__MACOSX/._a.txt": b"x",
+    })
+    files = [_upload(b"John Roe", "b.txt"), _upload(archive, "batch.zip")]
+
+    async def run():
+        async with spool_batch(files) as entries:
+            paths = [entry.upload.path for entry in entries if entry.upload]
+            assert all(os.path.exists(path) for path in paths)
+            return entries, paths
+
+    entries, paths = asyncio.run(run())
+
+    assert [entry.filename for entry in entries] == ["b.txt", "cvs/a.txt", "cvs/photo.png", "cvs/fake.pdf"]
+    assert [entry.error is None for entry in entries] == [True, True, False, False]
+    assert entries[1].upload.format == "txt"
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def test_batch_over_document_limit_is_rejected():
+    """More documents than the batch limit rejects the whole batch"""
+    archive = _zip({f"cv{i}.txt": b"text" for i in range(5)})
+
+    async def run():
+        async with spool_batch([_upload(archive, "batch.zip")], max_files=3):
+            pass
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(run())